@@ -23,6 +23,11 @@ def create_app(config_name="default"):
 
     app = Flask(__name__)
 
+    # orjson encodes datetimes and enums, so serializers return raw values
+    from app.utils.json_provider import OrjsonProvider
+
+    app.json = OrjsonProvider(app)
+
     # Import config after Flask app creation
     from app.config import config
     from app.models.base import db
@@ -30,8 +35,10 @@ def create_app(config_name="default"):
     # Load configuration
     app.config.from_object(config[config_name])
 
-    # Initialize extensions with app
-    db.init_app(app)
+    # Initialize extensions with app (engine options, PRAGMAs and read routing)
+    from app.utils.database import configure_engine
+
+    configure_engine(app, db)
     migrate = Migrate()
     migrate.init_app(app, db)
     jwt = JWTManager()
@@ -48,6 +55,7 @@ def create_app(config_name="default"):
             "https://*.vercel.app",
         ],
         allow_headers=["Content-Type", "Authorization"],
+        expose_headers=["Retry-After"],  # Read by the timer stream backoff
         methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         supports_credentials=True,
     )
@@ -60,7 +68,7 @@ def create_app(config_name="default"):
     )
 
     # Register blueprints (same as before)
-    from app.api.auth import auth_bp, check_if_token_is_revoked
+    from app.api.auth import auth_bp, check_if_token_is_revoked, verify_token_scope
     from app.api.projects import project_bp
     from app.api.lists import list_bp
     from app.api.categories import category_bp
@@ -78,11 +86,18 @@ def create_app(config_name="default"):
 
     # Configure JWT token blocklist
     jwt.token_in_blocklist_loader(check_if_token_is_revoked)
+    jwt.token_verification_loader(verify_token_scope)
 
     # Enhanced Redis connection with better error handling
     import redis
     import urllib.parse
 
+    redis_class = redis.StrictRedis
+    if app.config.get("METRICS_ENABLED"):
+        from app.utils.metrics import InstrumentedRedis
+
+        redis_class = InstrumentedRedis
+
     redis_client = None
     try:
         # Try Redis URL first (Railway often provides this)
@@ -90,7 +105,7 @@ def create_app(config_name="default"):
         if redis_url:
             # Parse Redis URL
             parsed_url = urllib.parse.urlparse(redis_url)
-            redis_client = redis.StrictRedis(
+            redis_client = redis_class(
                 host=parsed_url.hostname,
                 port=parsed_url.port or 6379,
                 password=parsed_url.password,
@@ -102,7 +117,7 @@ def create_app(config_name="default"):
             )
         else:
             # Fallback to individual config values
-            redis_client = redis.StrictRedis(
+            redis_client = redis_class(
                 host=app.config.get("REDIS_HOST", "localhost"),
                 port=app.config.get("REDIS_PORT", 6379),
                 password=app.config.get("REDIS_PASSWORD"),
@@ -126,6 +141,98 @@ def create_app(config_name="default"):
         app.logger.error(f"🔴 Unexpected Redis error: {str(e)}")
         app.redis = None
 
+    # Local revoked-token cache in front of Redis (see check_if_token_is_revoked)
+    from app.services.token_blocklist import TokenBlocklist
+
+    app.token_blocklist = TokenBlocklist(
+        app.redis,
+        app.logger,
+        max_entries=app.config.get("TOKEN_BLOCKLIST_MAX_ENTRIES", 100_000),
+        negative_ttl=app.config.get("TOKEN_BLOCKLIST_NEGATIVE_TTL", 10.0),
+    )
+    app.token_blocklist.start()
+
+    # Per-user response cache, invalidated when a user's data is committed
+    app.response_cache = None
+    if app.config.get("RESPONSE_CACHE_ENABLED"):
+        from app.services.response_cache import ResponseCache
+
+        app.response_cache = ResponseCache(
+            app.redis,
+            app.logger,
+            max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 10_000),
+            ttl=app.config.get("RESPONSE_CACHE_TTL", 300),
+        )
+
+    # AI answers shared across requests and workers
+    app.ai_cache = None
+    if app.config.get("AI_CACHE_ENABLED"):
+        from app.services.ai_cache import AIResponseCache
+
+        app.ai_cache = AIResponseCache(
+            app.redis,
+            app.logger,
+            max_entries=app.config.get("AI_CACHE_MAX_ENTRIES", 1000),
+            ttl=app.config.get("AI_CACHE_TTL", 3600),
+            inflight_timeout=app.config.get("AI_INFLIGHT_TIMEOUT", 60.0),
+        )
+
+    # Thread pool running AI insight jobs off the request threads
+    app.ai_jobs = None
+    if app.config.get("AI_JOBS_ENABLED"):
+        from app.services.ai_job_service import AIJobRunner
+
+        app.ai_jobs = AIJobRunner(
+            app, max_workers=app.config.get("AI_JOBS_MAX_WORKERS", 2)
+        )
+
+    # Timer event fan-out for the server-sent events stream
+    from app.services.timer_event_service import TimerEventBroker
+
+    app.timer_events = TimerEventBroker(
+        app.redis,
+        app.logger,
+        max_streams=app.config.get("TIMER_STREAM_MAX_CONNECTIONS", 4),
+        max_seconds=app.config.get("TIMER_STREAM_MAX_SECONDS", 300),
+    )
+
+    # Background expiry detection for running timers
+    app.timer_scheduler = None
+    if app.config.get("TIMER_SCHEDULER_ENABLED"):
+        from app.services.timer_scheduler import TimerExpiryScheduler
+
+        app.timer_scheduler = TimerExpiryScheduler(app, app.timer_events)
+        app.timer_scheduler.start()
+
+    # Per-request SQL statement profiling (sampled)
+    if app.config.get("QUERY_PROFILER_ENABLED"):
+        from app.utils.query_profiler import QueryProfiler
+
+        QueryProfiler(app)
+
+        # Debug-only: the report covers the requests of every user
+        if app.debug and app.config.get("QUERY_PROFILER_REPORT"):
+            from flask import request
+            from flask_jwt_extended import jwt_required
+            from app.utils.helpers import create_response
+
+            @app.route("/debug/queries", methods=["GET", "DELETE"])
+            @jwt_required()
+            def query_report():
+                """Per-endpoint statement counts and N+1 suspects"""
+                if request.method == "DELETE":
+                    app.query_profiler.reset()
+                    return create_response(message="Query statistics cleared")
+                return create_response(
+                    message="Query statistics", data=app.query_profiler.report()
+                )
+
+    # Prometheus metrics (request latency, DB pool, Redis, timers, AI)
+    if app.config.get("METRICS_ENABLED"):
+        from app.utils.metrics import init_metrics
+
+        init_metrics(app)
+
     @app.route("/health")
     def health_check():
         """Health check endpoint with Redis status"""
@@ -3,22 +3,42 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import date, time, timedelta, datetime
 from sqlalchemy import or_, and_
 from app.services.analytics_service import AnalyticsService
-from app.models import Categories, Tasks, TaskStatus
+from app.services.ai_service import AIService
+from app.services.ai_job_service import AIJobService
+from app.services.daily_analytics_service import DailyAnalyticsService
+from app.services.response_cache import cached_response
+from app.models import db, AIJobStatus, Categories, TaskStatus
 from app.utils.helpers import create_response
+from app.utils.etag import (
+    conditional_get,
+    daily_analytics_watermark,
+    category_watermark,
+    user_categories_watermark,
+)
 
 analytics_bp = Blueprint("analytics", __name__)
 
 # Import additional functions from analytics_service
 from app.services.analytics_service import (
-    calculate_daily_completion_rate,
-    get_category_completion_rate,
-    calculate_category_estimation_accuracy,
-    get_category_mental_state_distribution
+    get_daily_completion_rates,
+    get_user_categories_analytics,
+    calculate_category_analytics,
 )
 
 
+def read_daily_completion_rates(user_id, start_date, end_date):
+    """Read daily completion rates from the rollup, or from raw tasks if disabled"""
+    if current_app.config.get("DAILY_ANALYTICS_ROLLUP"):
+        return DailyAnalyticsService(db).get_completion_rates(
+            user_id, start_date, end_date
+        )
+    return get_daily_completion_rates(user_id, start_date, end_date)
+
+
 @analytics_bp.route("/daily/month/<year>/<month>", methods=["GET"])
 @jwt_required()
+@conditional_get(daily_analytics_watermark)
+@cached_response("daily_completion")
 def get_monthly_completion_rates(year, month):
     """Get completion rates for all days in a month"""
     try:
@@ -31,23 +51,49 @@ def get_monthly_completion_rates(year, month):
         else:
             last_day = date(int(year), int(month) + 1, 1) - timedelta(days=1)
 
-        # Calculate for each day
-        daily_rates = {}
-        current_date = first_day
-        while current_date <= last_day:
-            completion_rate = calculate_daily_completion_rate(user_id, current_date)
-            if completion_rate > 0:  # Only include days with activity
-                daily_rates[current_date.strftime("%Y-%m-%d")] = completion_rate
-            current_date += timedelta(days=1)
+        daily_rates = read_daily_completion_rates(user_id, first_day, last_day)
 
         return create_response(data=daily_rates)
     except Exception as e:
         return create_response(False, "Failed to get monthly data", status=500)
 
 
+@analytics_bp.route("/daily/range", methods=["GET"])
+@jwt_required()
+@conditional_get(daily_analytics_watermark)
+@cached_response("daily_completion")
+def get_range_completion_rates():
+    """Get completion rates for all days between start_date and end_date"""
+    try:
+        user_id = get_jwt_identity()
+
+        if not request.args.get("start_date") or not request.args.get("end_date"):
+            return create_response(
+                False, "start_date and end_date are required", status=400
+            )
+
+        start_date = datetime.strptime(request.args.get("start_date"), "%Y-%m-%d").date()
+        end_date = datetime.strptime(request.args.get("end_date"), "%Y-%m-%d").date()
+        if start_date > end_date:
+            return create_response(
+                False, "start_date must be before end_date", status=400
+            )
+
+        daily_rates = read_daily_completion_rates(user_id, start_date, end_date)
+
+        return create_response(data=daily_rates)
+    except ValueError as e:
+        return create_response(False, str(e), status=400)
+    except Exception as e:
+        current_app.logger.error(f"Error getting range completion rates: {str(e)}")
+        return create_response(False, "Failed to get range data", status=500)
+
+
 # Get comprehensive analytics for a single category
 @analytics_bp.route("/categories/<int:category_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(category_watermark)
+@cached_response("category_analytics")
 def get_category_analytics(category_id):
     """Get completion rate, estimation accuracy, and mental state distribution for a category"""
     try:
@@ -70,14 +116,11 @@ def get_category_analytics(category_id):
                 ).date(),
             }
 
-        # Get all three analytics
-        completion_rate = get_category_completion_rate(user_id, category_id, date_range)
-        estimation_accuracy = calculate_category_estimation_accuracy(
-            user_id, category_id, date_range
-        )
-        mental_state_distribution = get_category_mental_state_distribution(
-            user_id, category_id, date_range
-        )
+        # Get all three analytics in a single pass
+        analytics = calculate_category_analytics(user_id, category_id, date_range)
+        completion_rate = analytics["completion_rate"]
+        estimation_accuracy = analytics["estimation_accuracy"]
+        mental_state_distribution = analytics["mental_state_distribution"]
 
         return create_response(
             message="Category analytics retrieved successfully",
@@ -138,30 +181,108 @@ def ai_query():
         return create_response(False, "Failed to process query", status=500)
 
 
+def queue_insights_job(user_id):
+    """Queue an insights job and hand it to the background runner
+
+    Without a runner (AI_JOBS_ENABLED off) the job runs in this request.
+    """
+    job_service = AIJobService(db)
+    job = job_service.create_job(user_id)
+    if job.status == AIJobStatus.QUEUED:
+        if current_app.ai_jobs is not None:
+            current_app.ai_jobs.submit(job.id)
+        else:
+            job = job_service.run_job(job.id) or job
+    return job
+
+
 # Auto-generated insights endpoint
 @analytics_bp.route("/ai/insights", methods=["GET"])
 @jwt_required()
 def ai_insights():
-    """Get auto-generated insights about user's productivity patterns"""
+    """Get the latest generated insights about user's productivity patterns
+
+    Serves the stored insights of the last finished job if they are younger
+    than AI_INSIGHTS_MAX_AGE. Otherwise, or with ?refresh=true, a job is
+    queued and 202 returned with its id to poll.
+    """
     try:
         user_id = get_jwt_identity()
+        refresh = request.args.get("refresh", "false").lower() == "true"
+        max_age = current_app.config.get("AI_INSIGHTS_MAX_AGE", 21600)
 
-        ai_service = AIService(db)
-        insights = ai_service.generate_insights(user_id)
-
-        if "error" in insights:
-            return create_response(False, insights["error"], status=500)
+        latest = (
+            None if refresh else AIJobService(db).latest_insights(user_id, max_age)
+        )
+        if latest:
+            return create_response(
+                message="Insights retrieved successfully",
+                data=AIJobService.serialize_job(latest),
+            )
 
-        return create_response(message="Insights generated successfully", data=insights)
+        job = queue_insights_job(user_id)
+        if job.status == AIJobStatus.DONE:
+            return create_response(
+                message="Insights generated successfully",
+                data=AIJobService.serialize_job(job),
+            )
+        if job.status == AIJobStatus.FAILED:
+            return create_response(False, job.error, status=500)
+        return create_response(
+            message="Insights generation queued",
+            data=AIJobService.serialize_job(job),
+            status=202,
+        )
 
     except Exception as e:
         current_app.logger.error(f"Error generating insights: {str(e)}")
         return create_response(False, "Failed to generate insights", status=500)
 
 
+@analytics_bp.route("/ai/insights/jobs", methods=["POST"])
+@jwt_required()
+def create_insights_job():
+    """Queue fresh insights, or return the job already pending for the user"""
+    try:
+        job = queue_insights_job(get_jwt_identity())
+        return create_response(
+            message="Insights generation queued",
+            data=AIJobService.serialize_job(job),
+            status=202,
+        )
+
+    except Exception as e:
+        current_app.logger.error(f"Error queueing insights job: {str(e)}")
+        return create_response(False, "Failed to queue insights", status=500)
+
+
+@analytics_bp.route("/ai/insights/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def get_insights_job(job_id):
+    """Poll an insights job; finished jobs carry the insights or the error
+
+    Clients holding the /task/timer/stream connection also get an
+    ai_insights_ready event when the job finishes.
+    """
+    try:
+        job = AIJobService(db).get_job(job_id, get_jwt_identity())
+        if not job:
+            return create_response(False, "Job not found", status=404)
+
+        return create_response(
+            message="Job retrieved successfully", data=AIJobService.serialize_job(job)
+        )
+
+    except Exception as e:
+        current_app.logger.error(f"Error retrieving insights job: {str(e)}")
+        return create_response(False, "Failed to retrieve job", status=500)
+
+
 # Get analytics for all categories
 @analytics_bp.route("/categories", methods=["GET"])
 @jwt_required()
+@conditional_get(user_categories_watermark)
+@cached_response("categories_analytics")
 def get_all_categories_analytics():
     """Get basic analytics for all categories"""
     try:
@@ -179,26 +300,9 @@ def get_all_categories_analytics():
                 ).date(),
             }
         
-        # Get all categories for the user
-        categories = Categories.query.filter_by(user_id=user_id).all()
-        
-        # Calculate analytics for each category
-        categories_data = []
-        for category in categories:
-            # Get completion rate for this category
-            completion_rate = get_category_completion_rate(user_id, category.id, date_range)
-            
-            # Count total tasks in this category
-            total_tasks = Tasks.query.filter_by(category_id=category.id).count()
-            
-            categories_data.append({
-                "id": category.id,
-                "name": category.name,
-                "color": category.color,
-                "completion_rate": completion_rate,
-                "total_tasks": total_tasks
-            })
-        
+        # Grouped aggregates for every category at once
+        categories_data = get_user_categories_analytics(user_id, date_range)
+
         return create_response(
             message="All categories analytics retrieved successfully",
             data={"categories": categories_data}
@@ -9,7 +9,6 @@ from flask_jwt_extended import (
 import os
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
-from datetime import datetime, timezone
 
 from app.services.auth_service import AuthService
 from app.models import Users, db
@@ -18,6 +17,11 @@ from app.utils.helpers import create_response
 
 auth_bp = Blueprint("auth", __name__)
 
+# Short-lived tokens for the timer event stream, which has to take its token
+# from the URL; they are accepted by that endpoint only
+STREAM_TOKEN_SCOPE = "timer_stream"
+STREAM_TOKEN_ENDPOINT = "task.stream_timer_events"
+
 
 def check_if_token_is_revoked(jwt_header, jwt_payload):
     """
@@ -30,15 +34,25 @@ def check_if_token_is_revoked(jwt_header, jwt_payload):
     Returns:
         bool: True if token is revoked, False otherwise
     """
-    jti = jwt_payload["jti"]
+    # Served from the in-process cache; Redis is only asked on a cache miss
+    return current_app.token_blocklist.is_revoked(
+        jwt_payload["jti"], jwt_payload.get("exp")
+    )
+
+
+def verify_token_scope(jwt_header, jwt_payload):
+    """
+    Callback function to keep stream tokens and login tokens apart
 
-    # If Redis is not available, we can't check if token is revoked
-    if not current_app.redis:
-        return False
+    Args:
+        jwt_header (dict): JWT header
+        jwt_payload (dict): JWT payload
 
-    # Check if token is in the blocklist
-    token_in_redis = current_app.redis.get(f"revoked_token:{jti}")
-    return token_in_redis is not None
+    Returns:
+        bool: True if the token may be used on the requested endpoint
+    """
+    is_stream_token = jwt_payload.get("scope") == STREAM_TOKEN_SCOPE
+    return is_stream_token == (request.endpoint == STREAM_TOKEN_ENDPOINT)
 
 
 @auth_bp.route("/register", methods=["POST"])
@@ -262,12 +276,7 @@ def delete_account():
 
         # Revoke current token
         jwt_payload = get_jwt()
-        jti = jwt_payload["jti"]
-        if current_app.redis:
-            exp_timestamp = jwt_payload["exp"]
-            current_timestamp = int(datetime.now(timezone.utc).timestamp())
-            ttl = exp_timestamp - current_timestamp
-            current_app.redis.setex(f"revoked_token:{jti}", ttl, "1")
+        current_app.token_blocklist.revoke(jwt_payload["jti"], jwt_payload["exp"])
 
         # Todo: add more information to the response
         return create_response(
@@ -289,13 +298,8 @@ def logout():
     user_id = get_jwt_identity()
 
     try:
-        # If Redis is available, use it for token blacklisting
-        if current_app.redis:
-            # Store the JTI in Redis with an expiry time matching the token's
-            exp_timestamp = jwt_payload["exp"]
-            current_timestamp = int(datetime.now(timezone.utc).timestamp())
-            ttl = exp_timestamp - current_timestamp
-            current_app.redis.setex(f"revoked_token:{jti}", ttl, "1")
+        # Blocklist the JTI until the token expires (Redis + every worker's cache)
+        current_app.token_blocklist.revoke(jti, jwt_payload["exp"])
 
         # Also update the user's token status in the database
         user = Users.query.get(user_id)
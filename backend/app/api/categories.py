@@ -2,9 +2,17 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from app.models import db, Categories, Users
+from app.models import db, Categories, Users, Tasks
+from app.services.response_cache import cached_response
 from app.utils.helpers import create_response
 from app.utils.validators import validate_hex_color
+from app.utils.loading import loader_options
+from app.utils.pagination import parse_page_args, keyset_page
+from app.utils.etag import (
+    conditional_get,
+    user_categories_watermark,
+    category_watermark,
+)
 
 category_bp = Blueprint("category", __name__)
 
@@ -17,8 +25,8 @@ def serialize_category(category):
         "color": category.color,
         "user_id": category.user_id,
         "task_count": len(category.tasks),  # Number of tasks using this category
-        "created_at": category.created_at.isoformat() if category.created_at else None,
-        "updated_at": category.updated_at.isoformat() if category.updated_at else None,
+        "created_at": category.created_at,
+        "updated_at": category.updated_at,
     }
 
 
@@ -28,15 +36,13 @@ def serialize_task(task):
         "id": task.id,
         "name": task.name,
         "description": task.description,
-        "status": task.status.value,
-        "priority": task.priority.value,
+        "status": task.status,
+        "priority": task.priority,
         "planned_duration": task.planned_duration,
         "total_time_worked": task.total_time_worked,
-        "first_started_at": (
-            task.first_started_at.isoformat() if task.first_started_at else None
-        ),
-        "completed_at": (task.completed_at.isoformat() if task.completed_at else None),
-        "mental_state": task.mental_state.value if task.mental_state else None,
+        "first_started_at": task.first_started_at,
+        "completed_at": task.completed_at,
+        "mental_state": task.mental_state,
         "reflection": task.reflection,
         "list_id": task.list_id,
         "category_id": task.category_id,
@@ -113,11 +119,16 @@ def create_category():
 
 @category_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional_get(user_categories_watermark)
 def get_user_categories():
     """Get all categories for the current user"""
     try:
         user_id = get_jwt_identity()
-        categories = Categories.query.filter_by(user_id=user_id).all()
+        categories = (
+            Categories.query.options(*loader_options("category_tasks"))
+            .filter_by(user_id=user_id)
+            .all()
+        )
 
         categories_data = [serialize_category(category) for category in categories]
 
@@ -233,31 +244,52 @@ def delete_category(category_id):
 
 @category_bp.route("/<int:category_id>/tasks", methods=["GET"])
 @jwt_required()
+@conditional_get(category_watermark)
 def get_category_tasks(category_id):
     """Get all tasks that belong to a specific category"""
     try:
         user_id = get_jwt_identity()
-        category = Categories.query.filter_by(id=category_id, user_id=user_id).first()
+        limit, cursor = parse_page_args(request.args)
+
+        query = Categories.query.filter_by(id=category_id, user_id=user_id)
+        if not limit:
+            query = query.options(*loader_options("category_tasks"))
+        category = query.first()
 
         if not category:
             return create_response(False, "Category not found", status=404)
 
+        if limit:
+            # One page of tasks, ordered by id (?limit=&cursor=)
+            task_query = Tasks.query.filter(Tasks.category_id == category_id)
+            tasks, next_cursor = keyset_page(task_query, Tasks.id, limit, cursor)
+            task_count = task_query.count()
+        else:
+            tasks = category.tasks
+            task_count = len(tasks)
+
         # Serialize tasks using the local serialize_task function
-        tasks_data = [serialize_task(task) for task in category.tasks]
+        tasks_data = [serialize_task(task) for task in tasks]
+
+        category_data = {
+            "id": category.id,
+            "name": category.name,
+            "color": category.color,
+            "task_count": task_count,
+            "tasks": tasks_data,
+            "created_at": category.created_at,
+            "updated_at": category.updated_at,
+        }
+        if limit:
+            category_data["next_cursor"] = next_cursor
 
         return create_response(
             message=f"Retrieved tasks for category '{category.name}' successfully",
-            data={
-                "id": category.id,
-                "name": category.name,
-                "color": category.color,
-                "task_count": len(tasks_data),
-                "tasks": tasks_data,
-                "created_at": category.created_at.isoformat() if category.created_at else None,
-                "updated_at": category.updated_at.isoformat() if category.updated_at else None,
-            },
+            data=category_data,
         )
 
+    except ValueError as e:
+        return create_response(False, str(e), status=400)
     except Exception as e:
         current_app.logger.error(f"Get category tasks error: {str(e)}")
         return create_response(
@@ -268,6 +300,8 @@ def get_category_tasks(category_id):
 # Utility endpoint for frontend dropdowns
 @category_bp.route("/options", methods=["GET"])
 @jwt_required()
+@conditional_get(user_categories_watermark)
+@cached_response("category_options")
 def get_category_options():
     """Get simplified category list for dropdowns/selectors"""
     try:
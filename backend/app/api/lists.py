@@ -13,6 +13,8 @@ from app.services.project_service import ProjectService
 from app.models import Lists, Projects, Users, db
 
 from app.utils.helpers import create_response
+from app.utils.pagination import parse_page_args
+from app.utils.etag import conditional_get, list_watermark
 
 list_bp = Blueprint("list", __name__)
 
@@ -61,11 +63,13 @@ def create_new_list(project_id):
 
 @list_bp.route("/<int:list_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(list_watermark)
 def get_one_list(list_id):
     """Get a specific list with all its tasks"""
     try:
+        limit, cursor = parse_page_args(request.args)
         project_service = ProjectService(db)
-        list_data = project_service.read_one_list(list_id)
+        list_data = project_service.read_one_list(list_id, limit=limit, cursor=cursor)
 
         if not list_data:
             return create_response(False, "List not found", status=404)
@@ -144,6 +148,7 @@ def delete_one_list(list_id):
 
 @list_bp.route("/<int:list_id>/summary", methods=["GET"])
 @jwt_required()
+@conditional_get(list_watermark)
 def get_list_summary(list_id):
     """Get list summary without full task details (for dashboard views)"""
     try:
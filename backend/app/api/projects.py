@@ -10,9 +10,12 @@ import os
 from datetime import datetime, timezone
 
 from app.services.project_service import ProjectService
+from app.services.response_cache import cached_response
 from app.models import Projects, Users, db
 
 from app.utils.helpers import create_response
+from app.utils.pagination import parse_page_args
+from app.utils.etag import conditional_get, user_projects_watermark, project_watermark
 
 project_bp = Blueprint("project", __name__)
 
@@ -26,8 +29,8 @@ def serialize_project(project, include_summary=True):
         "name": project.name,
         "description": project.description,
         "status": project.status,
-        "created_at": project.created_at.isoformat() if project.created_at else None,
-        "updated_at": project.updated_at.isoformat() if project.updated_at else None,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
     }
 
     if include_summary:
@@ -94,12 +97,20 @@ def create_project():
 
 @project_bp.route("/", methods=["GET"])
 @jwt_required()
+@conditional_get(user_projects_watermark)
+@cached_response("projects")
 def retrieve_all_projects():
     """Get all projects for the current user"""
     try:
         user_id = get_jwt_identity()
+        limit, cursor = parse_page_args(request.args)
         project_service = ProjectService(db)
-        projects_data = project_service.get_user_projects(user_id)
+        if limit:
+            projects_data = project_service.get_user_projects_page(
+                user_id, limit, cursor
+            )
+        else:
+            projects_data = project_service.get_user_projects(user_id)
         return create_response(
             message="Retrieved user projects successfully", data=projects_data
         )
@@ -114,6 +125,7 @@ def retrieve_all_projects():
 
 @project_bp.route("/<int:project_id>", methods=["GET"])
 @jwt_required()
+@conditional_get(project_watermark)
 def retrieve_one_project(project_id):
     """Get a specific project with all its lists"""
     try:
@@ -196,6 +208,8 @@ def delete_one_project(project_id):
 
 @project_bp.route("/<int:project_id>/summary", methods=["GET"])
 @jwt_required()
+@conditional_get(project_watermark)
+@cached_response("project_summary")
 def get_project_summary(project_id):
     """Get project summary without detailed list information (for dashboard views)"""
     try:
@@ -1,9 +1,19 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from flask import (
+    Blueprint,
+    Response,
+    request,
+    jsonify,
+    current_app,
+    stream_with_context,
+)
+from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from datetime import datetime, timedelta
 
 from app.services.task_service import TaskService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.response_cache import cached_response
 from app.models import db, TaskStatus, TaskPriority, MentalState
+from app.api.auth import STREAM_TOKEN_SCOPE
 from app.utils.helpers import create_response
 
 task_bp = Blueprint("task", __name__)
@@ -15,15 +25,13 @@ def serialize_task(task):
         "id": task.id,
         "name": task.name,
         "description": task.description,
-        "status": task.status.value,
-        "priority": task.priority.value,
+        "status": task.status,
+        "priority": task.priority,
         "planned_duration": task.planned_duration,
         "total_time_worked": task.total_time_worked,
-        "first_started_at": (
-            task.first_started_at.isoformat() if task.first_started_at else None
-        ),
-        "completed_at": (task.completed_at.isoformat() if task.completed_at else None),
-        "mental_state": task.mental_state.value if task.mental_state else None,
+        "first_started_at": task.first_started_at,
+        "completed_at": task.completed_at,
+        "mental_state": task.mental_state,
         "reflection": task.reflection,
         "list_id": task.list_id,
         "category_id": task.category_id,
@@ -104,6 +112,80 @@ def create_task():
         )
 
 
+def parse_bulk_request(data):
+    """Validate the envelope of a bulk request and return its items"""
+    if not data or not isinstance(data.get("tasks"), list):
+        raise ValueError("Request body must contain a 'tasks' array")
+
+    items = data["tasks"]
+    if not items:
+        raise ValueError("'tasks' cannot be empty")
+
+    max_items = current_app.config.get("TASK_BULK_MAX_ITEMS", 1000)
+    if len(items) > max_items:
+        raise ValueError(f"Too many tasks in one request (max {max_items})")
+
+    return items
+
+
+@task_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_create_tasks():
+    """Create many tasks in one transaction, reporting per-item errors"""
+    try:
+        data = request.get_json(silent=True)
+        items = parse_bulk_request(data)
+
+        task_service = TaskService(db)
+        created, errors = task_service.bulk_add_tasks(
+            items, get_jwt_identity(), atomic=bool(data.get("atomic", False))
+        )
+
+        return create_response(
+            success=bool(created),
+            message=f"Created {len(created)} of {len(items)} tasks",
+            data={"created": created, "errors": errors},
+            status=200 if created else 400,
+        )
+    except ValueError as e:
+        return create_response(False, str(e), status=400)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk create tasks error: {str(e)}")
+        return create_response(
+            False, "Unable to process request. Please try again.", status=500
+        )
+
+
+@task_bp.route("/bulk", methods=["PATCH"])
+@jwt_required()
+def bulk_update_tasks():
+    """Update many tasks in one transaction, reporting per-item errors"""
+    try:
+        data = request.get_json(silent=True)
+        items = parse_bulk_request(data)
+
+        task_service = TaskService(db)
+        updated, errors = task_service.bulk_update_tasks(
+            items, get_jwt_identity(), atomic=bool(data.get("atomic", False))
+        )
+
+        return create_response(
+            success=bool(updated),
+            message=f"Updated {len(updated)} of {len(items)} tasks",
+            data={"updated": updated, "errors": errors},
+            status=200 if updated else 400,
+        )
+    except ValueError as e:
+        return create_response(False, str(e), status=400)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk update tasks error: {str(e)}")
+        return create_response(
+            False, "Unable to process request. Please try again.", status=500
+        )
+
+
 @task_bp.route("/<int:task_id>", methods=["GET"])
 @jwt_required()
 def get_task(task_id):
@@ -355,8 +437,99 @@ def poll_timer_status(task_id):
         )
 
 
+# Seconds a client refused a timer stream should wait before asking again
+STREAM_RETRY_AFTER = 30
+
+
+def streams_unavailable():
+    body, status = create_response(
+        False, "Too many open timer streams. Please try again later.", status=503
+    )
+    body.headers["Retry-After"] = str(STREAM_RETRY_AFTER)
+    return body, status
+
+
+@task_bp.route("/timer/stream-token", methods=["POST"])
+@jwt_required()
+def create_timer_stream_token():
+    """Issue a short-lived token that only opens the timer event stream
+
+    Answers 503 with Retry-After when this worker has no free stream slot,
+    so clients can back off before opening a stream that would be refused.
+    """
+    if not current_app.timer_events.has_free_slot():
+        return streams_unavailable()
+
+    expires_in = current_app.config.get("TIMER_STREAM_TOKEN_SECONDS", 60)
+    token = create_access_token(
+        identity=get_jwt_identity(),
+        expires_delta=timedelta(seconds=expires_in),
+        additional_claims={"scope": STREAM_TOKEN_SCOPE},
+    )
+
+    return create_response(data={"token": token, "expires_in": expires_in})
+
+
+@task_bp.route("/timer/stream", methods=["GET"])
+@jwt_required(locations=["query_string"])
+def stream_timer_events():
+    """Server-sent events stream of timer changes for the current user
+
+    EventSource cannot set headers, so the token is passed as ?jwt=<token>.
+    Only tokens from /timer/stream-token are accepted here, so the login
+    token never appears in access logs.
+    Streams hold a worker thread each, so they are capped per worker process
+    (TIMER_STREAM_MAX_CONNECTIONS); over the cap clients get a 503 with
+    Retry-After and check /<task_id>/timer/expired every 30s until a stream
+    opens.
+    """
+    user_id = get_jwt_identity()
+    heartbeat = current_app.config.get("TIMER_STREAM_HEARTBEAT_SECONDS", 15)
+    broker = current_app.timer_events
+
+    if not broker.acquire_slot():
+        return streams_unavailable()
+
+    response = Response(
+        broker.stream(user_id, heartbeat),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Called by the WSGI server when the stream ends or the client goes away
+    response.call_on_close(broker.release_slot)
+    return response
+
+
+@task_bp.route("/export", methods=["GET"])
+@jwt_required()
+def export_tasks():
+    """Stream the user's full task history as NDJSON (default) or CSV"""
+    export_format = request.args.get("format", "ndjson").lower()
+    if export_format not in EXPORT_FORMATS:
+        return create_response(
+            False,
+            f"Invalid export format. Valid options: {list(EXPORT_FORMATS)}",
+            status=400,
+        )
+
+    user_id = get_jwt_identity()
+    batch_size = current_app.config.get("EXPORT_BATCH_SIZE", 1000)
+    export_service = ExportService(db, batch_size=batch_size)
+    filename = f"tasks-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+
+    return Response(
+        stream_with_context(export_service.stream(user_id, export_format)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @task_bp.route("/create-options", methods=["GET"])
 @jwt_required()
+@cached_response("task_create_options")
 def get_task_create_options():
     """Get options needed for task creation (categories, etc.)"""
     try:
@@ -2,13 +2,49 @@ import os
 from datetime import timedelta
 
 
+def database_url(env_name, default=None):
+    """URL from an environment variable (normalized for psycopg), else default"""
+    url = os.getenv(env_name)
+    if not url:
+        return default
+    # Heroku/Railway style URLs use the legacy postgres:// scheme
+    for prefix in ("postgres://", "postgresql://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix) :]
+    return url
+
+
 class Config:
     """Base configuration."""
 
-    # Use SQLite for all environments
-    SQLALCHEMY_DATABASE_URI = "sqlite:///task_app.db"
+    # SQLite by default; set DATABASE_URL to use PostgreSQL
+    SQLALCHEMY_DATABASE_URI = database_url("DATABASE_URL", "sqlite:///task_app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite tuning, applied to every new connection. WAL lets readers run
+    # alongside the single writer; busy_timeout makes writers wait for the
+    # lock instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -64000))  # KiB when negative
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 5))
+    SQLITE_POOL_MAX_OVERFLOW = int(os.getenv("SQLITE_POOL_MAX_OVERFLOW", 5))
+
+    # Read engine for GET requests and analytics: a replica URL, or for a
+    # SQLite file READ_ENGINE_ENABLED opens a separate query_only pool.
+    # Users who wrote within READ_YOUR_WRITES_SECONDS keep reading the primary.
+    READ_DATABASE_URL = database_url("READ_DATABASE_URL")
+    READ_ENGINE_ENABLED = os.getenv("READ_ENGINE_ENABLED", "False").lower() == "true"
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+    # PostgreSQL connection pool (per gunicorn worker)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "secret-key")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -26,6 +62,97 @@ class Config:
     REDIS_DB = int(os.getenv("REDIS_DB", 0))
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 
+    # Revoked-token cache - entries kept per worker, and seconds a
+    # "not revoked" answer is trusted before asking Redis again
+    TOKEN_BLOCKLIST_MAX_ENTRIES = int(os.getenv("TOKEN_BLOCKLIST_MAX_ENTRIES", 100000))
+    TOKEN_BLOCKLIST_NEGATIVE_TTL = float(os.getenv("TOKEN_BLOCKLIST_NEGATIVE_TTL", 10))
+
+    # Analytics - read calendar data from the DailyAnalytics rollup. The rollup
+    # is kept up to date either way; turn this on once backfill_analytics.py
+    # has filled it for existing tasks
+    DAILY_ANALYTICS_ROLLUP = os.getenv("DAILY_ANALYTICS_ROLLUP", "False").lower() == "true"
+
+    # Relationship loading for read paths: selectin, joined or lazy
+    EAGER_LOADING_STRATEGY = os.getenv("EAGER_LOADING_STRATEGY", "selectin")
+
+    # Timer event stream - seconds between keepalive comments
+    TIMER_STREAM_HEARTBEAT_SECONDS = int(os.getenv("TIMER_STREAM_HEARTBEAT_SECONDS", 15))
+
+    # Each open timer stream holds a gunicorn thread: streams allowed per worker
+    # (keep below GUNICORN_THREADS) and seconds before a stream is recycled
+    TIMER_STREAM_MAX_CONNECTIONS = int(os.getenv("TIMER_STREAM_MAX_CONNECTIONS", 4))
+    TIMER_STREAM_MAX_SECONDS = int(os.getenv("TIMER_STREAM_MAX_SECONDS", 300))
+
+    # Lifetime of the stream-only token passed in the event stream URL
+    TIMER_STREAM_TOKEN_SECONDS = int(os.getenv("TIMER_STREAM_TOKEN_SECONDS", 60))
+
+    # Background timer expiry scheduler (one per worker process)
+    TIMER_SCHEDULER_ENABLED = os.getenv("TIMER_SCHEDULER_ENABLED", "True").lower() == "true"
+
+    # Maximum number of tasks accepted by /task/bulk in one request
+    TASK_BULK_MAX_ITEMS = int(os.getenv("TASK_BULK_MAX_ITEMS", 1000))
+
+    # Largest page a client may request with ?limit= (keyset pagination)
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 500))
+
+    # Weak ETags on project, list, category and analytics reads (304 on match)
+    ETAGS_ENABLED = os.getenv("ETAGS_ENABLED", "True").lower() == "true"
+
+    # Per-user cache of summary, option and analytics responses, dropped when
+    # the user's data changes; entries expire after the TTL (seconds) and the
+    # in-process fallback (no Redis) keeps at most MAX_ENTRIES responses
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 10000))
+
+    # Rows fetched per server-side cursor batch by /task/export
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Per-request SQL profiling - fraction of requests sampled, statement
+    # repeats that count as N+1, and whether /debug/queries is served (only
+    # ever in debug mode)
+    QUERY_PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "True").lower() == "true"
+    QUERY_PROFILER_SAMPLE_RATE = float(os.getenv("QUERY_PROFILER_SAMPLE_RATE", 0.05))
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(
+        os.getenv("QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 5)
+    )
+    QUERY_PROFILER_REPORT = False
+
+    # AI model client: "gemini" (needs GOOGLE_GEMINI_API_KEY) or "stub" for
+    # offline runs, with AI_STUB_LATENCY seconds of simulated model latency
+    AI_CLIENT = os.getenv("AI_CLIENT", "gemini")
+    AI_STUB_LATENCY = float(os.getenv("AI_STUB_LATENCY", 0))
+
+    # AI answers cached by (user data, normalized question); identical calls
+    # in flight wait up to AI_INFLIGHT_TIMEOUT seconds for the first one
+    AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "True").lower() == "true"
+    AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", 3600))
+    AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 1000))
+    AI_INFLIGHT_TIMEOUT = float(os.getenv("AI_INFLIGHT_TIMEOUT", 60))
+
+    # Prompts carry a compact summary of the user's data, trimmed until they
+    # fit AI_PROMPT_TOKEN_BUDGET (estimated) tokens
+    AI_PROMPT_TOKEN_BUDGET = int(os.getenv("AI_PROMPT_TOKEN_BUDGET", 1500))
+    AI_PROMPT_TOP_CATEGORIES = int(os.getenv("AI_PROMPT_TOP_CATEGORIES", 5))
+
+    # Insights are generated by background jobs on AI_JOBS_MAX_WORKERS threads
+    # per process (inline when disabled); pending jobs fail after AI_JOB_TIMEOUT
+    AI_JOBS_ENABLED = os.getenv("AI_JOBS_ENABLED", "True").lower() == "true"
+    AI_JOBS_MAX_WORKERS = int(os.getenv("AI_JOBS_MAX_WORKERS", 2))
+    AI_JOB_TIMEOUT = int(os.getenv("AI_JOB_TIMEOUT", 300))
+
+    # Seconds stored insights are served before GET /analytics/ai/insights
+    # queues a new job
+    AI_INSIGHTS_MAX_AGE = int(os.getenv("AI_INSIGHTS_MAX_AGE", 21600))
+
+    # Prometheus metrics at /metrics. Scrapers send "Authorization: Bearer
+    # <METRICS_TOKEN>"; without a token the endpoint is only served in debug
+    # mode. Gauges that need a query are refreshed every METRICS_REFRESH_SECONDS
+    # (0 disables the refresh thread)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    METRICS_REFRESH_SECONDS = int(os.getenv("METRICS_REFRESH_SECONDS", 30))
+
     # Security
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 
@@ -39,6 +166,10 @@ class DevelopmentConfig(Config):
     # Make Redis optional in development
     REDIS_ENABLED = os.getenv("REDIS_ENABLED", "False").lower() == "true"
 
+    # Profile every request and expose /debug/queries
+    QUERY_PROFILER_SAMPLE_RATE = float(os.getenv("QUERY_PROFILER_SAMPLE_RATE", 1.0))
+    QUERY_PROFILER_REPORT = os.getenv("QUERY_PROFILER_REPORT", "True").lower() == "true"
+
 
 class ProductionConfig(Config):
     """Production configuration."""
@@ -47,6 +178,9 @@ class ProductionConfig(Config):
     # Redis should be enabled in production
     REDIS_ENABLED = os.getenv("REDIS_ENABLED", "True").lower() == "true"
 
+    # Query statistics expose every user's endpoints and SQL; never served here
+    QUERY_PROFILER_REPORT = False
+
 
 class TestingConfig(Config):
     """Testing configuration."""
@@ -54,6 +188,9 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     REDIS_ENABLED = False  # Disable Redis for tests
+    TIMER_SCHEDULER_ENABLED = False  # Tests drive the scheduler explicitly
+    AI_CLIENT = "stub"  # No network calls to the AI model
+    METRICS_REFRESH_SECONDS = 0  # No background queries on the test database
 
 
 # Configuration dictionary
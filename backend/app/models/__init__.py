@@ -6,6 +6,7 @@ from .base import (
     MentalState,
     ExperimentStatus,
     ProjectStatus,
+    AIJobStatus,
 )
 
 # Import all models
@@ -17,6 +18,7 @@ from .analytics import (
     CategoryAnalytics,
     ProjectAnalytics,
     DailyAnalytics,
+    AIInsightJobs,
 )
 from .experiment import (
     ExperimentTypes,
@@ -34,6 +36,7 @@ __all__ = [
     "MentalState",
     "ExperimentStatus",
     "ProjectStatus",
+    "AIJobStatus",
     # User models
     "Users",
     "Authentications",
@@ -48,6 +51,7 @@ __all__ = [
     "CategoryAnalytics",
     "ProjectAnalytics",
     "DailyAnalytics",
+    "AIInsightJobs",
     # Experiment models
     "ExperimentTypes",
     "UserExperiments",
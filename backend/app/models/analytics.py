@@ -5,6 +5,10 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     Text,
+    UniqueConstraint,
+    Index,
+    Enum,
+    text,
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -12,10 +16,11 @@ from sqlalchemy.orm import (
     relationship,
     declared_attr,
 )
+import uuid
 from datetime import datetime
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
-from .base import db
+from .base import db, AIJobStatus
 
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
@@ -82,7 +87,12 @@ class ProjectAnalytics(BaseAnalytics, db.Model):
 class DailyAnalytics(db.Model):
     """Table to store the computed daily completion rate
 
+    One row per user per UTC day, kept up to date by TaskService as tasks are
+    created, started, completed and deleted.
+
     Attributes:
+        tasks_active: number of tasks created, started or completed on the day
+        tasks_completed: number of tasks completed on the day
         completion_rate: the completion rate is calculated as the percentage of tasks
                          done in the day over the total of tasks added. Each task has
                          a weight associated with its priority. Each task has a value of 1.
@@ -92,6 +102,61 @@ class DailyAnalytics(db.Model):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     date: Mapped[datetime] = mapped_column(DateTime)
-    completion_rate: Mapped[float] = mapped_column(Float)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    tasks_active: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    tasks_completed: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    completion_rate: Mapped[float] = mapped_column(Float, default=0.0)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE")
+    )
     user: Mapped["Users"] = relationship(back_populates="dailyanalytics")
+
+    __table_args__ = (
+        # Also serves as the (user_id, date) lookup index for calendar reads
+        UniqueConstraint("user_id", "date", name="_user_daily_analytics_uc"),
+    )
+
+
+class AIInsightJobs(db.Model):
+    """AI insights generated in the background, polled by job id
+
+    Attributes:
+        status: queued, running, done or failed
+        insights: the generated insights as JSON text (as in BaseAnalytics.insights)
+        error: why a failed job failed
+    """
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    status: Mapped[AIJobStatus] = mapped_column(
+        Enum(AIJobStatus), nullable=False, default=AIJobStatus.QUEUED
+    )
+    insights: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE")
+    )
+    user: Mapped["Users"] = relationship(back_populates="aiinsightjobs")
+
+    __table_args__ = (
+        # Latest job per user, and the queued/running job a request may join
+        Index("idx_aiinsightjobs_user_created", "user_id", "created_at"),
+        # At most one queued/running job per user, however many requests race
+        Index(
+            "uq_aiinsightjobs_user_pending",
+            "user_id",
+            unique=True,
+            sqlite_where=text("status IN ('QUEUED', 'RUNNING')"),
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+    )
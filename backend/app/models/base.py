@@ -23,6 +23,7 @@ from datetime import datetime, timezone
 from typing import List
 import enum
 from app.utils import get_utc_now
+from app.utils.read_routing import RoutingSession
 
 
 class Base:
@@ -97,6 +98,18 @@ class ExperimentStatus(enum.Enum):
         return self.value
 
 
+class AIJobStatus(enum.Enum):
+    """Lifecycle of a background AI insights job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __str__(self):
+        return self.value
+
+
 class ProjectStatus(enum.Enum):
     NOT_STARTED = "not_started"
     IN_PROGRESS = "in_progress"
@@ -112,4 +125,4 @@ class ProjectStatus(enum.Enum):
         return [status.value for status in cls]
 
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
@@ -15,7 +15,7 @@ from sqlalchemy.orm import (
 )
 from typing import List, TYPE_CHECKING
 
-from .base import db, ProjectStatus, TaskStatus
+from .base import db, ProjectStatus
 
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
@@ -35,6 +35,8 @@ class Projects(db.Model):
         name (str): name of the project. The uniqueness is defined among the projects of a user. It is not defined globally
         description (str): description of the project
         status (str): done, in_progress, pending, not_started
+        total_tasks (int): number of tasks across all lists of the project
+        completed_tasks (int): number of done tasks across all lists of the project
     """
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -42,7 +44,7 @@ class Projects(db.Model):
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="_user_project_uc"),
         CheckConstraint("length(trim(name)) > 0", name="project_name_not_empty"),
-        Index("idx_projects_user_id", "user_id"),
+        Index("idx_projects_user_id_id", "user_id", "id"),
         Index("idx_projects_status", "status"),
         Index("idx_projects_user_status", "user_id", "status"),
     )
@@ -54,6 +56,14 @@ class Projects(db.Model):
         comment="Project status: not_started, in_progress, pending, done",
     )
 
+    # Denormalized counters across all lists, maintained by TaskService
+    total_tasks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    completed_tasks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     # Many-to-one relationship with the Users table
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     user: Mapped["Users"] = relationship(back_populates="projects")
@@ -71,19 +81,6 @@ class Projects(db.Model):
         """Get total number of lists in this project"""
         return len(self.lists)
 
-    @property
-    def total_tasks(self) -> int:
-        """Get total number of tasks across all lists in this project"""
-        return sum(len(list_item.tasks) for list_item in self.lists)
-
-    @property
-    def completed_tasks(self) -> int:
-        """Get total number of completed tasks across all lists in this project"""
-        return sum(
-            len([task for task in list_item.tasks if task.status == TaskStatus.DONE])
-            for list_item in self.lists
-        )
-
     @property
     def progress(self) -> float:
         """Calculate overall project progress based on task completion"""
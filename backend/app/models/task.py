@@ -75,6 +75,8 @@ class Lists(db.Model):
                     this field can be null because when user creates a list for a specific day,
                     they can specify whether the list belongs to a project
                     or they do not have to do that.
+        task_count (int): number of tasks in the list
+        completed_task_count (int): number of tasks in the list that are done
     """
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -83,6 +85,14 @@ class Lists(db.Model):
     progress: Mapped[float] = mapped_column(
         Float, nullable=False, default=0.0, server_default="0.0"
     )
+
+    # Denormalized counters maintained by TaskService
+    task_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    completed_task_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     __table_args__ = (
         UniqueConstraint("project_id", "name", name="_project_list_uc"),
         CheckConstraint("progress >= 0.0 AND progress <= 1.0", name="progress_range"),
@@ -102,20 +112,8 @@ class Lists(db.Model):
         back_populates="list", cascade="all, delete-orphan"
     )
 
-    @property
-    def task_count(self) -> int:
-        """Get total number of tasks in this list"""
-        return len(self.tasks)
-
-    @property
-    def completed_task_count(self) -> int:
-        """Get number of completed tasks in this list"""
-        return len([task for task in self.tasks if task.status == TaskStatus.DONE])
-
     def calculate_progress(self) -> float:
         """Calculate and return the current progress (doesn't update the field)"""
-        if not self.tasks:
-            return 0.0
         completed = self.completed_task_count
         total = self.task_count
         return completed / total if total > 0 else 0.0
@@ -180,7 +178,7 @@ class Tasks(db.Model):
         CheckConstraint("total_time_worked >= 0", name="non_negative_total_time"),
         CheckConstraint("length(trim(name)) > 0", name="task_name_not_empty"),
         CheckConstraint(
-            "(status = 'done' AND mental_state IS NOT NULL AND reflection IS NOT NULL) OR status != 'done'",
+            "(status = 'DONE' AND mental_state IS NOT NULL AND reflection IS NOT NULL) OR status != 'DONE'",
             name="completion_fields_required_when_done",
         ),
         CheckConstraint(
@@ -188,9 +186,9 @@ class Tasks(db.Model):
             "(current_work_start IS NOT NULL AND current_planned_end IS NOT NULL)",
             name="timer_fields_consistency",
         ),
-        Index("idx_tasks_list_id", "list_id"),
+        Index("idx_tasks_list_id_id", "list_id", "id"),
         Index("idx_tasks_status", "status"),
-        Index("idx_tasks_category_id", "category_id"),
+        Index("idx_tasks_category_id_id", "category_id", "id"),
         Index("idx_tasks_priority", "priority"),
         Index("idx_tasks_status_list", "status", "list_id"),
     )
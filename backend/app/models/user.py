@@ -17,7 +17,12 @@ from .base import db
 if TYPE_CHECKING:
     from .project import Projects
     from .task import Categories
-    from .analytics import ProjectAnalytics, CategoryAnalytics, DailyAnalytics
+    from .analytics import (
+        ProjectAnalytics,
+        CategoryAnalytics,
+        DailyAnalytics,
+        AIInsightJobs,
+    )
     from .experiment import UserExperiments
 
 
@@ -58,6 +63,9 @@ class Users(db.Model):
     userexperiments: Mapped[List["UserExperiments"]] = relationship(
         back_populates="user", cascade="all, delete-orphan"
     )
+    aiinsightjobs: Mapped[List["AIInsightJobs"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
+    )
 
 
 class Authentications(db.Model):
@@ -0,0 +1,215 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import orjson
+import redis
+
+from app.utils.metrics import AI_CACHE_LOOKUPS
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, spacing and closing ?/!/. so trivial rephrasings match
+
+    Other punctuation is kept: operators, signs and decimal points change
+    what is being asked ("rate < 50%" vs "rate > 50%").
+    """
+    query = _TRAILING_PUNCTUATION.sub("", query.casefold())
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def context_hash(user_context: Dict[str, Any]) -> str:
+    """Stable digest of the data an answer was generated from"""
+    payload = orjson.dumps(user_context, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def ai_cache_key(operation: str, user_context: Dict[str, Any], query: str = "") -> str:
+    query_digest = hashlib.blake2b(
+        normalize_query(query).encode(), digest_size=16
+    ).hexdigest()
+    return f"{operation}:{context_hash(user_context)}:{query_digest}"
+
+
+class _Flight:
+    """One upstream call in progress, waited on by identical requests"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class AIResponseCache:
+    """Model answers keyed by (context hash, normalized question)
+
+    A changed context hashes differently, so answers never need invalidating;
+    they expire after ttl seconds. Answers are shared through Redis and kept
+    in a bounded in-process LRU, which also serves while Redis is unreachable.
+
+    Identical requests arriving while an answer is being generated wait for
+    it instead of calling the model again: threads of this worker share the
+    in-flight call, and other workers see a Redis marker and poll the cache
+    until the answer lands (or inflight_timeout passes).
+    """
+
+    KEY_PREFIX = "ai_response"
+    INFLIGHT_PREFIX = "ai_inflight"
+
+    def __init__(
+        self,
+        redis_client=None,
+        logger=None,
+        max_entries: int = 1000,
+        ttl: int = 3600,
+        inflight_timeout: float = 60.0,
+        poll_interval: float = 0.25,
+        retry_after: float = 5.0,
+    ):
+        self.redis = redis_client
+        self.logger = logger
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.inflight_timeout = inflight_timeout
+        self.poll_interval = poll_interval
+        self.retry_after = retry_after
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+    def _redis_available(self) -> bool:
+        return bool(self.redis) and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.retry_after
+        if self.logger:
+            self.logger.warning(
+                f"AI response cache falling back to process memory: {error}"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look in process memory first, then in Redis"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+            self._entries.pop(key, None)
+
+        if not self._redis_available():
+            return None
+        try:
+            value = self.redis.get(f"{self.KEY_PREFIX}:{key}")
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return None
+        return orjson.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        if not self._redis_available():
+            return
+        try:
+            self.redis.setex(f"{self.KEY_PREFIX}:{key}", self.ttl, orjson.dumps(value))
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def get_or_generate(
+        self, operation: str, key: str, generate: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Return the cached answer, or generate it once for all waiting callers
+
+        Only answers with a truthy "success" are cached and shared.
+        """
+        result = self.get(key)
+        if result is not None:
+            AI_CACHE_LOOKUPS.labels(operation, "hit").inc()
+            return result
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait(self.inflight_timeout)
+            if flight.result is not None:
+                AI_CACHE_LOOKUPS.labels(operation, "coalesced").inc()
+                return flight.result
+            # The first call failed or timed out: make our own
+            AI_CACHE_LOOKUPS.labels(operation, "miss").inc()
+            return generate()
+
+        owns_marker = self._claim(key)
+        try:
+            result = None if owns_marker else self._wait_for_answer(key)
+            if result is not None:
+                AI_CACHE_LOOKUPS.labels(operation, "coalesced").inc()
+            else:
+                AI_CACHE_LOOKUPS.labels(operation, "miss").inc()
+                result = generate()
+                if result.get("success"):
+                    self.set(key, result)
+            if result.get("success"):
+                flight.result = result
+            return result
+        finally:
+            if owns_marker:
+                self._release(key)
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _claim(self, key: str) -> bool:
+        """Mark the call as in flight for other workers; False if one already is"""
+        if not self._redis_available():
+            return True
+        try:
+            return bool(
+                self.redis.set(
+                    f"{self.INFLIGHT_PREFIX}:{key}",
+                    "1",
+                    nx=True,
+                    ex=max(1, int(self.inflight_timeout)),
+                )
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return True
+
+    def _wait_for_answer(self, key: str) -> Optional[Dict[str, Any]]:
+        """Poll for the answer another worker is generating"""
+        marker = f"{self.INFLIGHT_PREFIX}:{key}"
+        deadline = time.monotonic() + self.inflight_timeout
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                result = self.get(key)
+                if result is not None:
+                    return result
+                if not self.redis.exists(marker):
+                    # The other worker gave up without an answer
+                    return self.get(key)
+        except redis.RedisError as e:
+            self._redis_failed(e)
+        return None
+
+    def _release(self, key: str) -> None:
+        if not self._redis_available():
+            return
+        try:
+            self.redis.delete(f"{self.INFLIGHT_PREFIX}:{key}")
+        except redis.RedisError as e:
+            self._redis_failed(e)
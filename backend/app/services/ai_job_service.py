@@ -0,0 +1,162 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.models import AIInsightJobs, AIJobStatus
+from app.services.timer_event_service import publish_timer_event
+from app.utils import ensure_timezone_aware, get_utc_now
+
+PENDING_STATUSES = (AIJobStatus.QUEUED, AIJobStatus.RUNNING)
+
+
+class AIJobService:
+    """Create, run and read AI insight jobs
+
+    Jobs live in the database, so whichever worker serves the poll sees the
+    result of the worker that ran the job.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def _expire_if_stale(self, job: AIInsightJobs) -> AIInsightJobs:
+        """Fail a job whose worker died before finishing it"""
+        timeout = current_app.config.get("AI_JOB_TIMEOUT", 300)
+        if (
+            job.status in PENDING_STATUSES
+            and get_utc_now() - ensure_timezone_aware(job.created_at)
+            > timedelta(seconds=timeout)
+        ):
+            job.status = AIJobStatus.FAILED
+            job.error = "Timed out"
+            job.finished_at = get_utc_now()
+            self.db.session.commit()
+        return job
+
+    def _pending_job(self, user_id: str) -> Optional[AIInsightJobs]:
+        return (
+            AIInsightJobs.query.filter_by(user_id=user_id)
+            .filter(AIInsightJobs.status.in_(PENDING_STATUSES))
+            .order_by(AIInsightJobs.created_at.desc())
+            .first()
+        )
+
+    def create_job(self, user_id: str) -> AIInsightJobs:
+        """Queue a job, or return the user's job that is already pending"""
+        pending = self._pending_job(user_id)
+        if pending and self._expire_if_stale(pending).status in PENDING_STATUSES:
+            return pending
+
+        job = AIInsightJobs(user_id=user_id, status=AIJobStatus.QUEUED)
+        self.db.session.add(job)
+        try:
+            self.db.session.commit()
+        except IntegrityError:
+            # A concurrent request queued one first (uq_aiinsightjobs_user_pending)
+            self.db.session.rollback()
+            job = self._pending_job(user_id)
+            if job is None:
+                raise
+        return job
+
+    def get_job(self, job_id: str, user_id: str) -> Optional[AIInsightJobs]:
+        job = AIInsightJobs.query.filter_by(id=job_id, user_id=user_id).first()
+        return self._expire_if_stale(job) if job else None
+
+    def latest_insights(
+        self, user_id: str, max_age: Optional[int] = None
+    ) -> Optional[AIInsightJobs]:
+        """The user's most recent finished job, if it finished within max_age seconds"""
+        query = AIInsightJobs.query.filter_by(user_id=user_id, status=AIJobStatus.DONE)
+        if max_age is not None:
+            query = query.filter(
+                AIInsightJobs.finished_at >= get_utc_now() - timedelta(seconds=max_age)
+            )
+        return query.order_by(AIInsightJobs.created_at.desc()).first()
+
+    def run_job(self, job_id: str) -> Optional[AIInsightJobs]:
+        """Generate the insights of a queued job and store them on it"""
+        from app.services.ai_service import AIService
+
+        claimed = (
+            AIInsightJobs.query.filter_by(id=job_id, status=AIJobStatus.QUEUED).update(
+                {"status": AIJobStatus.RUNNING, "started_at": get_utc_now()}
+            )
+        )
+        self.db.session.commit()
+        if not claimed:
+            return None  # Already taken by another runner
+
+        job = self.db.session.get(AIInsightJobs, job_id)
+        try:
+            result = AIService(self.db).generate_insights(job.user_id)
+        except Exception as e:
+            result = {"error": str(e)}
+
+        if result.get("success"):
+            job.status = AIJobStatus.DONE
+            job.insights = json.dumps(
+                {"insights": result["insights"], "generated_at": result["generated_at"]}
+            )
+        else:
+            job.status = AIJobStatus.FAILED
+            job.error = str(result.get("error", "Failed to generate insights"))[:500]
+        job.finished_at = get_utc_now()
+        self.db.session.commit()
+
+        # The event only signals completion; clients fetch the job for its result
+        publish_timer_event(
+            job.user_id,
+            "ai_insights_ready",
+            {"job_id": job.id, "status": str(job.status)},
+        )
+        return job
+
+    @staticmethod
+    def serialize_job(job: AIInsightJobs) -> Dict[str, Any]:
+        data = {
+            "job_id": job.id,
+            "status": job.status,
+            "created_at": job.created_at,
+            "finished_at": job.finished_at,
+        }
+        if job.status == AIJobStatus.DONE:
+            data.update(json.loads(job.insights))
+        elif job.status == AIJobStatus.FAILED:
+            data["error"] = job.error
+        return data
+
+
+class AIJobRunner:
+    """Runs queued AI jobs on a small thread pool beside the request workers
+
+    The gunicorn thread that queued a job returns straight away; the model
+    round trip happens here, in the same worker process.
+    """
+
+    def __init__(self, app, max_workers: int = 2):
+        self.app = app
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ai-jobs"
+        )
+
+    def submit(self, job_id: str) -> None:
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        from app.models import db
+
+        with self.app.app_context():
+            try:
+                AIJobService(db).run_job(job_id)
+            except Exception as e:
+                self.app.logger.error(f"AI job {job_id} failed: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,227 @@
+"""Compact, token-budgeted renderings of the AI user context
+
+Series are summarized (percentiles, trend, top categories) and rows encoded
+as short pipe-separated tables instead of indented JSON. The context is
+rendered at decreasing levels of detail until the whole prompt fits the
+token budget.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Average characters per token of English text and short numbers. Measuring
+# with the model's own count_tokens would cost a network round trip.
+CHARS_PER_TOKEN = 4
+
+# Levels of detail, richest first: (daily series, categories, task rows)
+DETAIL_LEVELS = (
+    (True, None, 20),
+    (True, None, 10),
+    (False, None, 5),
+    (False, 3, 0),
+    (False, 1, 0),
+)
+
+POSITIVE_STATES = {"energized", "focused", "satisfied", "motivated"}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear interpolation between closest ranks"""
+    position = (len(sorted_values) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (
+        sorted_values[upper] - sorted_values[lower]
+    ) * (position - lower)
+
+
+def _slope(values: Sequence[float]) -> float:
+    """Least squares slope of the values over their positions"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    x_mean = (n - 1) / 2
+    y_mean = sum(values) / n
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(values))
+    variance = sum((x - x_mean) ** 2 for x in range(n))
+    return covariance / variance
+
+
+def _mean(values: Sequence[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def summarize_daily_rates(daily_rates: List[Dict[str, Any]], series: bool) -> str:
+    """Percentiles and trend of the daily completion rates, in percent"""
+    if not daily_rates:
+        return "No completed tasks in the period"
+
+    rates = [day["completion_rate"] * 100 for day in daily_rates]
+    ordered = sorted(rates)
+    lowest = min(daily_rates, key=lambda day: day["completion_rate"])
+    highest = max(daily_rates, key=lambda day: day["completion_rate"])
+    half = len(rates) // 2
+
+    lines = [
+        f"active days {len(rates)}; p25/p50/p75/p90 "
+        + "/".join(f"{_percentile(ordered, q):.0f}" for q in (0.25, 0.5, 0.75, 0.9))
+        + f"; mean {_mean(rates):.0f}"
+        + f"; min {lowest['completion_rate'] * 100:.0f} ({lowest['date']})"
+        + f"; max {highest['completion_rate'] * 100:.0f} ({highest['date']})",
+        f"trend {_slope(rates):+.1f} pts per active day; "
+        f"first half mean {_mean(rates[:half] or rates):.0f}, "
+        f"second half {_mean(rates[half:]):.0f}, "
+        f"last 7 active days {_mean(rates[-7:]):.0f}",
+    ]
+    if series:
+        # MM-DD:percent, oldest first
+        lines.append(
+            "series "
+            + " ".join(
+                f"{str(day['date'])[5:]}:{day['completion_rate'] * 100:.0f}"
+                for day in daily_rates
+            )
+        )
+    return "\n".join(lines)
+
+
+def summarize_categories(categories: List[Dict[str, Any]], top_k: int) -> str:
+    """The top_k categories by task count as a table, the rest aggregated"""
+    if not categories:
+        return "No categories"
+
+    ranked = sorted(
+        categories, key=lambda category: category.get("total_tasks", 0), reverse=True
+    )
+    rows = ["name|tasks|done%|est_acc%|est_ratio|top_state|positive%"]
+    for category in ranked[:top_k]:
+        estimation = category["estimation_accuracy"]
+        mental = category["mental_state_distribution"]
+        rows.append(
+            "|".join(
+                [
+                    category["name"],
+                    str(category.get("total_tasks", 0)),
+                    f"{category['completion_rate'] * 100:.0f}",
+                    f"{estimation['accuracy_percentage']:.0f}",
+                    f"{estimation['average_estimation_ratio']:.2f}",
+                    mental["most_common_state"] or "-",
+                    f"{mental['positive_states_percentage']:.0f}",
+                ]
+            )
+        )
+
+    rest = ranked[top_k:]
+    if rest:
+        tasks = sum(category.get("total_tasks", 0) for category in rest)
+        done = sum(
+            category["completion_rate"] * category.get("total_tasks", 0)
+            for category in rest
+        )
+        rows.append(
+            f"+{len(rest)} more categories: {tasks} tasks, "
+            f"done {done / tasks * 100 if tasks else 0:.0f}%"
+        )
+    return "\n".join(rows)
+
+
+def summarize_tasks(tasks: List[Dict[str, Any]], limit: int) -> str:
+    """Estimation and mental state summary of recent tasks, newest rows first"""
+    if not tasks:
+        return "No recently completed tasks"
+
+    ratios = sorted(
+        task["actual_duration"] / task["planned_duration"]
+        for task in tasks
+        if task["planned_duration"] and task["actual_duration"]
+    )
+    states = [task["mental_state"] for task in tasks if task["mental_state"]]
+
+    summary = f"{len(tasks)} tasks"
+    if ratios:
+        summary += (
+            f"; actual/planned p50 {_percentile(ratios, 0.5):.2f}, "
+            f"p90 {_percentile(ratios, 0.9):.2f}; "
+            f"over plan {sum(ratio > 1.2 for ratio in ratios)}, "
+            f"under plan {sum(ratio < 0.8 for ratio in ratios)}"
+        )
+    if states:
+        most_common = max(set(states), key=states.count)
+        positive = sum(state in POSITIVE_STATES for state in states)
+        summary += (
+            f"; most common state {most_common}, "
+            f"positive {positive / len(states) * 100:.0f}%"
+        )
+
+    if not limit:
+        return summary
+    rows = [summary, "date|category|planned|actual|state"]
+    for task in tasks[:limit]:
+        rows.append(
+            "|".join(
+                [
+                    str(task["completed_date"])[5:],
+                    task["category"],
+                    f"{task['planned_duration'] or 0:.0f}",
+                    f"{task['actual_duration'] or 0:.0f}",
+                    task["mental_state"] or "-",
+                ]
+            )
+        )
+    return "\n".join(rows)
+
+
+def compact_context(
+    user_context: Dict[str, Any],
+    series: bool = True,
+    top_k: int = 5,
+    task_rows: int = 20,
+) -> str:
+    user_info = user_context["user_info"]
+    return "\n".join(
+        [
+            f"User: {user_info['first_name']}; period {user_info['analysis_period']}; "
+            f"{user_info['total_categories']} categories",
+            "",
+            "DAILY COMPLETION % (days with completions):",
+            summarize_daily_rates(user_context["daily_completion_rates"], series),
+            "",
+            "CATEGORIES (by task count; est_ratio = planned/actual):",
+            summarize_categories(user_context["category_analytics"], top_k),
+            "",
+            "RECENT COMPLETED TASKS (minutes):",
+            summarize_tasks(user_context["recent_task_patterns"], task_rows),
+        ]
+    )
+
+
+def render_within_budget(
+    user_context: Dict[str, Any],
+    render: Callable[[str], str],
+    budget: int,
+    top_k: int = 5,
+) -> Tuple[str, int]:
+    """Render the prompt at the richest level of detail that fits the budget
+
+    render receives the compact context and returns the whole prompt, so the
+    instructions and the question count against the budget too. Returns the
+    prompt and its estimated tokens; if even the leanest level is over
+    budget, that level is returned.
+    """
+    for series, level_top_k, task_rows in DETAIL_LEVELS:
+        prompt = render(
+            compact_context(
+                user_context,
+                series=series,
+                top_k=min(top_k, level_top_k or top_k),
+                task_rows=task_rows,
+            )
+        )
+        tokens = estimate_tokens(prompt)
+        if tokens <= budget:
+            break
+    return prompt, tokens
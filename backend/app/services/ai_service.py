@@ -1,7 +1,24 @@
-import google.generativeai as genai
 import os
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+
+from flask import current_app
+
+try:
+    import google.generativeai as genai
+except ImportError:  # optional: the AI endpoints report "AI service not available"
+    genai = None
+
+from app.models import Users, Categories, Tasks, Lists, Projects, TaskStatus
+from app.services.ai_cache import ai_cache_key
+from app.services.ai_prompt import render_within_budget
+from app.services.ai_stub import StubGeminiClient
+from app.services.analytics_service import (
+    get_daily_completion_rates,
+    get_user_categories_analytics,
+)
+from app.utils import get_utc_now
+from app.utils.metrics import AI_PROMPT_TOKENS, track_ai_call
 
 
 class AIService:
@@ -13,6 +30,15 @@ class AIService:
     def _initialize_gemini(self):
         """Initialize Google Gemini client"""
         try:
+            if current_app.config.get("AI_CLIENT") == "stub":
+                self.client = StubGeminiClient(
+                    latency=current_app.config.get("AI_STUB_LATENCY", 0.0)
+                )
+                return
+
+            if genai is None:
+                raise ValueError("google-generativeai is not installed")
+
             api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
             if not api_key:
                 raise ValueError(
@@ -26,142 +52,182 @@ class AIService:
             current_app.logger.error(f"Failed to initialize Gemini: {str(e)}")
             self.client = None
 
+    def prepare_user_data_context(self, user_id, days_back=30):
+        """Prepare user analytics data for AI context
+
+        The context is kept in the response cache under the user's version,
+        which moves whenever their tasks, lists, projects or categories are
+        committed, so repeated questions skip the rebuild until then.
+        """
+        try:
+            end_date = get_utc_now().date()
+            cache = getattr(current_app, "response_cache", None)
+            if cache is None:
+                return self._build_user_data_context(user_id, end_date, days_back)
 
-def prepare_user_data_context(self, user_id, days_back=30):
-    """Prepare user analytics data for AI context"""
-    try:
-        # Get user info
-        user = Users.query.get(user_id)
+            key = f"ai_context:{days_back}:{end_date}"
+            cached, version = cache.get(user_id, key)
+            if cached is not None:
+                return current_app.json.loads(cached)
+
+            user_context = self._build_user_data_context(user_id, end_date, days_back)
+            if user_context:
+                cache.set(user_id, key, current_app.json.dumps(user_context), version)
+            return user_context
+
+        except Exception as e:
+            current_app.logger.error(f"Error preparing user data context: {str(e)}")
+            return None
+
+    def _build_user_data_context(self, user_id, end_date, days_back):
+        """Query the context with grouped aggregates (a fixed number of queries)"""
+        user = self.db.session.get(Users, user_id)
         if not user:
             return None
 
         # Calculate date range (last 30 days by default)
-        end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days_back)
 
-        # Get daily completion rates
-        daily_rates = []
-        current_date = start_date
-        while current_date <= end_date:
-            rate = calculate_daily_completion_rate(user_id, current_date)
-            if rate > 0:  # Only include days with activity
-                daily_rates.append(
-                    {"date": current_date.strftime("%Y-%m-%d"), "completion_rate": rate}
-                )
-            current_date += timedelta(days=1)
-
-        # Get category analytics
-        categories = Categories.query.filter_by(user_id=user_id).all()
-        category_analytics = []
-        for category in categories:
-            completion_rate = get_category_completion_rate(user_id, category.id)
-            estimation_accuracy = calculate_category_estimation_accuracy(
-                user_id, category.id
-            )
-            mental_state_dist = get_category_mental_state_distribution(
-                user_id, category.id
-            )
-
-            category_analytics.append(
-                {
-                    "name": category.name,
-                    "completion_rate": completion_rate,
-                    "estimation_accuracy": estimation_accuracy,
-                    "mental_state_distribution": mental_state_dist,
-                }
-            )
+        # Daily completion rates for the whole range at once
+        daily_rates = [
+            {"date": day, "completion_rate": rate}
+            for day, rate in get_daily_completion_rates(
+                user_id, start_date, end_date
+            ).items()
+        ]
+
+        # Analytics of every category, grouped by category
+        category_analytics = [
+            {
+                "name": category["name"],
+                "completion_rate": category["completion_rate"],
+                "total_tasks": category["total_tasks"],
+                "estimation_accuracy": category["estimation_accuracy"],
+                "mental_state_distribution": category["mental_state_distribution"],
+            }
+            for category in get_user_categories_analytics(user_id)
+        ]
 
         # Get recent task completion patterns
         recent_tasks = (
-            Tasks.query.join(Lists)
-            .join(Projects)
+            self.db.session.query(
+                Tasks.planned_duration,
+                Tasks.total_time_worked,
+                Tasks.mental_state,
+                Tasks.completed_at,
+                Categories.name,
+            )
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .outerjoin(Categories, Tasks.category_id == Categories.id)
             .filter(Projects.user_id == user_id)
             .filter(Tasks.status == TaskStatus.DONE)
             .filter(Tasks.completed_at >= datetime.combine(start_date, time.min))
             .order_by(Tasks.completed_at.desc())
-            .limit(50)
+            .limit(20)  # Limit for context size
             .all()
         )
 
-        task_patterns = []
-        for task in recent_tasks:
-            task_patterns.append(
-                {
-                    "category": task.category.name if task.category else "No Category",
-                    "planned_duration": task.planned_duration,
-                    "actual_duration": task.total_time_worked,
-                    "mental_state": (
-                        task.mental_state.value if task.mental_state else None
-                    ),
-                    "completed_date": task.completed_at.strftime("%Y-%m-%d"),
-                }
-            )
+        task_patterns = [
+            {
+                "category": category_name or "No Category",
+                "planned_duration": planned_duration,
+                "actual_duration": total_time_worked,
+                "mental_state": mental_state.value if mental_state else None,
+                "completed_date": completed_at.strftime("%Y-%m-%d"),
+            }
+            for (
+                planned_duration,
+                total_time_worked,
+                mental_state,
+                completed_at,
+                category_name,
+            ) in recent_tasks
+        ]
 
         return {
             "user_info": {
                 "first_name": user.first_name,
-                "total_categories": len(categories),
+                "total_categories": len(category_analytics),
                 "analysis_period": f"{start_date} to {end_date}",
             },
             "daily_completion_rates": daily_rates,
             "category_analytics": category_analytics,
-            "recent_task_patterns": task_patterns[:20],  # Limit for context size
+            "recent_task_patterns": task_patterns,
         }
 
-    except Exception as e:
-        current_app.logger.error(f"Error preparing user data context: {str(e)}")
-        return None
+    def process_natural_language_query(self, user_id, query):
+        """Process user's natural language query about their productivity data"""
+        try:
+            if not self.client:
+                return {"error": "AI service not available"}
+
+            # Get user data context
+            user_context = self.prepare_user_data_context(user_id)
+            if not user_context:
+                return {"error": "Could not retrieve user data"}
+
+            # Same data and same question (up to case/punctuation): reuse the answer
+            ai_response = self._cached_generation(
+                "query",
+                ai_cache_key("query", user_context, query),
+                lambda: self._answer_query(query, user_context),
+            )
+            ai_response = {**ai_response, "query": query}
 
+            # Log the query for monitoring
+            self._log_ai_query(user_id, query, ai_response)
 
-def process_natural_language_query(self, user_id, query):
-    """Process user's natural language query about their productivity data"""
-    try:
-        if not self.client:
-            return {"error": "AI service not available"}
+            return ai_response
 
-        # Get user data context
-        user_context = self.prepare_user_data_context(user_id)
-        if not user_context:
-            return {"error": "Could not retrieve user data"}
+        except Exception as e:
+            current_app.logger.error(f"Error processing AI query: {str(e)}")
+            return {"error": "Failed to process query"}
 
+    def _cached_generation(self, operation, key, generate):
+        """Run a model call through the AI answer cache, when it is enabled"""
+        cache = getattr(current_app, "ai_cache", None)
+        if cache is None:
+            return generate()
+        return cache.get_or_generate(operation, key, generate)
+
+    def _answer_query(self, query, user_context):
         # Create prompt for Gemini
         prompt = self._create_analytics_prompt(query, user_context)
 
         # Generate response
-        response = self.client.generate_content(prompt)
+        with track_ai_call("query"):
+            response = self.client.generate_content(prompt)
 
         # Parse and format response
-        ai_response = self._format_ai_response(response.text, query)
-
-        # Log the query for monitoring
-        self._log_ai_query(user_id, query, ai_response)
-
-        return ai_response
-
-    except Exception as e:
-        current_app.logger.error(f"Error processing AI query: {str(e)}")
-        return {"error": "Failed to process query"}
-
-
-def _create_analytics_prompt(self, user_query, user_context):
-    """Create a structured prompt for Gemini with user data"""
-
-    context_summary = f"""
+        return self._format_ai_response(response.text, query)
+
+    def _budgeted_prompt(self, operation, user_context, render):
+        """Render a prompt with the compact context, within the token budget"""
+        budget = current_app.config.get("AI_PROMPT_TOKEN_BUDGET", 1500)
+        prompt, tokens = render_within_budget(
+            user_context,
+            render,
+            budget,
+            top_k=current_app.config.get("AI_PROMPT_TOP_CATEGORIES", 5),
+        )
+        AI_PROMPT_TOKENS.labels(operation).observe(tokens)
+        if tokens > budget:
+            current_app.logger.warning(
+                f"AI {operation} prompt is ~{tokens} tokens, over the {budget} budget"
+            )
+        return prompt
+
+    def _create_analytics_prompt(self, user_query, user_context):
+        """Create a structured prompt for Gemini with user data"""
+        return self._budgeted_prompt(
+            "query",
+            user_context,
+            lambda context: f"""
 You are a productivity analytics assistant. Analyze the following user data and answer their question.
 
-USER DATA SUMMARY:
-- User: {user_context['user_info']['first_name']}
-- Analysis Period: {user_context['user_info']['analysis_period']}
-- Total Categories: {user_context['user_info']['total_categories']}
-
-DAILY COMPLETION RATES (last 30 days):
-{json.dumps(user_context['daily_completion_rates'], indent=2)}
-
-CATEGORY PERFORMANCE:
-{json.dumps(user_context['category_analytics'], indent=2)}
-
-RECENT TASK PATTERNS:
-{json.dumps(user_context['recent_task_patterns'], indent=2)}
+USER DATA SUMMARY (tables are pipe-separated with a header row):
+{context}
 
 USER QUESTION: {user_query}
 
@@ -178,56 +244,76 @@ Format your response in JSON with the following structure:
     "recommendations": ["Recommendation 1", "Recommendation 2"],
     "data_points": ["Specific metrics that support your answer"]
 }}
-"""
-    return context_summary
+""",
+        )
 
+    def _log_ai_query(self, user_id, query, ai_response):
+        """Log AI queries for monitoring (the question, not the answer)"""
+        current_app.logger.info(
+            f"AI query by user {user_id} ({len(query)} chars), "
+            f"success={ai_response.get('success', False)}"
+        )
 
-def _format_ai_response(self, raw_response, original_query):
-    """Format and structure AI response"""
-    try:
-        # Try to parse as JSON first
+    def _format_ai_response(self, raw_response, original_query):
+        """Format and structure AI response"""
         try:
-            parsed_response = json.loads(raw_response)
-            return {
-                "success": True,
-                "query": original_query,
-                "answer": parsed_response.get("answer", ""),
-                "insights": parsed_response.get("insights", []),
-                "recommendations": parsed_response.get("recommendations", []),
-                "data_points": parsed_response.get("data_points", []),
-                "generated_at": datetime.utcnow().isoformat(),
-            }
-        except json.JSONDecodeError:
-            # If not JSON, return as plain text
-            return {
-                "success": True,
-                "query": original_query,
-                "answer": raw_response,
-                "insights": [],
-                "recommendations": [],
-                "data_points": [],
-                "generated_at": datetime.utcnow().isoformat(),
-            }
+            # Try to parse as JSON first
+            try:
+                parsed_response = json.loads(raw_response)
+                return {
+                    "success": True,
+                    "query": original_query,
+                    "answer": parsed_response.get("answer", ""),
+                    "insights": parsed_response.get("insights", []),
+                    "recommendations": parsed_response.get("recommendations", []),
+                    "data_points": parsed_response.get("data_points", []),
+                    "generated_at": datetime.utcnow().isoformat(),
+                }
+            except json.JSONDecodeError:
+                # If not JSON, return as plain text
+                return {
+                    "success": True,
+                    "query": original_query,
+                    "answer": raw_response,
+                    "insights": [],
+                    "recommendations": [],
+                    "data_points": [],
+                    "generated_at": datetime.utcnow().isoformat(),
+                }
 
-    except Exception as e:
-        current_app.logger.error(f"Error formatting AI response: {str(e)}")
-        return {"success": False, "error": "Failed to format response"}
+        except Exception as e:
+            current_app.logger.error(f"Error formatting AI response: {str(e)}")
+            return {"success": False, "error": "Failed to format response"}
 
+    def generate_insights(self, user_id):
+        """Generate automatic insights about user's productivity patterns"""
+        try:
+            if not self.client:
+                return {"error": "AI service not available"}
 
-def generate_insights(self, user_id):
-    """Generate automatic insights about user's productivity patterns"""
-    try:
-        if not self.client:
-            return {"error": "AI service not available"}
+            user_context = self.prepare_user_data_context(user_id)
+            if not user_context:
+                return {"error": "Could not retrieve user data"}
 
-        user_context = self.prepare_user_data_context(user_id)
-        if not user_context:
-            return {"error": "Could not retrieve user data"}
+            return self._cached_generation(
+                "insights",
+                ai_cache_key("insights", user_context),
+                lambda: self._generate_insights(user_context),
+            )
 
-        insights_prompt = f"""
-Based on this productivity data, generate 3-5 key insights about patterns, trends, and areas for improvement:
+        except Exception as e:
+            current_app.logger.error(f"Error generating insights: {str(e)}")
+            return {"error": "Failed to generate insights"}
 
-{json.dumps(user_context, indent=2)}
+    def _generate_insights(self, user_context):
+        insights_prompt = self._budgeted_prompt(
+            "insights",
+            user_context,
+            lambda context: f"""
+Based on this productivity data, generate 3-5 key insights about patterns, trends, and areas for improvement
+(tables are pipe-separated with a header row):
+
+{context}
 
 Provide insights in JSON format:
 {{
@@ -240,9 +326,11 @@ Provide insights in JSON format:
         }}
     ]
 }}
-"""
+""",
+        )
 
-        response = self.client.generate_content(insights_prompt)
+        with track_ai_call("insights"):
+            response = self.client.generate_content(insights_prompt)
 
         try:
             parsed_insights = json.loads(response.text)
@@ -253,7 +341,3 @@ Provide insights in JSON format:
             }
         except json.JSONDecodeError:
             return {"success": False, "error": "Failed to parse insights"}
-
-    except Exception as e:
-        current_app.logger.error(f"Error generating insights: {str(e)}")
-        return {"error": "Failed to generate insights"}
@@ -0,0 +1,42 @@
+import json
+import time
+from types import SimpleNamespace
+
+
+class StubGeminiClient:
+    """Offline stand-in for genai.GenerativeModel (AI_CLIENT=stub)
+
+    Answers instantly, or after `latency` seconds to mimic the real model,
+    with JSON in the shape the prompts ask for. `calls` counts upstream calls
+    so caching and coalescing can be checked without an API key.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, prompt: str):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        if "USER QUESTION:" in prompt:
+            question = prompt.split("USER QUESTION:", 1)[1].splitlines()[0].strip()
+            payload = {
+                "answer": f"Stub answer to: {question}",
+                "insights": ["Stub insight"],
+                "recommendations": ["Stub recommendation"],
+                "data_points": [f"Prompt length: {len(prompt)} characters"],
+            }
+        else:
+            payload = {
+                "insights": [
+                    {
+                        "title": "Stub insight",
+                        "description": f"Offline answer to {len(prompt)} characters",
+                        "category": "patterns",
+                        "importance": "low",
+                    }
+                ]
+            }
+        return SimpleNamespace(text=json.dumps(payload))
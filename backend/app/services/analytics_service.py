@@ -2,7 +2,17 @@ from app.models import db, Tasks, Projects, Categories, Lists, TaskStatus
 from datetime import datetime, timedelta, timezone, time
 from typing import Dict, Any, Optional
 from app.utils import get_utc_now, ensure_timezone_aware
-from sqlalchemy import or_, and_
+from app.utils.read_routing import replica_reads
+from sqlalchemy import (
+    or_,
+    and_,
+    func,
+    distinct,
+    union_all,
+    select,
+    case,
+    literal_column,
+)
 from flask import current_app
 
 
@@ -11,6 +21,7 @@ class AnalyticsService:
         self.db = db
 
 
+@replica_reads
 def calculate_daily_completion_rate(user_id, date):
     """
     Calculate the completion rate for a specific day
@@ -64,6 +75,190 @@ def calculate_daily_completion_rate(user_id, date):
     return round(completed_tasks / total_daily_tasks, 2)
 
 
+def _day_bucket(column):
+    """SQL expression that truncates a timestamp column to its UTC day
+
+    PostgreSQL sessions run in UTC (see app.utils.database), so date_trunc
+    buckets by UTC day like SQLite's date().
+    """
+    if db.engine.dialect.name == "postgresql":
+        # Inlined rather than bound so GROUP BY matches the selected expression
+        return func.date_trunc(literal_column("'day'"), column)
+    return func.date(column)
+
+
+def _day_key(value):
+    """Normalize a day bucket returned by the database to a YYYY-MM-DD string"""
+    if isinstance(value, str):
+        return value[:10]
+    return value.strftime("%Y-%m-%d")
+
+
+@replica_reads
+def get_daily_completion_counts(user_id, start_date, end_date):
+    """
+    Count completed and active tasks per UTC day over a date range
+    Args:
+        user_id: User ID
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+    Returns: dict mapping "YYYY-MM-DD" to {"completed": int, "total": int},
+             only for days with at least one active task
+    """
+    range_start = datetime.combine(start_date, time.min).replace(tzinfo=timezone.utc)
+    range_end = datetime.combine(end_date, time.max).replace(tzinfo=timezone.utc)
+
+    def user_task_events(column):
+        # (task, day) pairs for one lifecycle timestamp within the range
+        return (
+            select(Tasks.id.label("task_id"), _day_bucket(column).label("day"))
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .where(Projects.user_id == user_id)
+            .where(column >= range_start, column <= range_end)
+        )
+
+    # A task is "active" on a day if it was created, started or completed on it
+    events = union_all(
+        user_task_events(Tasks.created_at),
+        user_task_events(Tasks.completed_at),
+        user_task_events(Tasks.first_started_at),
+    ).subquery()
+
+    total_rows = (
+        db.session.query(events.c.day, func.count(distinct(events.c.task_id)))
+        .group_by(events.c.day)
+        .all()
+    )
+
+    completed_day = _day_bucket(Tasks.completed_at)
+    completed_rows = (
+        db.session.query(completed_day, func.count(Tasks.id))
+        .join(Lists, Tasks.list_id == Lists.id)
+        .join(Projects, Lists.project_id == Projects.id)
+        .filter(Projects.user_id == user_id)
+        .filter(Tasks.status == TaskStatus.DONE)
+        .filter(Tasks.completed_at >= range_start)
+        .filter(Tasks.completed_at <= range_end)
+        .group_by(completed_day)
+        .all()
+    )
+    completed_by_day = {_day_key(day): count for day, count in completed_rows}
+
+    return {
+        _day_key(day): {
+            "completed": completed_by_day.get(_day_key(day), 0),
+            "total": total,
+        }
+        for day, total in total_rows
+        if day is not None
+    }
+
+
+@replica_reads
+def get_daily_completion_rates(user_id, start_date, end_date):
+    """
+    Calculate the completion rate of every day in a date range in two queries
+    Args:
+        user_id: User ID
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+    Returns: dict mapping "YYYY-MM-DD" to a float between 0.0 and 1.0,
+             only for days with a completion rate above 0
+    """
+    daily_counts = get_daily_completion_counts(user_id, start_date, end_date)
+
+    daily_rates = {}
+    for day in sorted(daily_counts):
+        counts = daily_counts[day]
+        completion_rate = round(counts["completed"] / counts["total"], 2)
+        if completion_rate > 0:  # Only include days with activity
+            daily_rates[day] = completion_rate
+
+    return daily_rates
+
+
+def _date_range_bounds(date_range):
+    """Convert a {'start_date', 'end_date'} dict into inclusive UTC datetimes"""
+    start_date = datetime.combine(date_range["start_date"], time.min).replace(
+        tzinfo=timezone.utc
+    )
+    end_date = datetime.combine(date_range["end_date"], time.max).replace(
+        tzinfo=timezone.utc
+    )
+    return start_date, end_date
+
+
+def _build_estimation_accuracy(
+    total_tasks, ratio_sum, underestimated, overestimated, accurate
+):
+    """Shape estimation accuracy aggregates into the category analytics result"""
+    if not total_tasks:
+        return {
+            "accuracy_percentage": 0.0,
+            "average_estimation_ratio": 0.0,
+            "total_tasks_analyzed": 0,
+            "underestimated_count": 0,
+            "overestimated_count": 0,
+            "accurate_count": 0,
+        }
+
+    # Simplified accuracy calculation: percentage of tasks that were accurately estimated
+    accuracy_percentage = (accurate / total_tasks) * 100
+
+    # Still calculate average ratio for reference
+    avg_ratio = ratio_sum / total_tasks
+
+    return {
+        "accuracy_percentage": round(accuracy_percentage, 1),
+        "average_estimation_ratio": round(avg_ratio, 2),
+        "total_tasks_analyzed": total_tasks,
+        "underestimated_count": underestimated,
+        "overestimated_count": overestimated,
+        "accurate_count": accurate,
+        "underestimated_percentage": round((underestimated / total_tasks) * 100, 1),
+        "overestimated_percentage": round((overestimated / total_tasks) * 100, 1),
+        "accurate_percentage": round((accurate / total_tasks) * 100, 1),
+    }
+
+
+def _build_mental_state_distribution(mental_state_counts):
+    """Shape mental state counts into the category analytics result"""
+    if not mental_state_counts:
+        return {
+            "total_tasks": 0,
+            "mental_states": {},
+            "most_common_state": None,
+            "positive_states_percentage": 0.0,
+        }
+
+    # Calculate percentages
+    total_tasks = sum(mental_state_counts.values())
+    mental_state_percentages = {
+        state: round((count / total_tasks) * 100, 1)
+        for state, count in mental_state_counts.items()
+    }
+
+    # Identify most common state
+    most_common_state = max(mental_state_counts.items(), key=lambda x: x[1])[0]
+
+    # Calculate positive states percentage (energized, focused, satisfied, motivated)
+    positive_states = ["energized", "focused", "satisfied", "motivated"]
+    positive_count = sum(mental_state_counts.get(state, 0) for state in positive_states)
+    positive_percentage = round((positive_count / total_tasks) * 100, 1)
+
+    return {
+        "total_tasks": total_tasks,
+        "mental_states": {
+            "counts": mental_state_counts,
+            "percentages": mental_state_percentages,
+        },
+        "most_common_state": most_common_state,
+        "positive_states_percentage": positive_percentage,
+    }
+
+
+@replica_reads
 def get_category_completion_rate(user_id, category_id, date_range=None):
     """
     Calculate completion rate for a specific category
@@ -84,12 +279,7 @@ def get_category_completion_rate(user_id, category_id, date_range=None):
 
         # Apply date filter if provided
         if date_range:
-            start_date = datetime.combine(
-                date_range["start_date"], time.min
-            ).replace(tzinfo=timezone.utc)
-            end_date = datetime.combine(date_range["end_date"], time.max).replace(
-                tzinfo=timezone.utc
-            )
+            start_date, end_date = _date_range_bounds(date_range)
             query = query.filter(
                 Tasks.created_at >= start_date, Tasks.created_at <= end_date
             )
@@ -110,6 +300,7 @@ def get_category_completion_rate(user_id, category_id, date_range=None):
         return 0.0
 
 
+@replica_reads
 def calculate_category_estimation_accuracy(user_id, category_id, date_range=None):
     """
     Calculate how accurate time estimations are for a category
@@ -129,28 +320,13 @@ def calculate_category_estimation_accuracy(user_id, category_id, date_range=None
 
         # Apply date filter if provided
         if date_range:
-            start_date = datetime.combine(
-                date_range["start_date"], time.min
-            ).replace(tzinfo=timezone.utc)
-            end_date = datetime.combine(date_range["end_date"], time.max).replace(
-                tzinfo=timezone.utc
-            )
+            start_date, end_date = _date_range_bounds(date_range)
             query = query.filter(
                 Tasks.completed_at >= start_date, Tasks.completed_at <= end_date
             )
 
         tasks = query.all()
 
-        if not tasks:
-            return {
-                "accuracy_percentage": 0.0,
-                "average_estimation_ratio": 0.0,
-                "total_tasks_analyzed": 0,
-                "underestimated_count": 0,
-                "overestimated_count": 0,
-                "accurate_count": 0,
-            }
-
         estimation_ratios = []
         underestimated = 0
         overestimated = 0
@@ -169,33 +345,16 @@ def calculate_category_estimation_accuracy(user_id, category_id, date_range=None
             else:  # Reasonably accurate
                 accurate += 1
 
-        # Simplified accuracy calculation: percentage of tasks that were accurately estimated
-        accuracy_percentage = (accurate / len(tasks)) * 100
-        
-        # Still calculate average ratio for reference
-        avg_ratio = sum(estimation_ratios) / len(estimation_ratios)
-
-        return {
-            "accuracy_percentage": round(accuracy_percentage, 1),
-            "average_estimation_ratio": round(avg_ratio, 2),
-            "total_tasks_analyzed": len(tasks),
-            "underestimated_count": underestimated,
-            "overestimated_count": overestimated,
-            "accurate_count": accurate,
-            "underestimated_percentage": round(
-                (underestimated / len(tasks)) * 100, 1
-            ),
-            "overestimated_percentage": round(
-                (overestimated / len(tasks)) * 100, 1
-            ),
-            "accurate_percentage": round((accurate / len(tasks)) * 100, 1),
-        }
+        return _build_estimation_accuracy(
+            len(tasks), sum(estimation_ratios), underestimated, overestimated, accurate
+        )
 
     except Exception as e:
         current_app.logger.error(f"Error calculating estimation accuracy: {str(e)}")
         return {"error": str(e)}
 
 
+@replica_reads
 def get_category_mental_state_distribution(user_id, category_id, date_range=None):
     """
     Get distribution of mental states for completed tasks in a category
@@ -214,63 +373,230 @@ def get_category_mental_state_distribution(user_id, category_id, date_range=None
 
         # Apply date filter if provided
         if date_range:
-            start_date = datetime.combine(
-                date_range["start_date"], time.min
-            ).replace(tzinfo=timezone.utc)
-            end_date = datetime.combine(date_range["end_date"], time.max).replace(
-                tzinfo=timezone.utc
-            )
+            start_date, end_date = _date_range_bounds(date_range)
             query = query.filter(
                 Tasks.completed_at >= start_date, Tasks.completed_at <= end_date
             )
 
         tasks = query.all()
 
-        if not tasks:
-            return {
-                "total_tasks": 0,
-                "mental_states": {},
-                "most_common_state": None,
-                "positive_states_percentage": 0.0,
-            }
-
         # Count mental states
         mental_state_counts = {}
         for task in tasks:
             state = task.mental_state.value
             mental_state_counts[state] = mental_state_counts.get(state, 0) + 1
 
-        # Calculate percentages
-        total_tasks = len(tasks)
-        mental_state_percentages = {
-            state: round((count / total_tasks) * 100, 1)
-            for state, count in mental_state_counts.items()
-        }
+        return _build_mental_state_distribution(mental_state_counts)
+
+    except Exception as e:
+        current_app.logger.error(
+            f"Error getting mental state distribution: {str(e)}"
+        )
+        return {"error": str(e)}
+
+
+@replica_reads
+def get_user_categories_analytics(user_id, date_range=None):
+    """
+    Calculate analytics for every category of a user with grouped queries
+    Args:
+        user_id: User ID
+        date_range: Optional dict with 'start_date' and 'end_date'
+    Returns: list of dicts with completion rate, total tasks, estimation accuracy
+             and mental state distribution per category
+    """
+    categories = Categories.query.filter_by(user_id=user_id).all()
+    if not categories:
+        return []
+
+    def user_category_tasks(*columns):
+        return (
+            db.session.query(Tasks.category_id, *columns)
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .filter(Projects.user_id == user_id)
+            .filter(Tasks.category_id.isnot(None))
+        )
 
-        # Identify most common state
-        most_common_state = max(mental_state_counts.items(), key=lambda x: x[1])[0]
+    bounds = _date_range_bounds(date_range) if date_range else None
 
-        # Calculate positive states percentage (energized, focused, satisfied, motivated)
-        positive_states = ["energized", "focused", "satisfied", "motivated"]
-        positive_count = sum(
-            mental_state_counts.get(state, 0) for state in positive_states
+    # Completion rate over tasks created in the range
+    completion_query = user_category_tasks(
+        func.count(Tasks.id),
+        func.sum(case((Tasks.status == TaskStatus.DONE, 1), else_=0)),
+    )
+    if bounds:
+        completion_query = completion_query.filter(
+            Tasks.created_at >= bounds[0], Tasks.created_at <= bounds[1]
+        )
+    completion_rows = completion_query.group_by(Tasks.category_id).all()
+    completion = {
+        category_id: round((completed or 0) / total, 3) if total else 0.0
+        for category_id, total, completed in completion_rows
+    }
+
+    # Total tasks per category (all time, as before)
+    total_rows = (
+        db.session.query(Tasks.category_id, func.count(Tasks.id))
+        .join(Categories, Tasks.category_id == Categories.id)
+        .filter(Categories.user_id == user_id)
+        .group_by(Tasks.category_id)
+        .all()
+    )
+    totals = dict(total_rows)
+
+    # Estimation accuracy over tasks completed in the range
+    ratio = Tasks.planned_duration * 1.0 / Tasks.total_time_worked
+    estimation_query = (
+        user_category_tasks(
+            func.count(Tasks.id),
+            func.sum(ratio),
+            func.sum(case((ratio < 0.8, 1), else_=0)),
+            func.sum(case((ratio > 1.2, 1), else_=0)),
+        )
+        .filter(Tasks.status == TaskStatus.DONE)
+        .filter(Tasks.total_time_worked > 0)
+        .filter(Tasks.planned_duration > 0)
+    )
+    if bounds:
+        estimation_query = estimation_query.filter(
+            Tasks.completed_at >= bounds[0], Tasks.completed_at <= bounds[1]
+        )
+    estimation = {}
+    for category_id, analyzed, ratio_sum, under, over in estimation_query.group_by(
+        Tasks.category_id
+    ).all():
+        estimation[category_id] = _build_estimation_accuracy(
+            analyzed, ratio_sum or 0.0, under or 0, over or 0, analyzed - under - over
         )
-        positive_percentage = round((positive_count / total_tasks) * 100, 1)
 
-        return {
-            "total_tasks": total_tasks,
-            "mental_states": {
-                "counts": mental_state_counts,
-                "percentages": mental_state_percentages,
-            },
-            "most_common_state": most_common_state,
-            "positive_states_percentage": positive_percentage,
+    # Mental state counts over tasks completed in the range
+    mental_state_query = (
+        user_category_tasks(Tasks.mental_state, func.count(Tasks.id))
+        .filter(Tasks.status == TaskStatus.DONE)
+        .filter(Tasks.mental_state.isnot(None))
+    )
+    if bounds:
+        mental_state_query = mental_state_query.filter(
+            Tasks.completed_at >= bounds[0], Tasks.completed_at <= bounds[1]
+        )
+    mental_state_counts = {}
+    for category_id, state, count in mental_state_query.group_by(
+        Tasks.category_id, Tasks.mental_state
+    ).all():
+        mental_state_counts.setdefault(category_id, {})[state.value] = count
+
+    return [
+        {
+            "id": category.id,
+            "name": category.name,
+            "color": category.color,
+            "completion_rate": completion.get(category.id, 0.0),
+            "total_tasks": totals.get(category.id, 0),
+            "estimation_accuracy": estimation.get(
+                category.id, _build_estimation_accuracy(0, 0.0, 0, 0, 0)
+            ),
+            "mental_state_distribution": _build_mental_state_distribution(
+                mental_state_counts.get(category.id, {})
+            ),
         }
+        for category in categories
+    ]
 
-    except Exception as e:
-        current_app.logger.error(
-            f"Error getting mental state distribution: {str(e)}"
+
+@replica_reads
+def calculate_category_analytics(user_id, category_id, date_range=None):
+    """
+    Calculate completion rate, estimation accuracy and mental state distribution
+    for a category in a single pass over its task columns
+    Args:
+        user_id: User ID
+        category_id: Category ID
+        date_range: Optional dict with 'start_date' and 'end_date'
+    Returns: dict with the same blocks as get_category_completion_rate,
+             calculate_category_estimation_accuracy and
+             get_category_mental_state_distribution
+    """
+    query = (
+        db.session.query(
+            Tasks.status,
+            Tasks.planned_duration,
+            Tasks.total_time_worked,
+            Tasks.mental_state,
+            Tasks.created_at,
+            Tasks.completed_at,
         )
-        return {"error": str(e)}
+        .join(Lists, Tasks.list_id == Lists.id)
+        .join(Projects, Lists.project_id == Projects.id)
+        .filter(Projects.user_id == user_id)
+        .filter(Tasks.category_id == category_id)
+    )
 
+    bounds = None
+    if date_range:
+        # Completion rate looks at creation time, the other blocks at completion time
+        bounds = _date_range_bounds(date_range)
+        query = query.filter(
+            or_(
+                and_(Tasks.created_at >= bounds[0], Tasks.created_at <= bounds[1]),
+                and_(Tasks.completed_at >= bounds[0], Tasks.completed_at <= bounds[1]),
+            )
+        )
+
+    def in_range(value):
+        if bounds is None:
+            return True
+        value = ensure_timezone_aware(value)
+        return value is not None and bounds[0] <= value <= bounds[1]
+
+    total_tasks = 0
+    completed_tasks = 0
+    analyzed = 0
+    ratio_sum = 0.0
+    underestimated = 0
+    overestimated = 0
+    accurate = 0
+    mental_state_counts = {}
+
+    for (
+        status,
+        planned_duration,
+        total_time_worked,
+        mental_state,
+        created_at,
+        completed_at,
+    ) in query.yield_per(1000):
+        if in_range(created_at):
+            total_tasks += 1
+            if status == TaskStatus.DONE:
+                completed_tasks += 1
+
+        if status != TaskStatus.DONE or not in_range(completed_at):
+            continue
+
+        if total_time_worked > 0 and planned_duration > 0:
+            ratio = planned_duration / total_time_worked
+            analyzed += 1
+            ratio_sum += ratio
+            if ratio < 0.8:
+                underestimated += 1
+            elif ratio > 1.2:
+                overestimated += 1
+            else:
+                accurate += 1
+
+        if mental_state is not None:
+            state = mental_state.value
+            mental_state_counts[state] = mental_state_counts.get(state, 0) + 1
 
+    return {
+        "completion_rate": (
+            round(completed_tasks / total_tasks, 3) if total_tasks else 0.0
+        ),
+        "estimation_accuracy": _build_estimation_accuracy(
+            analyzed, ratio_sum, underestimated, overestimated, accurate
+        ),
+        "mental_state_distribution": _build_mental_state_distribution(
+            mental_state_counts
+        ),
+    }
@@ -2,6 +2,8 @@ from app.models import db, Categories, Tasks
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from app.utils import validate_hex_color
+from app.utils.loading import loader_options
+from app.utils.pagination import keyset_page
 
 
 class CategoryService:
@@ -126,16 +128,23 @@ class CategoryService:
         self.db.session.delete(category)
         self.db.session.commit()
 
-    def get_user_categories(self, user_id: int) -> List[Dict[str, Any]]:
+    def get_user_categories(
+        self, user_id: int, strategy: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Get all categories for a specific user
 
         Args:
             user_id: The ID of the user
+            strategy: relationship loader strategy (selectin, joined or lazy)
 
         Returns:
             List[Dict]: A list of serialized category data with usage statistics
         """
-        categories = Categories.query.filter_by(user_id=user_id).all()
+        categories = (
+            Categories.query.options(*loader_options("category_tasks", strategy))
+            .filter_by(user_id=user_id)
+            .all()
+        )
 
         categories_data = []
         for category in categories:
@@ -145,43 +154,73 @@ class CategoryService:
                 "color": category.color,
                 "task_count": len(category.tasks),
                 "completed_task_count": len([t for t in category.tasks if t.status.value == "done"]),
-                "created_at": (category.created_at.isoformat() if category.created_at else None),
-                "updated_at": (category.updated_at.isoformat() if category.updated_at else None),
+                "created_at": category.created_at,
+                "updated_at": category.updated_at,
             }
             categories_data.append(category_data)
 
         return categories_data
 
-    def get_category_tasks(self, categoryId: int, user_id: int) -> Optional[Dict[str, Any]]:
-        """Get a category with all its associated tasks
+    def get_category_tasks(
+        self,
+        categoryId: int,
+        user_id: int,
+        strategy: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a category with its tasks (all of them, or one page when limit is set)
 
         Args:
             categoryId: ID of the category
             user_id: ID of the user (for authorization)
+            strategy: relationship loader strategy (selectin, joined or lazy)
+            limit: page size for keyset pagination on task id
+            cursor: next_cursor of the previous page
 
         Returns:
             Dict containing category info and its tasks, or None if not found
         """
-        category = Categories.query.filter_by(id=categoryId, user_id=user_id).first()
+        query = Categories.query.filter_by(id=categoryId, user_id=user_id)
+        if not limit:
+            query = query.options(
+                *loader_options("category_tasks_with_location", strategy)
+            )
+        category = query.first()
 
         if not category:
             return None
 
+        next_cursor = None
+        if limit:
+            tasks, next_cursor = keyset_page(
+                Tasks.query.options(*loader_options("task_location", strategy)).filter(
+                    Tasks.category_id == categoryId
+                ),
+                Tasks.id,
+                limit,
+                cursor,
+            )
+            task_count = Tasks.query.filter(Tasks.category_id == categoryId).count()
+        else:
+            tasks = category.tasks
+            task_count = len(tasks)
+
         # Serialize tasks ()
         tasks_data = []
-        for task in category.tasks:
+        for task in tasks:
             task_data = {
                 "id": task.id,
                 "name": task.name,
                 "description": task.description,
-                "status": task.status.value,
-                "priority": task.priority.value,
+                "status": task.status,
+                "priority": task.priority,
                 "planned_duration": task.planned_duration,
                 "total_time_worked": task.total_time_worked,
                 "list_id": task.list_id,
                 "list_name": task.list.name,
                 "project_name": task.list.project.name if task.list.project else None,
-                "completed_at": (task.completed_at.isoformat() if task.completed_at else None),
+                "completed_at": task.completed_at,
             }
             tasks_data.append(task_data)
 
@@ -189,11 +228,13 @@ class CategoryService:
             "id": category.id,
             "name": category.name,
             "color": category.color,
-            "task_count": len(tasks_data),
+            "task_count": task_count,
             "tasks": tasks_data,
-            "created_at": (category.created_at.isoformat() if category.created_at else None),
-            "updated_at": (category.updated_at.isoformat() if category.updated_at else None),
+            "created_at": category.created_at,
+            "updated_at": category.updated_at,
         }
+        if limit:
+            category_data["next_cursor"] = next_cursor
 
         return category_data
 
@@ -0,0 +1,245 @@
+from app.models import DailyAnalytics, Tasks, Lists, Projects, TaskStatus
+from datetime import datetime, date, time, timezone
+from typing import Dict, Any, Optional
+from sqlalchemy import func, select, case, bindparam
+from sqlalchemy.exc import IntegrityError
+from app.utils import get_utc_now, ensure_timezone_aware
+from app.services.analytics_service import get_daily_completion_counts
+from app.utils.read_routing import use_primary
+
+
+def _utc_day(dt: Optional[datetime]) -> Optional[datetime]:
+    """Truncate a timestamp to midnight of its UTC day (the DailyAnalytics key)"""
+    if dt is None:
+        return None
+    day = ensure_timezone_aware(dt).astimezone(timezone.utc).date()
+    return datetime.combine(day, time.min)
+
+
+class DailyAnalyticsService:
+    """Maintain the DailyAnalytics rollup (one row per user per UTC day)
+
+    The record_* methods only stage changes in the session; the caller owns
+    the commit so counters stay consistent with the task change itself.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def _get_or_create_day(self, user_id: str, day: datetime) -> DailyAnalytics:
+        row = DailyAnalytics.query.filter_by(user_id=user_id, date=day).first()
+        if row:
+            return row
+
+        # Insert in a savepoint: if a concurrent request created the day first,
+        # only the savepoint is rolled back and its row is used instead
+        try:
+            with self.db.session.begin_nested():
+                row = DailyAnalytics(
+                    user_id=user_id,
+                    date=day,
+                    tasks_active=0,
+                    tasks_completed=0,
+                    completion_rate=0.0,
+                )
+                self.db.session.add(row)
+        except IntegrityError:
+            row = DailyAnalytics.query.filter_by(user_id=user_id, date=day).one()
+        return row
+
+    def _bump(self, user_id: str, day: datetime, active: int = 0, completed: int = 0):
+        row = self._get_or_create_day(user_id, day)
+        row.tasks_active = max(0, row.tasks_active + active)
+        row.tasks_completed = max(0, row.tasks_completed + completed)
+        row.completion_rate = (
+            round(row.tasks_completed / row.tasks_active, 2)
+            if row.tasks_active
+            else 0.0
+        )
+
+    def record_task_created(self, task: Tasks, user_id: str) -> None:
+        """A new task makes its creation day active"""
+        self._bump(user_id, _utc_day(task.created_at or get_utc_now()), active=1)
+
+    def record_tasks_created(
+        self, tasks_created: int, user_id: str, created_at: datetime
+    ) -> None:
+        """Several tasks created at once (bulk import)"""
+        self._bump(user_id, _utc_day(created_at), active=tasks_created)
+
+    def record_task_started(self, task: Tasks, user_id: str) -> None:
+        """First start of a task, counted unless it was created the same day"""
+        started_day = _utc_day(task.first_started_at)
+        if started_day != _utc_day(task.created_at):
+            self._bump(user_id, started_day, active=1)
+
+    def record_task_completed(self, task: Tasks, user_id: str) -> None:
+        """Completion counts towards the day's completed tasks"""
+        completed_day = _utc_day(task.completed_at)
+        already_active = completed_day in (
+            _utc_day(task.created_at),
+            _utc_day(task.first_started_at),
+        )
+        self._bump(
+            user_id, completed_day, active=0 if already_active else 1, completed=1
+        )
+
+    def record_task_deleted(self, task: Tasks, user_id: str) -> None:
+        """Remove every contribution a task made to the rollup"""
+        active_days = {
+            _utc_day(task.created_at),
+            _utc_day(task.first_started_at),
+            _utc_day(task.completed_at),
+        }
+        active_days.discard(None)
+        completed_day = (
+            _utc_day(task.completed_at) if task.status == TaskStatus.DONE else None
+        )
+
+        for day in active_days:
+            self._bump(
+                user_id, day, active=-1, completed=-1 if day == completed_day else 0
+            )
+
+    def record_tasks_deleted(self, list_ids, user_id: str) -> None:
+        """Remove the contributions of every task in some lists (list or project
+        deletion)
+
+        Applies the same rules as record_task_deleted, but reads only the four
+        timestamps/status columns in one query and updates each touched day
+        with a single executemany instead of one round trip per task.
+
+        Args:
+            list_ids: list ids, or a select of them
+        """
+        removed = {}
+        tasks = self.db.session.execute(
+            select(
+                Tasks.created_at, Tasks.first_started_at, Tasks.completed_at, Tasks.status
+            ).where(Tasks.list_id.in_(list_ids))
+        )
+        for created_at, first_started_at, completed_at, status in tasks:
+            active_days = {
+                _utc_day(created_at),
+                _utc_day(first_started_at),
+                _utc_day(completed_at),
+            }
+            active_days.discard(None)
+            completed_day = (
+                _utc_day(completed_at) if status == TaskStatus.DONE else None
+            )
+            for day in active_days:
+                active, completed = removed.get(day, (0, 0))
+                removed[day] = (active + 1, completed + (day == completed_day))
+
+        if not removed:
+            return
+
+        # Counters never go below zero, like _bump; SET reads the old values
+        table = DailyAnalytics.__table__
+        tasks_active = case(
+            (
+                table.c.tasks_active > bindparam("b_active"),
+                table.c.tasks_active - bindparam("b_active"),
+            ),
+            else_=0,
+        )
+        tasks_completed = case(
+            (
+                table.c.tasks_completed > bindparam("b_completed"),
+                table.c.tasks_completed - bindparam("b_completed"),
+            ),
+            else_=0,
+        )
+        self.db.session.execute(
+            table.update()
+            .where(table.c.user_id == user_id)
+            .where(table.c.date == bindparam("b_date"))
+            .values(
+                tasks_active=tasks_active,
+                tasks_completed=tasks_completed,
+                completion_rate=case(
+                    (
+                        tasks_active > 0,
+                        func.round(tasks_completed * 1.0 / tasks_active, 2),
+                    ),
+                    else_=0.0,
+                ),
+            ),
+            [
+                {"b_date": day, "b_active": active, "b_completed": completed}
+                for day, (active, completed) in removed.items()
+            ],
+        )
+
+    def get_completion_rates(
+        self, user_id: str, start_date: date, end_date: date
+    ) -> Dict[str, float]:
+        """Read precomputed completion rates for a date range
+
+        Returns the same shape as analytics_service.get_daily_completion_rates.
+        """
+        rows = (
+            DailyAnalytics.query.filter(DailyAnalytics.user_id == user_id)
+            .filter(DailyAnalytics.date >= datetime.combine(start_date, time.min))
+            .filter(DailyAnalytics.date <= datetime.combine(end_date, time.min))
+            .filter(DailyAnalytics.completion_rate > 0)
+            .order_by(DailyAnalytics.date)
+            .all()
+        )
+        return {row.date.strftime("%Y-%m-%d"): row.completion_rate for row in rows}
+
+    def backfill_user(self, user_id: str) -> int:
+        """Rebuild the rollup of a user from raw tasks
+
+        Returns:
+            int: number of daily rows written
+        """
+        first_created = (
+            self.db.session.query(func.min(Tasks.created_at))
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .filter(Projects.user_id == user_id)
+            .scalar()
+        )
+
+        DailyAnalytics.query.filter_by(user_id=user_id).delete()
+        if first_created is None:
+            self.db.session.commit()
+            return 0
+
+        start_date = ensure_timezone_aware(first_created).date()
+        end_date = get_utc_now().date()
+        # The rollup must match the primary exactly, not a lagging replica
+        with use_primary():
+            daily_counts = get_daily_completion_counts(user_id, start_date, end_date)
+
+        for day, counts in daily_counts.items():
+            self.db.session.add(
+                DailyAnalytics(
+                    user_id=user_id,
+                    date=datetime.strptime(day, "%Y-%m-%d"),
+                    tasks_active=counts["total"],
+                    tasks_completed=counts["completed"],
+                    completion_rate=round(counts["completed"] / counts["total"], 2),
+                )
+            )
+
+        self.db.session.commit()
+        return len(daily_counts)
+
+    def backfill(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """Rebuild the rollup for one user, or for every user with projects"""
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = [
+                row[0]
+                for row in self.db.session.query(Projects.user_id).distinct().all()
+            ]
+
+        rows_written = 0
+        for uid in user_ids:
+            rows_written += self.backfill_user(uid)
+
+        return {"users": len(user_ids), "rows": rows_written}
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, Iterator
+
+from sqlalchemy import select
+
+from app.models import Tasks, Lists, Projects, Categories
+from app.utils import ensure_timezone_aware
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Columns of an exported task, in output order
+EXPORT_COLUMNS = [
+    ("id", Tasks.id),
+    ("name", Tasks.name),
+    ("description", Tasks.description),
+    ("status", Tasks.status),
+    ("priority", Tasks.priority),
+    ("planned_duration", Tasks.planned_duration),
+    ("total_time_worked", Tasks.total_time_worked),
+    ("first_started_at", Tasks.first_started_at),
+    ("completed_at", Tasks.completed_at),
+    ("mental_state", Tasks.mental_state),
+    ("reflection", Tasks.reflection),
+    ("created_at", Tasks.created_at),
+    ("list_id", Lists.id),
+    ("list_name", Lists.name),
+    ("project_id", Projects.id),
+    ("project_name", Projects.name),
+    ("category_id", Categories.id),
+    ("category_name", Categories.name),
+]
+
+
+def _export_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # Stored naive in UTC; keep the offset so consumers don't read local time
+        return ensure_timezone_aware(value).isoformat()
+    return value
+
+
+class ExportService:
+    """Stream a user's full task history without loading it into memory
+
+    Rows are read as plain column tuples through a server-side cursor
+    (stream_results + yield_per), so memory stays bounded by the batch size
+    whatever the number of tasks.
+    """
+
+    def __init__(self, db, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+
+    def iter_tasks(self, user_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield every task of a user as a flat dict, ordered by id"""
+        stmt = (
+            select(*[column for _, column in EXPORT_COLUMNS])
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .outerjoin(Categories, Tasks.category_id == Categories.id)
+            .where(Projects.user_id == user_id)
+            .order_by(Tasks.id)
+            .execution_options(stream_results=True, yield_per=self.batch_size)
+        )
+
+        names = [name for name, _ in EXPORT_COLUMNS]
+        result = self.db.session.execute(stmt)
+        try:
+            for row in result:
+                yield {
+                    name: _export_value(value) for name, value in zip(names, row)
+                }
+        finally:
+            result.close()
+
+    def stream_ndjson(self, user_id: str) -> Iterator[str]:
+        """One JSON object per line, flushed in batch-sized chunks"""
+        chunk = []
+        for task in self.iter_tasks(user_id):
+            chunk.append(json.dumps(task))
+            if len(chunk) >= self.batch_size:
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+
+    def stream_csv(self, user_id: str) -> Iterator[str]:
+        """CSV with a header row, flushed in batch-sized chunks"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=[name for name, _ in EXPORT_COLUMNS])
+        writer.writeheader()
+
+        rows = 0
+        for task in self.iter_tasks(user_id):
+            writer.writerow(task)
+            rows += 1
+            if rows % self.batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def stream(self, user_id: str, export_format: str) -> Iterator[str]:
+        """Dispatch to the generator of the requested format"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Invalid export format. Valid options: {list(EXPORT_FORMATS)}"
+            )
+        if export_format == "csv":
+            return self.stream_csv(user_id)
+        return self.stream_ndjson(user_id)
@@ -1,8 +1,11 @@
-from sqlalchemy import or_
-from app.models import db, Users, Projects, Lists, TaskStatus
+from sqlalchemy import or_, func, case, update, select
+from app.models import db, Users, Projects, Lists, Tasks, TaskStatus
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from app.utils import get_utc_now
+from app.utils.loading import loader_options
+from app.utils.pagination import keyset_page
+from app.services.daily_analytics_service import DailyAnalyticsService
 
 
 class ProjectService:
@@ -41,9 +44,20 @@ class ProjectService:
         self.db.session.commit()
         return project
 
-    def read_one_project(self, projectId: int) -> Optional[Dict[str, Any]]:
-        """Logic to retrieve all lists for a project"""
-        project = Projects.query.filter_by(id=projectId).first()
+    def read_one_project(
+        self, projectId: int, strategy: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Logic to retrieve all lists for a project
+
+        Args:
+            projectId: ID of the project
+            strategy: relationship loader strategy (selectin, joined or lazy)
+        """
+        project = (
+            Projects.query.options(*loader_options("project_lists", strategy))
+            .filter_by(id=projectId)
+            .first()
+        )
 
         if not project:
             return None
@@ -56,10 +70,8 @@ class ProjectService:
                     "id": list_item.id,
                     "name": list_item.name,
                     "progress": list_item.progress,
-                    "task_count": len(list_item.tasks),
-                    "completed_tasks": len(
-                        [t for t in list_item.tasks if t.status == TaskStatus.DONE]
-                    ),
+                    "task_count": list_item.task_count,
+                    "completed_tasks": list_item.completed_task_count,
                 }
                 lists_data.append(list_data)
 
@@ -70,12 +82,8 @@ class ProjectService:
             "description": project.description,
             "status": project.status,
             "lists": lists_data,
-            "created_at": (
-                project.created_at.isoformat() if project.created_at else None
-            ),
-            "updated_at": (
-                project.updated_at.isoformat() if project.updated_at else None
-            ),
+            "created_at": project.created_at,
+            "updated_at": project.updated_at,
         }
 
         return project_data
@@ -123,6 +131,11 @@ class ProjectService:
         if not project:
             raise ValueError("Project does not exist")
 
+        # Deleted tasks must no longer count in the daily rollup
+        DailyAnalyticsService(self.db).record_tasks_deleted(
+            select(Lists.id).where(Lists.project_id == projectId), project.user_id
+        )
+
         self.db.session.delete(project)
         self.db.session.commit()
 
@@ -136,11 +149,40 @@ class ProjectService:
             List[Dict]: A list of serialized project data with summary info
         """
         projects = Projects.query.filter_by(user_id=user_id).all()
+        return self._serialize_projects(projects)
+
+    def get_user_projects_page(
+        self, user_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of a user's projects, ordered by id
+
+        Returns:
+            Dict: {"projects": [...], "next_cursor": str or None}
+        """
+        projects, next_cursor = keyset_page(
+            Projects.query.filter_by(user_id=user_id), Projects.id, limit, cursor
+        )
+        return {
+            "projects": self._serialize_projects(projects),
+            "next_cursor": next_cursor,
+        }
+
+    def _serialize_projects(self, projects) -> List[Dict[str, Any]]:
+        if not projects:
+            return []
+
+        # Count lists for all projects at once instead of loading each project's lists
+        list_counts = dict(
+            self.db.session.query(Lists.project_id, func.count(Lists.id))
+            .filter(Lists.project_id.in_([project.id for project in projects]))
+            .group_by(Lists.project_id)
+            .all()
+        )
 
         # Serialize projects with summary information
         projects_data = []
         for project in projects:
-            total_lists = project.list_count
+            total_lists = list_counts.get(project.id, 0)
             total_tasks = project.total_tasks
             completed_tasks = project.completed_tasks
             project_progress = project.progress
@@ -153,12 +195,8 @@ class ProjectService:
                 "total_lists": total_lists,
                 "total_tasks": total_tasks,
                 "completed_tasks": completed_tasks,
-                "created_at": (
-                    project.created_at.isoformat() if project.created_at else None
-                ),
-                "updated_at": (
-                    project.updated_at.isoformat() if project.updated_at else None
-                ),
+                "created_at": project.created_at,
+                "updated_at": project.updated_at,
             }
             projects_data.append(project_data)
 
@@ -176,8 +214,8 @@ class ProjectService:
             "project_id": list_item.project_id,
             "total_tasks": list_item.task_count,
             "completed_tasks": list_item.completed_task_count,
-            "created_at": (list_item.created_at.isoformat() if list_item.created_at else None),
-            "updated_at": (list_item.updated_at.isoformat() if list_item.updated_at else None),
+            "created_at": list_item.created_at,
+            "updated_at": list_item.updated_at,
         }
     
     def add_new_list(self, listData: Dict[str, Any], projectId: int) -> Lists:
@@ -224,33 +262,57 @@ class ProjectService:
 
         return new_list
 
-    def read_one_list(self, listId: int) -> Optional[Dict[str, Any]]:
-        """Get a list with all its tasks"""
-        list_item = Lists.query.filter_by(id=listId).first()
+    def read_one_list(
+        self,
+        listId: int,
+        strategy: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get a list with its tasks (all of them, or one page when limit is set)
+
+        Args:
+            listId: ID of the list
+            strategy: relationship loader strategy (selectin, joined or lazy)
+            limit: page size for keyset pagination on task id
+            cursor: next_cursor of the previous page
+        """
+        if limit:
+            list_item = Lists.query.filter_by(id=listId).first()
+        else:
+            list_item = (
+                Lists.query.options(*loader_options("list_tasks", strategy))
+                .filter_by(id=listId)
+                .first()
+            )
 
         if not list_item:
             return None
 
+        next_cursor = None
+        if limit:
+            tasks, next_cursor = keyset_page(
+                Tasks.query.filter(Tasks.list_id == listId), Tasks.id, limit, cursor
+            )
+        else:
+            tasks = list_item.tasks
+
         # Serialize tasks with proper field names
         tasks_data = []
-        for task in list_item.tasks:
+        for task in tasks:
             task_data = {
                 "id": task.id,
                 "name": task.name,
                 "description": task.description,
-                "status": task.status.value,
-                "priority": task.priority.value,
+                "status": task.status,
+                "priority": task.priority,
                 "planned_duration": task.planned_duration,
                 "total_time_worked": task.total_time_worked,
-                "mental_state": task.mental_state.value if task.mental_state else None,
+                "mental_state": task.mental_state,
                 "reflection": task.reflection,
                 "category_id": task.category_id,
-                "first_started_at": (
-                    task.first_started_at.isoformat() if task.first_started_at else None
-                ),
-                "completed_at": (
-                    task.completed_at.isoformat() if task.completed_at else None
-                ),
+                "first_started_at": task.first_started_at,
+                "completed_at": task.completed_at,
             }
             tasks_data.append(task_data)
 
@@ -262,13 +324,11 @@ class ProjectService:
             "total_tasks": list_item.task_count,
             "completed_tasks": list_item.completed_task_count,
             "tasks": tasks_data,
-            "created_at": (
-                list_item.created_at.isoformat() if list_item.created_at else None
-            ),
-            "updated_at": (
-                list_item.updated_at.isoformat() if list_item.updated_at else None
-            ),
+            "created_at": list_item.created_at,
+            "updated_at": list_item.updated_at,
         }
+        if limit:
+            list_data["next_cursor"] = next_cursor
 
         return list_data
 
@@ -317,12 +377,38 @@ class ProjectService:
         if not list_item:
             raise ValueError("List does not exist")
 
+        # Deleted tasks must no longer count in the daily rollup
+        if list_item.project:
+            DailyAnalyticsService(self.db).record_tasks_deleted(
+                [listId], list_item.project.user_id
+            )
+            self.db.session.execute(
+                update(Projects)
+                .where(Projects.id == list_item.project_id)
+                .values(
+                    total_tasks=Projects.total_tasks - list_item.task_count,
+                    completed_tasks=Projects.completed_tasks
+                    - list_item.completed_task_count,
+                )
+            )
+
         self.db.session.delete(list_item)
         self.db.session.commit()
 
-    def get_project_lists(self, projectId: int) -> List[Dict[str, Any]]:
-        """Get all lists for a specific project"""
-        project = Projects.query.filter_by(id=projectId).first()
+    def get_project_lists(
+        self, projectId: int, strategy: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get all lists for a specific project
+
+        Args:
+            projectId: ID of the project
+            strategy: relationship loader strategy (selectin, joined or lazy)
+        """
+        project = (
+            Projects.query.options(*loader_options("project_lists", strategy))
+            .filter_by(id=projectId)
+            .first()
+        )
         if not project:
             raise ValueError(f"Project with ID {projectId} does not exist")
 
@@ -334,13 +420,74 @@ class ProjectService:
                 "progress": list_item.progress,
                 "total_tasks": list_item.task_count,
                 "completed_tasks": list_item.completed_task_count,
-                "created_at": (
-                    list_item.created_at.isoformat() if list_item.created_at else None
-                ),
-                "updated_at": (
-                    list_item.updated_at.isoformat() if list_item.updated_at else None
-                ),
+                "created_at": list_item.created_at,
+                "updated_at": list_item.updated_at,
             }
             lists_data.append(list_data)
 
         return lists_data
+
+    def verify_task_counters(self, repair: bool = False) -> List[Dict[str, Any]]:
+        """Compare the denormalized task counters with the actual task rows
+
+        Args:
+            repair: when True, overwrite drifted counters with the real counts
+
+        Returns:
+            List[Dict]: one entry per list or project whose counters drifted
+        """
+        done = case((Tasks.status == TaskStatus.DONE, 1), else_=0)
+        list_counts = {
+            list_id: (total, completed or 0)
+            for list_id, total, completed in self.db.session.query(
+                Tasks.list_id, func.count(Tasks.id), func.sum(done)
+            )
+            .group_by(Tasks.list_id)
+            .all()
+        }
+        project_counts = {
+            project_id: (total, completed or 0)
+            for project_id, total, completed in self.db.session.query(
+                Lists.project_id, func.count(Tasks.id), func.sum(done)
+            )
+            .join(Tasks, Tasks.list_id == Lists.id)
+            .group_by(Lists.project_id)
+            .all()
+        }
+
+        mismatches = []
+        for list_item in Lists.query.all():
+            actual = list_counts.get(list_item.id, (0, 0))
+            stored = (list_item.task_count, list_item.completed_task_count)
+            if stored != actual:
+                mismatches.append(
+                    {
+                        "type": "list",
+                        "id": list_item.id,
+                        "stored": stored,
+                        "actual": actual,
+                    }
+                )
+                if repair:
+                    list_item.task_count, list_item.completed_task_count = actual
+                    list_item.progress = list_item.calculate_progress()
+
+        for project in Projects.query.all():
+            actual = project_counts.get(project.id, (0, 0))
+            stored = (project.total_tasks, project.completed_tasks)
+            if stored != actual:
+                mismatches.append(
+                    {
+                        "type": "project",
+                        "id": project.id,
+                        "stored": stored,
+                        "actual": actual,
+                    }
+                )
+                if repair:
+                    project.total_tasks, project.completed_tasks = actual
+
+        if repair and mismatches:
+            self.db.session.commit()
+
+        return mismatches
@@ -0,0 +1,317 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import redis
+from flask import (
+    current_app,
+    has_app_context,
+    has_request_context,
+    make_response,
+    request,
+)
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, inspect, or_, select
+
+from app.models import Categories, DailyAnalytics, Lists, Projects, Tasks
+from app.utils.metrics import (
+    RESPONSE_CACHE_EVICTIONS,
+    RESPONSE_CACHE_INVALIDATIONS,
+    RESPONSE_CACHE_LOOKUPS,
+)
+from app.utils.read_routing import RoutingSession
+
+# Every user's entries are dropped, when a write cannot be traced to its owner
+ALL_USERS = "*"
+
+# Tables the cached responses are computed from
+WATCHED_MODELS = (Tasks, Lists, Projects, Categories, DailyAnalytics)
+WATCHED_TABLES = {model.__table__.name for model in WATCHED_MODELS}
+
+
+class ResponseCache:
+    """Encoded JSON responses cached per user, dropped when the user writes
+
+    Entries live in one Redis hash per user so invalidation is a single DEL,
+    and expire after ttl seconds. While Redis is unreachable the cache falls
+    back to a bounded in-process LRU (least recently used entries evicted
+    first), which only sees this worker's writes, so ttl also bounds how stale
+    another worker's write can leave it.
+
+    Each user has a version, bumped on invalidation. A response computed while
+    a write committed is not stored, because the version it read has moved on.
+    """
+
+    KEY_PREFIX = "response_cache"
+
+    def __init__(
+        self,
+        redis_client=None,
+        logger=None,
+        max_entries: int = 10_000,
+        ttl: int = 300,
+        retry_after: float = 5.0,
+    ):
+        self.redis = redis_client
+        self.logger = logger
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._user_keys: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+    def _entries_key(self, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}"
+
+    def _version_key(self, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}_version:{user_id}"
+
+    def _redis_available(self) -> bool:
+        return bool(self.redis) and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.retry_after
+        if self.logger:
+            self.logger.warning(
+                f"Response cache falling back to process memory: {error}"
+            )
+
+    def get(self, user_id: str, key: str) -> Tuple[Optional[str], Any]:
+        """Return the cached body (or None) and a version to pass to set()"""
+        if self._redis_available():
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hget(self._entries_key(user_id), key)
+                pipe.get(self._version_key(user_id))
+                body, version = pipe.execute()
+                return body, ("redis", version)
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+        with self._lock:
+            version = ("local", (self._epoch, self._versions.get(user_id, 0)))
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return None, version
+            if entry[0] <= time.monotonic():
+                self._drop((user_id, key))
+                return None, version
+            self._entries.move_to_end((user_id, key))
+            return entry[1], version
+
+    def set(self, user_id: str, key: str, body: str, version: Any) -> None:
+        """Store a body unless the user's data changed since get()"""
+        store, seen = version
+        if store == "redis":
+            self._redis_set(user_id, key, body, seen)
+            return
+
+        with self._lock:
+            if (self._epoch, self._versions.get(user_id, 0)) != seen:
+                return
+            self._entries[(user_id, key)] = (time.monotonic() + self.ttl, body)
+            self._entries.move_to_end((user_id, key))
+            self._user_keys.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                RESPONSE_CACHE_EVICTIONS.inc()
+
+    def _redis_set(self, user_id: str, key: str, body: str, seen) -> None:
+        version_key = self._version_key(user_id)
+        entries_key = self._entries_key(user_id)
+        try:
+            with self.redis.pipeline() as pipe:
+                pipe.watch(version_key)
+                if pipe.get(version_key) != seen:
+                    return
+                pipe.multi()
+                pipe.hset(entries_key, key, body)
+                pipe.expire(entries_key, self.ttl)
+                pipe.execute()
+        except redis.WatchError:
+            pass
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def _drop(self, entry_key: Tuple[str, str]) -> None:
+        self._entries.pop(entry_key, None)
+        keys = self._user_keys.get(entry_key[0])
+        if keys is not None:
+            keys.discard(entry_key[1])
+            if not keys:
+                del self._user_keys[entry_key[0]]
+
+    def invalidate(self, user_ids: Iterable[str]) -> None:
+        """Drop the cached responses of users whose data changed"""
+        user_ids = set(user_ids)
+        if ALL_USERS in user_ids:
+            self.clear()
+            return
+
+        with self._lock:
+            for user_id in user_ids:
+                self._versions[user_id] = self._versions.get(user_id, 0) + 1
+                for key in self._user_keys.pop(user_id, ()):
+                    self._entries.pop((user_id, key), None)
+        RESPONSE_CACHE_INVALIDATIONS.inc(len(user_ids))
+
+        if not self.redis or not user_ids:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.delete(self._entries_key(user_id))
+                pipe.incr(self._version_key(user_id))
+                pipe.expire(self._version_key(user_id), self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            # Redis entries written before the outage live out their ttl
+            self._redis_failed(e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._user_keys.clear()
+
+        if not self.redis:
+            return
+        try:
+            for key in self.redis.scan_iter(match=f"{self.KEY_PREFIX}:*"):
+                self.redis.delete(key)
+                self.redis.incr(self._version_key(key.split(":", 1)[1]))
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+
+def cached_response(resource: str):
+    """Serve a GET view from the current user's response cache
+
+    The key is the resource name and the full path, so each query string is
+    cached separately. Only 200 responses are stored.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = getattr(current_app, "response_cache", None)
+            if cache is None:
+                return view(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            key = f"{resource}:{request.full_path}"
+            body, version = cache.get(user_id, key)
+            if body is not None:
+                RESPONSE_CACHE_LOOKUPS.labels(resource, "hit").inc()
+                return current_app.response_class(body, mimetype="application/json")
+
+            RESPONSE_CACHE_LOOKUPS.labels(resource, "miss").inc()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(user_id, key, response.get_data(as_text=True), version)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Invalidation: owners of changed rows are collected at each flush and bulk
+# statement, and their entries are dropped once the transaction commits.
+
+
+def _pending(session) -> Set[str]:
+    return session.info.setdefault("response_cache_invalidate", set())
+
+
+def _request_user_id() -> Optional[str]:
+    if not has_request_context():
+        return None
+    try:
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _owner_ids(session, objects) -> Set[str]:
+    """Users owning the given rows, read without triggering lazy loads"""
+    user_ids, list_ids, project_ids = set(), set(), set()
+    for obj in objects:
+        values = inspect(obj).dict
+        if isinstance(obj, (Projects, Categories, DailyAnalytics)):
+            user_ids.add(values.get("user_id"))
+        elif isinstance(obj, Lists):
+            project_ids.add(values.get("project_id"))
+        elif isinstance(obj, Tasks):
+            list_ids.add(values.get("list_id"))
+    list_ids.discard(None)
+    project_ids.discard(None)
+
+    if list_ids or project_ids:
+        list_projects = select(Lists.project_id).where(Lists.id.in_(list_ids))
+        user_ids.update(
+            session.connection().scalars(
+                select(Projects.user_id).where(
+                    or_(
+                        Projects.id.in_(project_ids),
+                        Projects.id.in_(list_projects),
+                    )
+                )
+            )
+        )
+    user_ids.discard(None)
+    return user_ids
+
+
+def _collect_flushed_owners(session, flush_context) -> None:
+    changed = [
+        obj
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, WATCHED_MODELS)
+    ]
+    if not changed:
+        return
+    user_ids = _owner_ids(session, changed)
+    user_id = _request_user_id()
+    if user_id:
+        user_ids.add(user_id)
+    _pending(session).update(user_ids or {ALL_USERS})
+
+
+def _collect_statement_owners(orm_execute_state) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) not in WATCHED_TABLES:
+        return
+    _pending(orm_execute_state.session).add(_request_user_id() or ALL_USERS)
+
+
+def _invalidate_committed(session) -> None:
+    user_ids = session.info.pop("response_cache_invalidate", None)
+    if not user_ids or not has_app_context():
+        return
+    cache = getattr(current_app, "response_cache", None)
+    if cache is not None:
+        cache.invalidate(user_ids)
+
+
+def _discard_pending(session) -> None:
+    session.info.pop("response_cache_invalidate", None)
+
+
+event.listen(RoutingSession, "after_flush", _collect_flushed_owners)
+event.listen(RoutingSession, "do_orm_execute", _collect_statement_owners)
+event.listen(RoutingSession, "after_commit", _invalidate_committed)
+event.listen(RoutingSession, "after_rollback", _discard_pending)
@@ -5,16 +5,82 @@ from app.models import (
     TaskPriority,
     MentalState,
     Lists,
+    Projects,
     Categories,
 )
+from sqlalchemy import update, insert, bindparam, case, tuple_
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from app.utils import get_utc_now, ensure_timezone_aware
+from app.services.daily_analytics_service import DailyAnalyticsService
+from app.services.timer_event_service import publish_timer_event
+from app.services.timer_scheduler import get_timer_scheduler
 
 
 class TaskService:
     def __init__(self, db):
         self.db = db
+        self.daily_analytics = DailyAnalyticsService(db)
+
+    def _get_owner_id(self, list_item: Lists) -> Optional[str]:
+        """Return the ID of the user owning a list (None for project-less lists)"""
+        return list_item.project.user_id if list_item.project else None
+
+    def _timer_state(self, task: Tasks) -> Dict[str, Any]:
+        """Timer snapshot pushed to clients, which compute remaining time locally"""
+        work_start = ensure_timezone_aware(task.current_work_start)
+        planned_end = ensure_timezone_aware(task.current_planned_end)
+        return {
+            "task_id": task.id,
+            "status": task.status.value,
+            "current_work_start": work_start.isoformat() if work_start else None,
+            "current_planned_end": planned_end.isoformat() if planned_end else None,
+            "total_time_worked": task.total_time_worked,
+            "is_expired": task.is_timer_expired,
+            "server_time": get_utc_now().isoformat(),
+        }
+
+    def _sync_timer_schedule(
+        self, timer_state: Dict[str, Any], owner_id: Optional[str]
+    ) -> None:
+        """Keep the expiry scheduler in line with a committed timer snapshot"""
+        scheduler = get_timer_scheduler()
+        if not scheduler:
+            return
+
+        planned_end = timer_state["current_planned_end"]
+        if timer_state["status"] == TaskStatus.ACTIVE.value and planned_end and owner_id:
+            scheduler.schedule(
+                timer_state["task_id"], owner_id, datetime.fromisoformat(planned_end)
+            )
+        else:
+            scheduler.cancel(timer_state["task_id"])
+
+    def _adjust_task_counters(
+        self, list_item: Lists, total: int = 0, completed: int = 0
+    ) -> None:
+        """Apply a delta to the list and project task counters
+
+        The increments run as SQL expressions inside the caller's transaction,
+        so concurrent requests cannot lose updates.
+        """
+        self.db.session.execute(
+            update(Lists)
+            .where(Lists.id == list_item.id)
+            .values(
+                task_count=Lists.task_count + total,
+                completed_task_count=Lists.completed_task_count + completed,
+            )
+        )
+        if list_item.project_id:
+            self.db.session.execute(
+                update(Projects)
+                .where(Projects.id == list_item.project_id)
+                .values(
+                    total_tasks=Projects.total_tasks + total,
+                    completed_tasks=Projects.completed_tasks + completed,
+                )
+            )
 
     def add_new_task(self, taskData: Dict[str, Any], listId: int) -> Tasks:
         # Validate required fields
@@ -60,9 +126,337 @@ class TaskService:
         )
 
         self.db.session.add(new_task)
+        self.db.session.flush()  # Populate created_at for the daily rollup
+
+        owner_id = self._get_owner_id(list_item)
+        if owner_id:
+            self.daily_analytics.record_task_created(new_task, owner_id)
+        self._adjust_task_counters(list_item, total=1)
+
         self.db.session.commit()
+
+        # Update the list progress
+        self.update_list_progress(listId)
+
         return new_task
 
+    def _validate_bulk_fields(
+        self, item: Dict[str, Any], required_fields: List[str]
+    ) -> Dict[str, Any]:
+        """Validate and normalize the scalar fields of one bulk item
+
+        Raises:
+            ValueError: describing the first invalid field
+        """
+        if not isinstance(item, dict):
+            raise ValueError("Each item must be an object")
+
+        for field in required_fields:
+            if field not in item:
+                raise ValueError(f"Missing required field: {field}")
+
+        values = {}
+        # IDs end up in sets and IN clauses, so reject anything but integers
+        for field in ["id", "list_id"]:
+            if field in required_fields:
+                if not isinstance(item[field], int) or isinstance(item[field], bool):
+                    raise ValueError(f"{field} must be an integer")
+                values[field] = item[field]
+
+        if "name" in item:
+            if not isinstance(item["name"], str) or not item["name"].strip():
+                raise ValueError("Task name cannot be empty")
+            values["name"] = item["name"]
+
+        if "description" in item:
+            if item["description"] is not None and not isinstance(
+                item["description"], str
+            ):
+                raise ValueError("Description must be a string")
+            values["description"] = item["description"] or ""
+
+        if "priority" in item:
+            try:
+                values["priority"] = TaskPriority(item["priority"])
+            except ValueError:
+                valid_values = [e.value for e in TaskPriority]
+                raise ValueError(
+                    f"Invalid priority value. Valid options: {valid_values}"
+                )
+
+        if "planned_duration" in item:
+            planned_duration = item["planned_duration"]
+            if not isinstance(planned_duration, int) or planned_duration <= 0:
+                raise ValueError("Planned duration must be a positive integer")
+            values["planned_duration"] = planned_duration
+
+        if "category_id" in item:
+            category_id = item["category_id"] or None
+            if category_id is not None and (
+                not isinstance(category_id, int) or isinstance(category_id, bool)
+            ):
+                raise ValueError("category_id must be an integer")
+            values["category_id"] = category_id
+
+        return values
+
+    def bulk_add_tasks(
+        self, items: List[Dict[str, Any]], user_id: str, atomic: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Validate and insert a batch of tasks in one transaction
+
+        Lists, categories and duplicate names are checked with one query each,
+        and the rows are inserted with a single executemany.
+
+        Args:
+            items: task payloads (name, list_id, priority, planned_duration,
+                   optional description and category_id)
+            user_id: ID of the user importing the tasks
+            atomic: when True, insert nothing if any item is invalid
+
+        Returns:
+            (created, errors): created is a list of {"index", "id"},
+            errors a list of {"index", "error"}
+        """
+        errors = []
+        rows = {}
+        for index, item in enumerate(items):
+            try:
+                values = self._validate_bulk_fields(
+                    item, ["name", "list_id", "priority", "planned_duration"]
+                )
+                rows[index] = values
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+
+        # Lists must exist and belong to the user
+        list_ids = {values["list_id"] for values in rows.values()}
+        owned_lists = {
+            list_id: project_id
+            for list_id, project_id in self.db.session.query(Lists.id, Lists.project_id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .filter(Lists.id.in_(list_ids))
+            .filter(Projects.user_id == user_id)
+            .all()
+        }
+
+        category_ids = {
+            values["category_id"]
+            for values in rows.values()
+            if values.get("category_id")
+        }
+        owned_categories = {
+            category_id
+            for (category_id,) in self.db.session.query(Categories.id)
+            .filter(Categories.id.in_(category_ids))
+            .filter(Categories.user_id == user_id)
+            .all()
+        }
+
+        existing_names = set(
+            self.db.session.query(Tasks.list_id, Tasks.name)
+            .filter(Tasks.list_id.in_(list_ids))
+            .filter(Tasks.name.in_({values["name"] for values in rows.values()}))
+            .all()
+        )
+
+        for index in sorted(rows):
+            values = rows[index]
+            key = (values["list_id"], values["name"])
+            error = None
+            if values["list_id"] not in owned_lists:
+                error = f"List with ID {values['list_id']} does not exist"
+            elif values.get("category_id") and values["category_id"] not in owned_categories:
+                error = f"Category with ID {values['category_id']} does not exist"
+            elif key in existing_names:
+                error = "Task with this name already exists in the list"
+
+            if error:
+                errors.append({"index": index, "error": error})
+                del rows[index]
+            else:
+                existing_names.add(key)  # Catch duplicates within the batch
+
+        errors.sort(key=lambda error: error["index"])
+        if not rows or (atomic and errors):
+            return [], errors
+
+        now = get_utc_now()
+        indexes = sorted(rows)
+        insert_rows = [
+            {
+                "name": rows[index]["name"],
+                "description": rows[index].get("description", ""),
+                "priority": rows[index]["priority"],
+                "planned_duration": rows[index]["planned_duration"],
+                "list_id": rows[index]["list_id"],
+                "category_id": rows[index].get("category_id"),
+                "status": TaskStatus.NOT_STARTED,
+                "total_time_worked": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for index in indexes
+        ]
+        new_ids = self.db.session.scalars(
+            insert(Tasks).returning(Tasks.id, sort_by_parameter_order=True),
+            insert_rows,
+        ).all()
+
+        # Counters, progress and rollup for every touched list in bulk
+        per_list = {}
+        for row in insert_rows:
+            per_list[row["list_id"]] = per_list.get(row["list_id"], 0) + 1
+        per_project = {}
+        for list_id, added in per_list.items():
+            project_id = owned_lists[list_id]
+            per_project[project_id] = per_project.get(project_id, 0) + added
+
+        list_table = Lists.__table__
+        self.db.session.execute(
+            list_table.update()
+            .where(list_table.c.id == bindparam("b_id"))
+            .values(
+                task_count=list_table.c.task_count + bindparam("b_added"),
+                progress=case(
+                    (
+                        list_table.c.task_count + bindparam("b_added") > 0,
+                        list_table.c.completed_task_count
+                        * 1.0
+                        / (list_table.c.task_count + bindparam("b_added")),
+                    ),
+                    else_=0.0,
+                ),
+                updated_at=now,
+            ),
+            [{"b_id": list_id, "b_added": added} for list_id, added in per_list.items()],
+        )
+        project_table = Projects.__table__
+        self.db.session.execute(
+            project_table.update()
+            .where(project_table.c.id == bindparam("b_id"))
+            .values(total_tasks=project_table.c.total_tasks + bindparam("b_added")),
+            [
+                {"b_id": project_id, "b_added": added}
+                for project_id, added in per_project.items()
+            ],
+        )
+        self.daily_analytics.record_tasks_created(len(insert_rows), user_id, now)
+
+        self.db.session.commit()
+
+        created = [
+            {"index": index, "id": task_id} for index, task_id in zip(indexes, new_ids)
+        ]
+        return created, errors
+
+    def bulk_update_tasks(
+        self, items: List[Dict[str, Any]], user_id: str, atomic: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Validate and apply a batch of task updates in one transaction
+
+        Args:
+            items: payloads with the task "id" and any of name, description,
+                   priority, planned_duration and category_id
+            user_id: ID of the user owning the tasks
+            atomic: when True, update nothing if any item is invalid
+
+        Returns:
+            (updated, errors): updated is a list of {"index", "id"},
+            errors a list of {"index", "error"}
+        """
+        errors = []
+        rows = {}
+        for index, item in enumerate(items):
+            try:
+                values = self._validate_bulk_fields(item, ["id"])
+                if len(values) == 1:
+                    raise ValueError("No fields to update")
+                rows[index] = values
+            except ValueError as e:
+                errors.append({"index": index, "error": str(e)})
+
+        task_ids = {values["id"] for values in rows.values()}
+        tasks = {
+            task_id: (list_id, status, work_start)
+            for task_id, list_id, status, work_start in self.db.session.query(
+                Tasks.id, Tasks.list_id, Tasks.status, Tasks.current_work_start
+            )
+            .join(Lists, Tasks.list_id == Lists.id)
+            .join(Projects, Lists.project_id == Projects.id)
+            .filter(Tasks.id.in_(task_ids))
+            .filter(Projects.user_id == user_id)
+            .all()
+        }
+
+        category_ids = {
+            values["category_id"]
+            for values in rows.values()
+            if values.get("category_id")
+        }
+        owned_categories = {
+            category_id
+            for (category_id,) in self.db.session.query(Categories.id)
+            .filter(Categories.id.in_(category_ids))
+            .filter(Categories.user_id == user_id)
+            .all()
+        }
+
+        renames = {
+            (tasks[values["id"]][0], values["name"])
+            for values in rows.values()
+            if "name" in values and values["id"] in tasks
+        }
+        taken_names = {}
+        if renames:
+            for task_id, list_id, name in (
+                self.db.session.query(Tasks.id, Tasks.list_id, Tasks.name)
+                .filter(tuple_(Tasks.list_id, Tasks.name).in_(renames))
+                .all()
+            ):
+                taken_names[(list_id, name)] = task_id
+
+        for index in sorted(rows):
+            values = rows[index]
+            task = tasks.get(values["id"])
+            error = None
+            if not task:
+                error = "Task not found"
+            elif (
+                task[1] == TaskStatus.ACTIVE
+                and task[2] is not None
+                and any(
+                    key in values
+                    for key in ["name", "description", "priority", "planned_duration"]
+                )
+            ):
+                error = "Cannot update task details while timer is active"
+            elif values.get("category_id") and values["category_id"] not in owned_categories:
+                error = f"Category with ID {values['category_id']} does not exist"
+            elif "name" in values and taken_names.get(
+                (task[0], values["name"]), values["id"]
+            ) != values["id"]:
+                error = "Task with this name already exists in the list"
+
+            if error:
+                errors.append({"index": index, "error": error})
+                del rows[index]
+            elif "name" in values:
+                taken_names[(task[0], values["name"])] = values["id"]
+
+        errors.sort(key=lambda error: error["index"])
+        if not rows or (atomic and errors):
+            return [], errors
+
+        now = get_utc_now()
+        self.db.session.execute(
+            update(Tasks), [{**rows[index], "updated_at": now} for index in sorted(rows)]
+        )
+        self.db.session.commit()
+
+        updated = [{"index": index, "id": rows[index]["id"]} for index in sorted(rows)]
+        return updated, errors
+
     def read_one_task(self, taskId: int) -> Optional[Tasks]:
         task = Tasks.query.filter_by(id=taskId).first()
         return task
@@ -131,6 +525,13 @@ class TaskService:
 
         # Update list progress after deletion
         list_id = task.list_id
+        owner_id = self._get_owner_id(task.list)
+        if owner_id:
+            self.daily_analytics.record_task_deleted(task, owner_id)
+        self._adjust_task_counters(
+            task.list, total=-1, completed=-1 if task.status == TaskStatus.DONE else 0
+        )
+
         self.db.session.delete(task)
         self.db.session.commit()
 
@@ -161,12 +562,19 @@ class TaskService:
         task.status = TaskStatus.ACTIVE
 
         # Set first_started_at if this is the first time
+        owner_id = self._get_owner_id(task.list)
         if not task.first_started_at:
             task.first_started_at = now
+            if owner_id:
+                self.daily_analytics.record_task_started(task, owner_id)
 
         task.updated_at = now
+        timer_state = self._timer_state(task)
         self.db.session.commit()
 
+        publish_timer_event(owner_id, "timer_started", timer_state)
+        self._sync_timer_schedule(timer_state, owner_id)
+
         return {
             "task_id": task_id,
             "status": task.status.value,
@@ -222,8 +630,13 @@ class TaskService:
         task.status = TaskStatus.PAUSED
         task.updated_at = get_utc_now()
 
+        timer_state = self._timer_state(task)
+        owner_id = self._get_owner_id(task.list)
         self.db.session.commit()
 
+        publish_timer_event(owner_id, "timer_paused", timer_state)
+        self._sync_timer_schedule(timer_state, owner_id)
+
         return {
             "task_id": task_id,
             "status": task.status.value,
@@ -284,8 +697,17 @@ class TaskService:
         task.reflection = reflection.strip()
         task.updated_at = now
 
+        owner_id = self._get_owner_id(task.list)
+        if owner_id:
+            self.daily_analytics.record_task_completed(task, owner_id)
+        self._adjust_task_counters(task.list, completed=1)
+
+        timer_state = self._timer_state(task)
         self.db.session.commit()
 
+        publish_timer_event(owner_id, "timer_completed", timer_state)
+        self._sync_timer_schedule(timer_state, owner_id)
+
         # Update list progress after task completion
         self.update_list_progress(task.list_id)
 
@@ -311,8 +733,8 @@ class TaskService:
             "status": task.status.value,
             "total_time_worked": task.total_time_worked,
             "planned_duration": task.planned_duration,
-            "first_started_at": task.first_started_at,
-            "completed_at": task.completed_at,
+            "first_started_at": ensure_timezone_aware(task.first_started_at),
+            "completed_at": ensure_timezone_aware(task.completed_at),
             "is_timer_active": task.is_timer_active,
         }
 
@@ -320,8 +742,10 @@ class TaskService:
         if task.is_timer_active:
             status_info.update(
                 {
-                    "current_work_start": task.current_work_start,
-                    "current_planned_end": task.current_planned_end,
+                    "current_work_start": ensure_timezone_aware(task.current_work_start),
+                    "current_planned_end": ensure_timezone_aware(
+                        task.current_planned_end
+                    ),
                     "elapsed_minutes": task.current_session_elapsed_minutes,
                     "remaining_minutes": task.current_session_remaining_minutes,
                     "is_expired": task.is_timer_expired,
@@ -412,8 +836,14 @@ class TaskService:
         # Extend the planned end time
         task.current_planned_end += timedelta(minutes=additional_minutes)
         task.updated_at = get_utc_now()
+
+        timer_state = self._timer_state(task)
+        owner_id = self._get_owner_id(task.list)
         self.db.session.commit()
 
+        publish_timer_event(owner_id, "timer_extended", timer_state)
+        self._sync_timer_schedule(timer_state, owner_id)
+
         return {
             "task_id": task_id,
             "current_planned_end": task.current_planned_end.isoformat(),
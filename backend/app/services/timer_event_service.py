@@ -0,0 +1,143 @@
+import json
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional, Iterator
+
+import redis
+from flask import current_app
+
+
+class TimerEventBroker:
+    """Fan timer events out to the open event streams of a user
+
+    Events go through Redis pub/sub when Redis is available so every gunicorn
+    worker sees them. Without Redis they are delivered in-process, which only
+    reaches streams served by the same worker.
+
+    Each open stream holds a worker thread, so at most max_streams are served
+    per process and each one ends after max_seconds (EventSource reconnects).
+    """
+
+    CHANNEL_PREFIX = "timer_events"
+
+    def __init__(
+        self, redis_client=None, logger=None, max_streams: int = 4, max_seconds: int = 300
+    ):
+        self.redis = redis_client
+        self.logger = logger
+        self.max_streams = max_streams
+        self.max_seconds = max_seconds
+        self._subscribers: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self._open_streams = 0
+
+    def has_free_slot(self) -> bool:
+        with self._lock:
+            return self._open_streams < self.max_streams
+
+    def acquire_slot(self) -> bool:
+        """Reserve one of the stream slots of this process, without waiting"""
+        with self._lock:
+            if self._open_streams >= self.max_streams:
+                return False
+            self._open_streams += 1
+            return True
+
+    def release_slot(self) -> None:
+        with self._lock:
+            self._open_streams = max(0, self._open_streams - 1)
+
+    def _channel(self, user_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}:{user_id}"
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Send an event to every stream of a user"""
+        message = json.dumps({"event": event_type, "data": data})
+
+        if self.redis:
+            try:
+                self.redis.publish(self._channel(user_id), message)
+                return
+            except redis.RedisError as e:
+                if self.logger:
+                    self.logger.warning(f"Timer event publish failed: {str(e)}")
+
+        self._deliver_local(user_id, message)
+
+    def _deliver_local(self, user_id: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            subscriber.put(message)
+
+    @staticmethod
+    def _format_sse(message: str) -> str:
+        payload = json.loads(message)
+        return f"event: {payload['event']}\ndata: {json.dumps(payload['data'])}\n\n"
+
+    def stream(self, user_id: str, heartbeat_seconds: int = 15) -> Iterator[str]:
+        """Yield Server-Sent Events for a user until the client disconnects
+        or the stream reaches max_seconds"""
+        yield "retry: 5000\n\n"
+
+        deadline = time.monotonic() + self.max_seconds
+        if self.redis:
+            yield from self._stream_redis(user_id, heartbeat_seconds, deadline)
+        else:
+            yield from self._stream_local(user_id, heartbeat_seconds, deadline)
+
+    def _stream_local(
+        self, user_id: str, heartbeat_seconds: int, deadline: float
+    ) -> Iterator[str]:
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    message = subscriber.get(timeout=min(heartbeat_seconds, remaining))
+                    yield self._format_sse(message)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            with self._lock:
+                self._subscribers.get(user_id, set()).discard(subscriber)
+                if not self._subscribers.get(user_id):
+                    self._subscribers.pop(user_id, None)
+
+    def _stream_redis(
+        self, user_id: str, heartbeat_seconds: int, deadline: float
+    ) -> Iterator[str]:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self._channel(user_id))
+        last_sent = time.monotonic()
+        try:
+            while time.monotonic() < deadline:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    yield self._format_sse(message["data"])
+                    last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= heartbeat_seconds:
+                    yield ": keepalive\n\n"
+                    last_sent = time.monotonic()
+        finally:
+            pubsub.close()
+
+
+def publish_timer_event(
+    user_id: Optional[str], event_type: str, data: Dict[str, Any]
+) -> None:
+    """Publish a timer event through the app's broker (no-op without one)"""
+    broker = getattr(current_app, "timer_events", None)
+    if not broker or not user_id:
+        return
+
+    try:
+        broker.publish(user_id, event_type, data)
+    except Exception as e:
+        # Pushing updates must never fail the timer operation itself
+        current_app.logger.error(f"Failed to publish timer event: {str(e)}")
@@ -0,0 +1,167 @@
+import heapq
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+
+from app.models import db, Tasks, Lists, Projects, TaskStatus
+from app.utils import ensure_timezone_aware
+
+
+class TimerExpiryScheduler:
+    """Fire timer_expired events when active timers lapse
+
+    Deadlines live in a min-heap keyed by current_planned_end, so scheduling,
+    rescheduling and cancelling cost O(log n). Rescheduled or cancelled timers
+    leave stale heap entries behind that are skipped when popped.
+
+    Each gunicorn worker runs its own scheduler. Before firing, the deadline is
+    checked against the database (a timer may have been extended or paused
+    through another worker) and, with Redis, claimed with SET NX so only one
+    worker publishes each expiry.
+    """
+
+    def __init__(self, app, broker):
+        self.app = app
+        self.broker = broker
+        self._heap = []
+        self._entries: Dict[int, Tuple[float, str]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background thread (loads active timers from the database)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="timer-expiry-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def schedule(self, task_id: int, user_id: str, planned_end: datetime) -> None:
+        """Add or move the expiry deadline of a task"""
+        deadline = ensure_timezone_aware(planned_end).timestamp()
+        with self._condition:
+            self._entries[task_id] = (deadline, user_id)
+            heapq.heappush(self._heap, (deadline, task_id))
+            self._compact()
+            self._condition.notify()
+
+    def cancel(self, task_id: int) -> None:
+        """Forget the deadline of a task (paused or completed)"""
+        with self._condition:
+            self._entries.pop(task_id, None)
+            self._compact()
+
+    @property
+    def active_count(self) -> int:
+        with self._condition:
+            return len(self._entries)
+
+    def _compact(self) -> None:
+        # Rebuild the heap once stale entries clearly outnumber live ones
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (deadline, task_id)
+                for task_id, (deadline, _) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def load_active_timers(self) -> int:
+        """Schedule every timer that is currently running"""
+        with self.app.app_context():
+            try:
+                rows = (
+                    db.session.query(
+                        Tasks.id, Projects.user_id, Tasks.current_planned_end
+                    )
+                    .join(Lists, Tasks.list_id == Lists.id)
+                    .join(Projects, Lists.project_id == Projects.id)
+                    .filter(Tasks.status == TaskStatus.ACTIVE)
+                    .filter(Tasks.current_planned_end.isnot(None))
+                    .all()
+                )
+            except Exception as e:
+                self.app.logger.warning(f"Could not load active timers: {str(e)}")
+                return 0
+            finally:
+                db.session.remove()
+
+        for task_id, user_id, planned_end in rows:
+            self.schedule(task_id, user_id, planned_end)
+        return len(rows)
+
+    def _pop_due(self) -> Optional[Tuple[int, str, float]]:
+        """Wait for the next live deadline and return it once due"""
+        with self._condition:
+            while True:
+                while self._heap:
+                    deadline, task_id = self._heap[0]
+                    entry = self._entries.get(task_id)
+                    if entry and entry[0] == deadline:
+                        break
+                    heapq.heappop(self._heap)  # Stale entry
+                else:
+                    self._condition.wait()
+                    continue
+
+                delay = deadline - time.time()
+                if delay <= 0:
+                    heapq.heappop(self._heap)
+                    _, user_id = self._entries.pop(task_id)
+                    return task_id, user_id, deadline
+                self._condition.wait(timeout=delay)
+
+    def _run(self) -> None:
+        self.load_active_timers()
+        while True:
+            task_id, user_id, deadline = self._pop_due()
+            try:
+                self._fire(task_id, user_id, deadline)
+            except Exception as e:
+                self.app.logger.error(f"Timer expiry for task {task_id} failed: {str(e)}")
+
+    def _fire(self, task_id: int, user_id: str, deadline: float) -> None:
+        from app.services.task_service import TaskService
+
+        with self.app.app_context():
+            try:
+                task = db.session.get(Tasks, task_id)
+                if not task or not task.is_timer_active:
+                    return
+
+                # Extended or restarted elsewhere: the newer deadline wins
+                planned_end = ensure_timezone_aware(task.current_planned_end)
+                if abs(planned_end.timestamp() - deadline) > 1:
+                    if planned_end.timestamp() > deadline:
+                        self.schedule(task_id, user_id, planned_end)
+                    return
+
+                if not self._claim(task_id, deadline):
+                    return
+
+                timer_state = TaskService(db)._timer_state(task)
+                self.broker.publish(user_id, "timer_expired", timer_state)
+            finally:
+                db.session.remove()
+
+    def _claim(self, task_id: int, deadline: float) -> bool:
+        """Make sure only one worker publishes a given expiry"""
+        redis_client = getattr(self.app, "redis", None)
+        if not redis_client:
+            return True
+        try:
+            return bool(
+                redis_client.set(
+                    f"timer_expired:{task_id}:{int(deadline)}", "1", nx=True, ex=3600
+                )
+            )
+        except Exception:
+            return True
+
+
+def get_timer_scheduler() -> Optional[TimerExpiryScheduler]:
+    """Return the app's expiry scheduler, or None when it is disabled"""
+    return getattr(current_app, "timer_scheduler", None)
@@ -0,0 +1,159 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+
+class BloomFilter:
+    """Fixed-size bloom filter of revoked jtis (no false negatives)"""
+
+    def __init__(self, size_bits: int = 1 << 20, hash_count: int = 4):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=8 * self.hash_count).digest()
+        for i in range(self.hash_count):
+            chunk = digest[i * 8 : (i + 1) * 8]
+            yield int.from_bytes(chunk, "little") % self.size_bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class TokenBlocklist:
+    """Revoked-token lookups served from process memory
+
+    Results from Redis are kept in a bounded cache keyed by jti (oldest
+    entries evicted first): revocations until the token expires, "not
+    revoked" answers for a short negative TTL.
+    Revocations are broadcast over Redis pub/sub so every worker updates its
+    cache immediately instead of waiting for the negative TTL to lapse.
+
+    While Redis is unreachable, lookups fall back to a bloom filter of every
+    revocation this process has seen, and Redis is not retried until a short
+    backoff has passed so requests don't pay the socket timeout.
+    """
+
+    KEY_PREFIX = "revoked_token"
+    CHANNEL = "revoked_tokens"
+    LISTEN_POLL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        redis_client=None,
+        logger=None,
+        max_entries: int = 100_000,
+        negative_ttl: float = 10.0,
+        retry_after: float = 5.0,
+    ):
+        self.redis = redis_client
+        self.logger = logger
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.retry_after = retry_after
+        self.bloom = BloomFilter()
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+        self._listener: Optional[threading.Thread] = None
+
+    def _remember(self, jti: str, revoked: bool, expires_at: float) -> None:
+        with self._lock:
+            self._cache[jti] = (revoked, expires_at)
+            self._cache.move_to_end(jti)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _mark_revoked(self, jti: str, expires_at: float) -> None:
+        self.bloom.add(jti)
+        self._remember(jti, True, expires_at)
+
+    def _redis_available(self) -> bool:
+        return bool(self.redis) and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.retry_after
+        if self.logger:
+            self.logger.warning(f"Token blocklist falling back to bloom filter: {error}")
+
+    def is_revoked(self, jti: str, token_exp: Optional[float] = None) -> bool:
+        """Check whether a token id has been revoked
+
+        Args:
+            jti: the token's unique id
+            token_exp: the token's exp claim, bounds how long a revocation is cached
+        """
+        now = time.time()
+        entry = self._cache.get(jti)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        if not self._redis_available():
+            return jti in self.bloom
+
+        try:
+            revoked = self.redis.get(f"{self.KEY_PREFIX}:{jti}") is not None
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return jti in self.bloom
+
+        if revoked:
+            self._mark_revoked(jti, token_exp or now + self.negative_ttl)
+        else:
+            self._remember(jti, False, now + self.negative_ttl)
+        return revoked
+
+    def revoke(self, jti: str, token_exp: float) -> None:
+        """Revoke a token until its expiry and notify the other workers"""
+        self._mark_revoked(jti, token_exp)
+
+        ttl = max(1, int(token_exp - time.time()))
+        if not self.redis:
+            return
+        try:
+            self.redis.setex(f"{self.KEY_PREFIX}:{jti}", ttl, "1")
+            self.redis.publish(self.CHANNEL, f"{jti}:{int(token_exp)}")
+        except redis.RedisError as e:
+            self._redis_failed(e)
+
+    def start(self) -> None:
+        """Listen for revocations published by other workers"""
+        if not self.redis or (self._listener and self._listener.is_alive()):
+            return
+        self._listener = threading.Thread(
+            target=self._listen, name="token-blocklist-listener", daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.CHANNEL)
+                while True:
+                    # Wait less than the client's socket_timeout so an idle
+                    # channel returns None instead of raising a timeout
+                    message = pubsub.get_message(timeout=self.LISTEN_POLL_SECONDS)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    jti, _, token_exp = message["data"].rpartition(":")
+                    self._mark_revoked(jti, float(token_exp))
+            except Exception as e:
+                # Anything negatively cached meanwhile expires within negative_ttl
+                if self.logger:
+                    self.logger.warning(f"Token blocklist listener error: {str(e)}")
+            finally:
+                pubsub.close()
+            time.sleep(self.retry_after)
@@ -0,0 +1,142 @@
+"""Engine configuration per database backend"""
+
+from typing import Dict, Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app.utils.read_routing import READ_BIND, init_read_routing
+
+
+def is_sqlite(uri: str) -> bool:
+    return make_url(uri).get_backend_name() == "sqlite"
+
+
+def is_postgresql(uri: str) -> bool:
+    return make_url(uri).get_backend_name() == "postgresql"
+
+
+def is_sqlite_memory(uri: str) -> bool:
+    url = make_url(uri)
+    return is_sqlite(uri) and url.database in (None, "", ":memory:")
+
+
+def sqlite_pragmas(config, uri: Optional[str] = None) -> Dict[str, Any]:
+    """PRAGMAs applied to every new SQLite connection, from SQLITE_* settings"""
+    pragmas = {
+        "journal_mode": config.get("SQLITE_JOURNAL_MODE"),
+        "synchronous": config.get("SQLITE_SYNCHRONOUS"),
+        "busy_timeout": config.get("SQLITE_BUSY_TIMEOUT_MS"),
+        "mmap_size": config.get("SQLITE_MMAP_SIZE"),
+        "cache_size": config.get("SQLITE_CACHE_SIZE"),
+    }
+    if is_sqlite_memory(uri or config["SQLALCHEMY_DATABASE_URI"]):
+        # WAL and mmap need a file; an in-memory database ignores them
+        pragmas.pop("journal_mode")
+        pragmas.pop("mmap_size")
+    return {name: value for name, value in pragmas.items() if value is not None}
+
+
+def sqlite_engine_options(config, uri: Optional[str] = None) -> Dict[str, Any]:
+    """Pool settings for a file-backed SQLite database
+
+    SQLite allows one writer at a time, so a small pool per worker is enough;
+    extra connections would only queue on the database lock. Connections are
+    shared across gunicorn threads, hence check_same_thread=False.
+    """
+    if is_sqlite_memory(uri or config["SQLALCHEMY_DATABASE_URI"]):
+        return {}
+
+    busy_timeout_ms = config.get("SQLITE_BUSY_TIMEOUT_MS") or 5000
+    return {
+        "pool_size": config.get("SQLITE_POOL_SIZE", 5),
+        "max_overflow": config.get("SQLITE_POOL_MAX_OVERFLOW", 5),
+        "pool_timeout": busy_timeout_ms / 1000,
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": busy_timeout_ms / 1000,
+        },
+    }
+
+
+def postgresql_engine_options(config) -> Dict[str, Any]:
+    """Pool settings for PostgreSQL through psycopg
+
+    Sessions run in UTC so date_trunc buckets timestamps by UTC day, matching
+    the SQLite date() buckets. pool_pre_ping drops connections the server
+    closed while idle.
+    """
+    return {
+        "pool_size": config.get("DB_POOL_SIZE", 10),
+        "max_overflow": config.get("DB_POOL_MAX_OVERFLOW", 10),
+        "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True,
+        "connect_args": {"options": "-c timezone=UTC"},
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas: Dict[str, Any]) -> None:
+    """Run the PRAGMAs on each connection as soon as it is opened"""
+    if not pragmas:
+        return
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def engine_options(config, uri: str) -> Dict[str, Any]:
+    """Engine options for the backend of a database URL"""
+    if is_sqlite(uri):
+        return sqlite_engine_options(config, uri)
+    if is_postgresql(uri):
+        return postgresql_engine_options(config)
+    return {}
+
+
+def read_database_uri(config) -> Optional[str]:
+    """URL of the read engine, if one is configured
+
+    READ_DATABASE_URL points at a replica. Without one, READ_ENGINE_ENABLED
+    gives a SQLite file database its own query_only connection pool.
+    """
+    if config.get("READ_DATABASE_URL"):
+        return config["READ_DATABASE_URL"]
+
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if config.get("READ_ENGINE_ENABLED") and is_sqlite(uri) and not is_sqlite_memory(uri):
+        return uri
+    return None
+
+
+def configure_engine(app, db) -> None:
+    """Set engine options before db.init_app and connect hooks after it"""
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    options = engine_options(app.config, uri)
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    read_uri = read_database_uri(app.config)
+    if read_uri:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds[READ_BIND] = {"url": read_uri, **engine_options(app.config, read_uri)}
+        app.config["SQLALCHEMY_BINDS"] = binds
+
+    db.init_app(app)
+    with app.app_context():
+        if is_sqlite(uri):
+            apply_sqlite_pragmas(db.engine, sqlite_pragmas(app.config))
+        if read_uri and is_sqlite(read_uri):
+            read_pragmas = dict(sqlite_pragmas(app.config, read_uri), query_only="ON")
+            apply_sqlite_pragmas(db.engines[READ_BIND], read_pragmas)
+
+    if read_uri:
+        init_read_routing(app)
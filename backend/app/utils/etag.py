@@ -0,0 +1,140 @@
+"""Weak ETags and conditional GETs from updated_at watermarks
+
+A watermark is the row count and latest updated_at of every table a response
+is built from. Any insert, update or delete changes one of the two, so the
+watermark changes whenever the response could. It is computed with aggregate
+queries in one round trip, without loading or serializing the rows.
+
+Not re-exported from app.utils because it imports the models, which
+themselves import app.utils.
+"""
+
+import hashlib
+from functools import wraps
+from typing import Any, Callable, List, Tuple
+
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import func, select
+
+from app.models import db, Categories, DailyAnalytics, Lists, Projects, Tasks
+
+
+def _stamp(model, *criteria) -> List[Any]:
+    """Scalar subqueries for the count and latest updated_at of some rows"""
+    return [
+        select(func.count(model.id)).where(*criteria).scalar_subquery(),
+        select(func.max(model.updated_at)).where(*criteria).scalar_subquery(),
+    ]
+
+
+def _watermark(*stamps) -> Tuple[Any, ...]:
+    columns = [column for stamp in stamps for column in stamp]
+    return tuple(db.session.execute(select(*columns)).one())
+
+
+def _user_tasks(user_id):
+    return Tasks.list_id.in_(
+        select(Lists.id)
+        .join(Projects, Lists.project_id == Projects.id)
+        .where(Projects.user_id == user_id)
+    )
+
+
+def _user_category_tasks(user_id):
+    return Tasks.category_id.in_(
+        select(Categories.id).where(Categories.user_id == user_id)
+    )
+
+
+# Watermarks of the GET endpoints, called with the user id and view arguments.
+# The list, task and project counters shown in summaries are columns of the
+# parent rows, so a task change that moves them also bumps its updated_at.
+
+
+def user_projects_watermark(user_id) -> Tuple[Any, ...]:
+    user_projects = select(Projects.id).where(Projects.user_id == user_id)
+    return _watermark(
+        _stamp(Projects, Projects.user_id == user_id),
+        _stamp(Lists, Lists.project_id.in_(user_projects)),
+    )
+
+
+def project_watermark(user_id, project_id) -> Tuple[Any, ...]:
+    return _watermark(
+        _stamp(Projects, Projects.id == project_id),
+        _stamp(Lists, Lists.project_id == project_id),
+    )
+
+
+def list_watermark(user_id, list_id) -> Tuple[Any, ...]:
+    return _watermark(
+        _stamp(Lists, Lists.id == list_id),
+        _stamp(Tasks, Tasks.list_id == list_id),
+    )
+
+
+def user_categories_watermark(user_id) -> Tuple[Any, ...]:
+    return _watermark(
+        _stamp(Categories, Categories.user_id == user_id),
+        _stamp(Tasks, _user_category_tasks(user_id)),
+    )
+
+
+def category_watermark(user_id, category_id) -> Tuple[Any, ...]:
+    return _watermark(
+        _stamp(Categories, Categories.id == category_id),
+        _stamp(Tasks, Tasks.category_id == category_id),
+    )
+
+
+def user_tasks_watermark(user_id) -> Tuple[Any, ...]:
+    return _watermark(_stamp(Tasks, _user_tasks(user_id)))
+
+
+def daily_analytics_watermark(user_id, **view_args) -> Tuple[Any, ...]:
+    """Rollup rows when calendar reads use them, the user's tasks otherwise"""
+    if current_app.config.get("DAILY_ANALYTICS_ROLLUP"):
+        return _watermark(_stamp(DailyAnalytics, DailyAnalytics.user_id == user_id))
+    return user_tasks_watermark(user_id)
+
+
+def compute_etag(*parts) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def conditional_get(watermark: Callable[..., Tuple[Any, ...]]):
+    """Answer If-None-Match with 304 when the watermark is unchanged
+
+    The watermark is computed before the view runs. The ETag also covers the
+    user and the full path, so query strings (date ranges, pages) get their
+    own tags. Only successful responses carry an ETag.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get("ETAGS_ENABLED", True):
+                return view(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            etag = compute_etag(
+                user_id, request.full_path, watermark(user_id, **kwargs)
+            )
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            # Per-user data: no shared caches, and revalidate on every use
+            response.headers["Cache-Control"] = "private, no-cache"
+            response.vary.add("Authorization")
+            return response
+
+        return wrapper
+
+    return decorator
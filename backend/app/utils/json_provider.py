@@ -0,0 +1,43 @@
+"""orjson-backed JSON provider for the Flask app
+
+orjson encodes datetimes (ISO 8601, same text as isoformat()), dates, enums
+(by value), dataclasses and UUIDs natively, so serializers can hand it model
+values as they are instead of converting every field in Python.
+
+Naive datetimes (what SQLite returns) are stored in UTC, so they are sent
+with a +00:00 offset; without one browsers read them as local time.
+"""
+
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(obj):
+    """Types orjson does not encode natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Used by jsonify/create_response and request.get_json"""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Skip the bytes -> str -> bytes round trip of dumps()
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype="application/json",
+        )
@@ -0,0 +1,54 @@
+"""Relationship loader profiles for read paths that walk object graphs
+
+Not re-exported from app.utils because it imports the models, which
+themselves import app.utils.
+"""
+
+from typing import Optional
+from flask import current_app
+from sqlalchemy.orm import selectinload, joinedload, lazyload
+
+from app.models import Projects, Lists, Tasks, Categories
+
+LOADER_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "lazy": lazyload,
+}
+
+# Relationship paths each read path touches after loading its root object
+LOADER_PROFILES = {
+    "project_lists": [(Projects.lists,)],
+    "list_tasks": [(Lists.tasks,)],
+    "category_tasks": [(Categories.tasks,)],
+    "category_tasks_with_location": [(Categories.tasks, Tasks.list, Lists.project)],
+    "task_location": [(Tasks.list, Lists.project)],
+}
+
+
+def load_path(*attributes, strategy: str = "selectin"):
+    """Build a chained loader option (e.g. selectinload(A).selectinload(B))"""
+    if strategy not in LOADER_STRATEGIES:
+        raise ValueError(
+            f"Unknown loader strategy '{strategy}'. "
+            f"Valid options: {list(LOADER_STRATEGIES)}"
+        )
+
+    loader = LOADER_STRATEGIES[strategy]
+    option = loader(attributes[0])
+    for attribute in attributes[1:]:
+        option = getattr(option, loader.__name__)(attribute)
+    return option
+
+
+def loader_options(profile: str, strategy: Optional[str] = None) -> list:
+    """Return the loader options of a profile
+
+    Args:
+        profile: key of LOADER_PROFILES
+        strategy: selectin, joined or lazy (defaults to EAGER_LOADING_STRATEGY)
+    """
+    if strategy is None:
+        strategy = current_app.config.get("EAGER_LOADING_STRATEGY", "selectin")
+
+    return [load_path(*path, strategy=strategy) for path in LOADER_PROFILES[profile]]
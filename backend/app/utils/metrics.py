@@ -0,0 +1,246 @@
+"""Prometheus metrics for the Flask app
+
+Under gunicorn each worker is a separate process, so start.py points
+PROMETHEUS_MULTIPROC_DIR at a shared directory: every worker writes its
+samples there and /metrics aggregates all of them, whichever worker serves
+the scrape.
+"""
+
+import hmac
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import redis
+from flask import Response, abort, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+
+REQUEST_LATENCY = Histogram(
+    "flow_request_latency_seconds",
+    "HTTP request latency",
+    ["method", "blueprint", "route"],
+)
+REQUEST_COUNT = Counter(
+    "flow_requests_total",
+    "HTTP requests served",
+    ["method", "blueprint", "route", "status"],
+)
+DB_POOL_CHECKOUT_LATENCY = Histogram(
+    "flow_db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_IN_USE = Gauge(
+    "flow_db_pool_connections_in_use",
+    "Database connections currently checked out",
+    multiprocess_mode="livesum",
+)
+REDIS_LATENCY = Histogram(
+    "flow_redis_command_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1, 5),
+)
+REDIS_ERRORS = Counter(
+    "flow_redis_errors_total", "Redis commands that raised", ["command"]
+)
+ACTIVE_TIMERS = Gauge(
+    "flow_active_timers",
+    "Tasks whose timer is currently running",
+    multiprocess_mode="mostrecent",
+)
+AI_LATENCY = Histogram(
+    "flow_ai_request_seconds",
+    "Latency of calls to the AI model",
+    ["operation"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+AI_ERRORS = Counter(
+    "flow_ai_errors_total", "AI model calls that failed", ["operation"]
+)
+AI_CACHE_LOOKUPS = Counter(
+    "flow_ai_cache_lookups_total",
+    "AI answer lookups: hit (cached), coalesced (waited on an identical call) or miss",
+    ["operation", "result"],
+)
+AI_PROMPT_TOKENS = Histogram(
+    "flow_ai_prompt_tokens",
+    "Estimated tokens of the prompts sent to the AI model",
+    ["operation"],
+    buckets=(250, 500, 1000, 1500, 2000, 4000, 8000, 16000),
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "flow_response_cache_lookups_total",
+    "Response cache lookups by cached resource and result (hit or miss)",
+    ["resource", "result"],
+)
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "flow_response_cache_evictions_total",
+    "In-process response cache entries evicted to stay within the size limit",
+)
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    "flow_response_cache_invalidations_total",
+    "Users whose cached responses were dropped after a committed write",
+)
+
+
+class InstrumentedRedis(redis.StrictRedis):
+    """Redis client recording the latency of every command"""
+
+    def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        except redis.RedisError:
+            REDIS_ERRORS.labels(command).inc()
+            raise
+        finally:
+            REDIS_LATENCY.labels(command).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def track_ai_call(operation: str):
+    """Time a call to the AI model and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        AI_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        AI_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+
+def _instrument_pool(engine) -> None:
+    pool = engine.pool
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+
+    do_get = pool._do_get
+
+    def timed_do_get():
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            DB_POOL_CHECKOUT_LATENCY.observe(time.perf_counter() - start)
+
+    pool._do_get = timed_do_get
+    pool._metrics_instrumented = True
+
+    event.listen(pool, "checkout", lambda *args: DB_POOL_IN_USE.inc())
+    event.listen(pool, "checkin", lambda *args: DB_POOL_IN_USE.dec())
+
+
+def _count_active_timers() -> int:
+    from app.models import db, Tasks, TaskStatus
+
+    return db.session.query(Tasks.id).filter(Tasks.status == TaskStatus.ACTIVE).count()
+
+
+class GaugeRefresher:
+    """Refresh the gauges that need a database query on a background thread,
+    so scrapes never run queries themselves (one per worker process)"""
+
+    def __init__(self, app, interval: int):
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-gauge-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> None:
+        from app.models import db
+
+        with self.app.app_context():
+            try:
+                ACTIVE_TIMERS.set(_count_active_timers())
+            except Exception as e:
+                self.app.logger.warning(f"Could not count active timers: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def _run(self) -> None:
+        self.refresh()
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+
+def _scrape_allowed(app) -> bool:
+    token = app.config.get("METRICS_TOKEN")
+    if not token:
+        return app.debug
+    expected = f"Bearer {token}"
+    return hmac.compare_digest(request.headers.get("Authorization", ""), expected)
+
+
+def init_metrics(app) -> None:
+    """Record request/DB metrics and serve them at /metrics"""
+    from app.models import db
+
+    with app.app_context():
+        _instrument_pool(db.engine)
+
+    app.metrics_refresher = None
+    interval = app.config.get("METRICS_REFRESH_SECONDS", 30)
+    if interval > 0:
+        app.metrics_refresher = GaugeRefresher(app, interval)
+        app.metrics_refresher.start()
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started_at = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started_at = g.pop("request_started_at", None)
+        if started_at is None:
+            return response
+
+        # Label by URL rule (not path) to keep label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        blueprint = request.blueprint or "app"
+        REQUEST_LATENCY.labels(request.method, blueprint, route).observe(
+            time.perf_counter() - started_at
+        )
+        REQUEST_COUNT.labels(
+            request.method, blueprint, route, str(response.status_code)
+        ).inc()
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        """Prometheus scrape endpoint (bearer METRICS_TOKEN)"""
+        if not _scrape_allowed(app):
+            # Not found rather than unauthorized: do not advertise the endpoint
+            abort(404)
+
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
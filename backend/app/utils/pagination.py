@@ -0,0 +1,71 @@
+"""Keyset (cursor) pagination on ascending integer ids
+
+Pages are fetched with WHERE id > :last_id ORDER BY id LIMIT :limit, so each
+page costs the same however deep into the history it is, unlike OFFSET.
+Cursors are opaque to clients.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from flask import current_app
+
+
+def encode_cursor(last_id: int) -> str:
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the last id seen, raising ValueError for a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid pagination cursor")
+    return last_id
+
+
+def parse_page_args(args) -> Tuple[Optional[int], Optional[str]]:
+    """Read ?limit= and ?cursor= from the query string
+
+    Returns (None, None) when the client did not ask for a page, so endpoints
+    keep returning everything to existing callers.
+    """
+    limit = args.get("limit")
+    cursor = args.get("cursor") or None
+    if limit is None:
+        if cursor:
+            raise ValueError("cursor requires limit")
+        return None, None
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("limit must be a positive integer")
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+
+    max_limit = current_app.config.get("PAGINATION_MAX_LIMIT", 500)
+    return min(limit, max_limit), cursor
+
+
+def keyset_page(
+    query, id_column, limit: int, cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of a query ordered by id
+
+    Returns the rows and the cursor of the next page (None on the last page).
+    """
+    if cursor:
+        query = query.filter(id_column > decode_cursor(cursor))
+
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
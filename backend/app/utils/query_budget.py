@@ -0,0 +1,61 @@
+"""Count the SQL statements issued by a block of code
+
+Usage (check_query_budgets.py pins the loader-profile read paths this way):
+
+    with assert_query_budget(3):
+        project_service.read_one_project(project_id)
+"""
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Collect the statements executed on the engines it is attached to"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Yield a QueryCounter recording every statement run on the engine
+
+    Without an engine, every engine of the app is watched, so reads routed
+    to the read engine (READ_DATABASE_URL) are counted too.
+    """
+    if engine is None:
+        from app.models import db
+
+        engines = set(db.engines.values())
+    else:
+        engines = {engine}
+
+    counter = QueryCounter()
+    for watched in engines:
+        event.listen(watched, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        for watched in engines:
+            event.remove(watched, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, engine=None):
+    """Fail with AssertionError if the block issues more than max_queries statements"""
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {counter.count}:\n{statements}"
+        )
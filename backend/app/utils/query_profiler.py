@@ -0,0 +1,174 @@
+"""Per-request SQL profiling and N+1 detection
+
+Engine events time every statement issued while a sampled request is being
+served; at request teardown the totals are logged as one JSON line and
+folded into per-endpoint stats, exposed by /debug/queries when enabled.
+
+A statement fingerprint repeated at least QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+times in one request is reported as a likely N+1 pattern.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\([^)]+\)s|:\w+)(?:\s*,\s*(?:\?|%\([^)]+\)s|:\w+))*\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so repeats with other parameters compare equal"""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERALS.sub("?", statement)
+    return _IN_LIST.sub("(...)", statement)
+
+
+class RequestProfile:
+    """Statements seen while serving one request"""
+
+    __slots__ = ("statements", "db_time", "fingerprints")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statements += 1
+        self.db_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context: it is discarded with the statement, so a
+    # statement that raises leaves nothing behind on the connection
+    if (
+        context is not None
+        and has_request_context()
+        and g.get("query_profile") is not None
+    ):
+        context._query_profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_profiler_start", None)
+    if start is None:
+        return
+    g.query_profile.record(statement, time.perf_counter() - start)
+
+
+class QueryProfiler:
+    """Aggregate per-endpoint query statistics for a sample of requests"""
+
+    def __init__(self, app=None):
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        self.logger = app.logger
+        self.sample_rate = app.config.get("QUERY_PROFILER_SAMPLE_RATE", 1.0)
+        self.threshold = app.config.get("QUERY_PROFILER_N_PLUS_ONE_THRESHOLD", 5)
+
+        # Listeners are process-wide; they only record inside a sampled request
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+        app.before_request(self._start_request)
+        app.teardown_request(self._finish_request)
+        app.query_profiler = self
+
+    def _start_request(self) -> None:
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            g.query_profile = RequestProfile()
+
+    def _finish_request(self, exc=None) -> None:
+        profile = g.pop("query_profile", None)
+        if profile is None or not profile.statements:
+            return
+
+        rule = request.url_rule.rule if request.url_rule else request.path
+        endpoint = f"{request.method} {rule}"
+        repeated = {
+            statement: count
+            for statement, count in profile.fingerprints.items()
+            if count >= self.threshold
+        }
+
+        self._aggregate(endpoint, profile, repeated)
+
+        log_entry = {
+            "event": "request_queries",
+            "endpoint": endpoint,
+            "statements": profile.statements,
+            "db_time_ms": round(profile.db_time * 1000, 2),
+        }
+        if repeated:
+            log_entry["n_plus_one"] = [
+                {"statement": statement, "count": count}
+                for statement, count in repeated.items()
+            ]
+            self.logger.warning(json.dumps(log_entry))
+        else:
+            self.logger.info(json.dumps(log_entry))
+
+    def _aggregate(self, endpoint: str, profile: RequestProfile, repeated: Dict[str, int]):
+        with self._lock:
+            stats = self._stats.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "statements": 0,
+                    "max_statements": 0,
+                    "db_time": 0.0,
+                    "n_plus_one": Counter(),
+                },
+            )
+            stats["requests"] += 1
+            stats["statements"] += profile.statements
+            stats["max_statements"] = max(stats["max_statements"], profile.statements)
+            stats["db_time"] += profile.db_time
+            for statement, count in repeated.items():
+                stats["n_plus_one"][statement] = max(
+                    stats["n_plus_one"][statement], count
+                )
+
+    def report(self) -> Dict[str, Any]:
+        """Per-endpoint statistics, the heaviest endpoints first"""
+        with self._lock:
+            endpoints = [
+                {
+                    "endpoint": endpoint,
+                    "sampled_requests": stats["requests"],
+                    "avg_statements": round(stats["statements"] / stats["requests"], 2),
+                    "max_statements": stats["max_statements"],
+                    "avg_db_time_ms": round(
+                        stats["db_time"] * 1000 / stats["requests"], 2
+                    ),
+                    "n_plus_one": [
+                        {"statement": statement, "max_count": count}
+                        for statement, count in stats["n_plus_one"].most_common(5)
+                    ],
+                }
+                for endpoint, stats in self._stats.items()
+            ]
+
+        endpoints.sort(key=lambda item: item["avg_statements"], reverse=True)
+        return {"sample_rate": self.sample_rate, "endpoints": endpoints}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
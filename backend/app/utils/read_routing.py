@@ -0,0 +1,146 @@
+"""Send read-only work to the "read" engine (replica or separate read pool)
+
+GET requests, and functions marked replica_reads() when called outside a
+request, run their queries on the read engine; flushes and anything inside use_primary() stay on the primary.
+A user who changed something within READ_YOUR_WRITES_SECONDS keeps reading
+from the primary, so they never see their own write missing.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+import redis
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+
+READ_BIND = "read"
+READ_METHODS = {"GET", "HEAD"}
+
+# None: decide from the request, True: prefer the replica, False: force primary
+_read_preference: ContextVar[Optional[bool]] = ContextVar(
+    "read_preference", default=None
+)
+
+# Last write per user when Redis is unavailable (per worker only)
+_local_writes = {}
+
+
+def _current_user_id() -> Optional[str]:
+    try:
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _wrote_recently(user_id: str) -> bool:
+    window = current_app.config.get("READ_YOUR_WRITES_SECONDS", 5)
+    redis_client = getattr(current_app, "redis", None)
+    if redis_client:
+        try:
+            return redis_client.exists(f"recent_write:{user_id}") > 0
+        except redis.RedisError:
+            pass
+    return time.monotonic() - _local_writes.get(user_id, float("-inf")) < window
+
+
+def record_write(user_id: str) -> None:
+    """Pin a user's reads to the primary for the read-your-writes window"""
+    window = current_app.config.get("READ_YOUR_WRITES_SECONDS", 5)
+    _local_writes[user_id] = time.monotonic()
+    redis_client = getattr(current_app, "redis", None)
+    if redis_client:
+        try:
+            redis_client.set(f"recent_write:{user_id}", "1", ex=max(1, int(window)))
+        except redis.RedisError:
+            pass
+
+
+def _user_may_read_replica() -> bool:
+    decision = g.get("read_from_replica")
+    if decision is None:
+        user_id = _current_user_id()
+        decision = not (user_id and _wrote_recently(user_id))
+        g.read_from_replica = decision
+    return decision
+
+
+def _use_read_engine() -> bool:
+    preference = _read_preference.get()
+    if preference is False:
+        return False
+    if not has_request_context():
+        return bool(preference)
+    # Writes in flight: a POST reading its own changes must see them
+    if request.method not in READ_METHODS:
+        return False
+    return _user_may_read_replica()
+
+
+@contextmanager
+def use_primary():
+    """Run the block against the primary, whatever the request method"""
+    token = _read_preference.set(False)
+    try:
+        yield
+    finally:
+        _read_preference.reset(token)
+
+
+@contextmanager
+def _prefer_replica():
+    if _read_preference.get() is False:
+        yield
+        return
+    token = _read_preference.set(True)
+    try:
+        yield
+    finally:
+        _read_preference.reset(token)
+
+
+def replica_reads(func):
+    """Let a read-only function use the read engine outside requests too
+
+    Inside a request the method still decides (GET reads, others stay on the
+    primary); use_primary() overrides both.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _prefer_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that picks the read engine for routable reads
+
+    Once the session writes (flush or DML statement) it stays on the primary,
+    so the rest of the request reads its own changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engines = self._db.engines
+        if bind is None and READ_BIND in engines:
+            if self._flushing or getattr(clause, "is_dml", False):
+                self.info["wrote"] = True
+            elif not self.info.get("wrote") and _use_read_engine():
+                return engines[READ_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def init_read_routing(app) -> None:
+    """Remember who wrote, for read-your-writes (only with a read engine)"""
+
+    @app.after_request
+    def record_user_write(response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            user_id = _current_user_id()
+            if user_id:
+                record_write(user_id)
+        return response
@@ -0,0 +1,31 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.models.base import db
+from app.services.daily_analytics_service import DailyAnalyticsService
+
+
+def backfill_daily_analytics(user_id=None):
+    """Rebuild the DailyAnalytics rollup from raw tasks"""
+    config_name = os.getenv("FLASK_CONFIG", "development")
+    app = create_app(config_name)
+
+    with app.app_context():
+        target = f"user {user_id}" if user_id else "all users"
+        print(f"🔄 Rebuilding daily analytics for {target}...")
+
+        result = DailyAnalyticsService(db).backfill(user_id)
+        print(f"✅ Wrote {result['rows']} daily rows for {result['users']} user(s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the DailyAnalytics rollup")
+    parser.add_argument("--user", help="Only rebuild the rollup of this user ID")
+    args = parser.parse_args()
+
+    backfill_daily_analytics(args.user)
@@ -0,0 +1,677 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import threading
+import tempfile
+import subprocess
+from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+from flask import g, has_request_context
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.engine import Engine
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from app.config import Config, config
+from app.models import (
+    db,
+    Users,
+    Projects,
+    Lists,
+    Categories,
+    Tasks,
+    TaskStatus,
+    TaskPriority,
+    MentalState,
+)
+from app.services.daily_analytics_service import DailyAnalyticsService
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+SEED_BATCH = 20_000
+HISTORY_DAYS = 90
+
+# Requests of one iteration, run in order by each virtual user. The timer
+# requests start and pause the same task, so it is workable again next time.
+SCENARIOS = [
+    ("project_list", "GET", "/project/"),
+    ("project_detail", "GET", "/project/{project_id}"),
+    ("project_summary", "GET", "/project/{project_id}/summary"),
+    ("list_detail", "GET", "/list/{list_id}"),
+    ("timer_work", "POST", "/task/{task_id}/timer/work"),
+    ("timer_status", "GET", "/task/{task_id}/timer/status"),
+    ("timer_pause", "POST", "/task/{task_id}/timer/pause"),
+    ("analytics_month", "GET", "/analytics/daily/month/{year}/{month}"),
+    (
+        "analytics_range",
+        "GET",
+        "/analytics/daily/range?start_date={range_start}&end_date={range_end}",
+    ),
+    ("analytics_categories", "GET", "/analytics/categories"),
+    ("analytics_category", "GET", "/analytics/categories/{category_id}"),
+]
+TIMER_BODY = {"duration_minutes": 25}
+
+
+def bench_app(path):
+    """The app with its normal settings, on the benchmark database
+
+    The SQL statements of each request are counted and returned in the
+    X-Query-Count header. The sampling query profiler is turned off so its
+    logging does not skew the timings, and calendar reads use the rollup that
+    seed() backfills.
+    """
+    config["benchmark"] = type(
+        "BenchmarkConfig",
+        (Config,),
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+            "SQLALCHEMY_ECHO": False,
+            "TIMER_SCHEDULER_ENABLED": False,
+            "QUERY_PROFILER_ENABLED": False,
+            "AI_CLIENT": "stub",
+            "DAILY_ANALYTICS_ROLLUP": True,
+        },
+    )
+    app = create_app("benchmark")
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and "query_count" in g:
+            g.query_count += 1
+
+    @app.before_request
+    def start_count():
+        g.query_count = 0
+
+    @app.after_request
+    def report_count(response):
+        response.headers["X-Query-Count"] = str(g.get("query_count", 0))
+        return response
+
+    return app
+
+
+def seed(app, args):
+    """Fill the database with synthetic users, projects, lists and tasks
+
+    Rows are bulk inserted in batches; the list and project task counters and
+    the daily analytics rollup are then rebuilt as the app would keep them.
+    """
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    n_lists = args.users * args.projects * args.lists
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        users = [
+            {
+                "id": f"00000000-0000-4000-8000-{i:012d}",
+                "first_name": "Bench",
+                "last_name": f"User {i}",
+                "username": f"bench{i}",
+                "email": f"bench{i}@example.com",
+                "is_active": True,
+            }
+            for i in range(args.users)
+        ]
+        projects = [
+            {
+                "id": 1 + u * args.projects + p,
+                "name": f"Project {p}",
+                "status": "in_progress",
+                "user_id": users[u]["id"],
+            }
+            for u in range(args.users)
+            for p in range(args.projects)
+        ]
+        lists = [
+            {
+                "id": 1 + project["id"] * args.lists - args.lists + l,
+                "name": f"List {l}",
+                "project_id": project["id"],
+            }
+            for project in projects
+            for l in range(args.lists)
+        ]
+        categories = [
+            {
+                "id": 1 + u * args.categories + c,
+                "name": f"Category {c}",
+                "color": f"#{rng.randrange(0x1000000):06x}",
+                "user_id": users[u]["id"],
+            }
+            for u in range(args.users)
+            for c in range(args.categories)
+        ]
+
+        with db.engine.begin() as conn:
+            conn.execute(insert(Users), users)
+            conn.execute(insert(Projects), projects)
+            conn.execute(insert(Lists), lists)
+            conn.execute(insert(Categories), categories)
+
+            mental_states = list(MentalState)
+            priorities = list(TaskPriority)
+            for start in range(0, args.tasks, SEED_BATCH):
+                rows = []
+                for i in range(start, min(start + SEED_BATCH, args.tasks)):
+                    list_index = i % n_lists
+                    user_index = list_index // (args.projects * args.lists)
+                    created_at = now - timedelta(minutes=rng.randrange(HISTORY_DAYS * 1440))
+                    planned = rng.choice((15, 25, 30, 45, 60, 90))
+                    row = {
+                        "name": f"Task {i}",
+                        "priority": rng.choice(priorities),
+                        "planned_duration": planned,
+                        "list_id": lists[list_index]["id"],
+                        "category_id": categories[
+                            user_index * args.categories + rng.randrange(args.categories)
+                        ]["id"],
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                        "status": TaskStatus.NOT_STARTED,
+                        "total_time_worked": 0,
+                        "first_started_at": None,
+                        "completed_at": None,
+                        "mental_state": None,
+                        "reflection": None,
+                    }
+                    roll = rng.random()
+                    if roll < args.done_ratio:
+                        completed_at = min(
+                            now, created_at + timedelta(minutes=rng.randrange(1, 4320))
+                        )
+                        row.update(
+                            status=TaskStatus.DONE,
+                            total_time_worked=max(1, int(planned * rng.uniform(0.5, 1.8))),
+                            first_started_at=created_at,
+                            completed_at=completed_at,
+                            updated_at=completed_at,
+                            mental_state=rng.choice(mental_states),
+                            reflection="Done",
+                        )
+                    elif roll < args.done_ratio + 0.1:
+                        row.update(
+                            status=TaskStatus.PAUSED,
+                            total_time_worked=rng.randrange(1, planned),
+                            first_started_at=created_at,
+                        )
+                    rows.append(row)
+                conn.execute(insert(Tasks), rows)
+                print(f"  {start + len(rows):>9,} / {args.tasks:,} tasks", end="\r")
+            print()
+
+            # Denormalized counters, as TaskService maintains them
+            task_count = (
+                select(func.count(Tasks.id))
+                .where(Tasks.list_id == Lists.id)
+                .scalar_subquery()
+            )
+            done_count = (
+                select(func.count(Tasks.id))
+                .where(Tasks.list_id == Lists.id, Tasks.status == TaskStatus.DONE)
+                .scalar_subquery()
+            )
+            conn.execute(
+                update(Lists).values(task_count=task_count, completed_task_count=done_count)
+            )
+            conn.execute(
+                update(Lists)
+                .where(Lists.task_count > 0)
+                .values(progress=Lists.completed_task_count * 1.0 / Lists.task_count)
+            )
+            conn.execute(
+                update(Projects).values(
+                    total_tasks=select(func.coalesce(func.sum(Lists.task_count), 0))
+                    .where(Lists.project_id == Projects.id)
+                    .scalar_subquery(),
+                    completed_tasks=select(
+                        func.coalesce(func.sum(Lists.completed_task_count), 0)
+                    )
+                    .where(Lists.project_id == Projects.id)
+                    .scalar_subquery(),
+                )
+            )
+
+        if app.config.get("DAILY_ANALYTICS_ROLLUP"):
+            result = DailyAnalyticsService(db).backfill()
+            print(f"  {result['rows']:,} daily analytics rows")
+
+
+def has_real_users(app):
+    """Whether the database holds users the benchmark did not create"""
+    with app.app_context():
+        try:
+            return bool(
+                db.session.scalar(
+                    select(func.count(Users.id)).where(~Users.username.like("bench%"))
+                )
+            )
+        except Exception:
+            return False
+        finally:
+            db.session.remove()
+
+
+def is_seeded(app, args):
+    with app.app_context():
+        try:
+            counts = db.session.execute(
+                select(
+                    select(func.count(Users.id)).scalar_subquery(),
+                    select(func.count(Tasks.id)).scalar_subquery(),
+                )
+            ).one()
+        except Exception:
+            return False
+        finally:
+            db.session.remove()
+    return tuple(counts) == (args.users, args.tasks)
+
+
+def reset_timers(app):
+    """Pause every running timer so each run starts from the seeded state
+
+    The timer requests only resume and pause tasks seeded as paused, so
+    pausing what a previous (or interrupted) run left active is enough.
+    """
+    with app.app_context():
+        db.session.execute(
+            update(Tasks)
+            .where(Tasks.status == TaskStatus.ACTIVE)
+            .values(
+                status=TaskStatus.PAUSED,
+                current_work_start=None,
+                current_planned_end=None,
+            )
+        )
+        db.session.commit()
+        db.session.remove()
+
+
+def build_workload(app, args):
+    """Per-user tokens and the ids each virtual user requests"""
+    with app.app_context():
+        workload = []
+        for user_id in db.session.scalars(select(Users.id).order_by(Users.id)):
+            projects = db.session.scalars(
+                select(Projects.id).where(Projects.user_id == user_id)
+            ).all()
+            lists = db.session.scalars(
+                select(Lists.id).where(Lists.project_id.in_(projects))
+            ).all()
+            categories = db.session.scalars(
+                select(Categories.id).where(Categories.user_id == user_id)
+            ).all()
+            # Paused tasks for the work/pause requests, one per virtual user.
+            # Resuming (not first starts) keeps every run's statements identical
+            tasks = db.session.scalars(
+                select(Tasks.id)
+                .where(Tasks.list_id.in_(lists), Tasks.status == TaskStatus.PAUSED)
+                .order_by(Tasks.id)
+                .limit(args.concurrency)
+            ).all()
+            workload.append(
+                {
+                    "token": create_access_token(identity=user_id),
+                    "projects": projects,
+                    "lists": lists,
+                    "categories": categories,
+                    "tasks": tasks,
+                }
+            )
+        db.session.remove()
+    return workload
+
+
+def iteration_requests(user, rng, task_id):
+    today = date.today()
+    ids = {
+        "project_id": rng.choice(user["projects"]),
+        "list_id": rng.choice(user["lists"]),
+        "category_id": rng.choice(user["categories"]),
+        "task_id": task_id,
+        "year": today.year,
+        "month": today.month,
+        "range_start": today - timedelta(days=29),
+        "range_end": today,
+    }
+    for name, method, path in SCENARIOS:
+        body = TIMER_BODY if name == "timer_work" else None
+        yield name, method, path.format(**ids), body
+
+
+def run_virtual_user(send, workload, args, worker):
+    """Iterations of one virtual user; returns (scenario, ms, status, queries)"""
+    rng = random.Random(args.seed + worker)
+    samples = []
+    for iteration in range(args.iterations):
+        user = workload[(worker + iteration) % len(workload)]
+        # Each worker has its own task of every user, so timers never collide
+        task_id = user["tasks"][worker]
+        headers = {"Authorization": f"Bearer {user['token']}"}
+        for name, method, path, body in iteration_requests(user, rng, task_id):
+            start = time.perf_counter()
+            status, queries = send(method, path, body, headers)
+            elapsed = (time.perf_counter() - start) * 1000
+            samples.append((name, elapsed, status, queries))
+    return samples
+
+
+def run_test_client(app, workload, args):
+    """Requests through the Flask test client, one virtual user after another"""
+    client = app.test_client()
+
+    def send(method, path, body, headers):
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.headers.get("X-Query-Count")
+
+    samples = []
+    for worker in range(args.concurrency):
+        samples += run_virtual_user(send, workload, args, worker)
+    return samples
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """No access log line per request"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def run_http(app, workload, args):
+    """Concurrent HTTP requests, to --url or to a threaded server started here"""
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = make_server(
+            "127.0.0.1", 0, app, threaded=True, request_handler=QuietRequestHandler
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    local = threading.local()
+
+    def send(method, path, body, headers):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        response = local.session.request(
+            method, base_url.rstrip("/") + path, json=body, headers=headers, timeout=60
+        )
+        return response.status_code, response.headers.get("X-Query-Count")
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run_virtual_user, send, workload, args, worker)
+                for worker in range(args.concurrency)
+            ]
+            return [sample for future in futures for sample in future.result()]
+    finally:
+        if server:
+            server.shutdown()
+
+
+def percentile(ordered, q):
+    """Nearest-rank percentile of sorted values"""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples, elapsed):
+    results = {}
+    for name, _, _ in SCENARIOS:
+        rows = [sample for sample in samples if sample[0] == name]
+        if not rows:
+            continue
+        latencies = sorted(sample[1] for sample in rows)
+        queries = [int(sample[3]) for sample in rows if sample[3] is not None]
+        results[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for sample in rows if sample[2] >= 400),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "queries_per_request": (
+                round(sum(queries) / len(queries), 2) if queries else None
+            ),
+            # The uncached path; concurrent runs may serve some requests from the
+            # response cache depending on timing, which lowers the mean only
+            "max_queries": max(queries) if queries else None,
+        }
+    total = len(samples)
+    return results, {"requests": total, "throughput_rps": round(total / elapsed, 1)}
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Scenarios slower (p95) than the baseline or whose statements changed
+
+    The most statements any request of a scenario issued is the same on every
+    run, so any change is reported, fewer included (re-save the baseline).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            continue
+        allowed = previous["p95_ms"] * (1 + tolerance)
+        if current["p95_ms"] > allowed and (
+            current["p95_ms"] - previous["p95_ms"] > min_delta_ms
+        ):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']}ms > {previous['p95_ms']}ms "
+                f"+{tolerance:.0%}"
+            )
+        if current["max_queries"] != previous.get("max_queries"):
+            regressions.append(
+                f"{name}: up to {current['max_queries']} queries/request, "
+                f"baseline {previous.get('max_queries')}"
+            )
+    return regressions
+
+
+# Run parameters a baseline must share with the run compared against it
+MATCHING_META = (
+    "mode",
+    "tasks",
+    "users",
+    "projects_per_user",
+    "lists_per_project",
+    "categories_per_user",
+    "done_ratio",
+    "concurrency",
+    "iterations",
+    "seed",
+)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_meta(args):
+    return {
+        "mode": "http" if args.http else "test_client",
+        "tasks": args.tasks,
+        "users": args.users,
+        "projects_per_user": args.projects,
+        "lists_per_project": args.lists,
+        "categories_per_user": args.categories,
+        "done_ratio": args.done_ratio,
+        "concurrency": args.concurrency,
+        "iterations": args.iterations,
+        "seed": args.seed,
+    }
+
+
+def main(args):
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        meta = run_meta(args)
+        mismatches = [
+            f"{key} {baseline['meta'].get(key)} (this run {meta[key]})"
+            for key in MATCHING_META
+            if baseline["meta"].get(key) != meta[key]
+        ]
+        if mismatches:
+            print(f"❌ {args.baseline} was recorded with different settings:")
+            for mismatch in mismatches:
+                print(f"   {mismatch}")
+            sys.exit(1)
+
+    path = os.path.abspath(args.db)
+    app = bench_app(path)
+
+    if args.reseed or not is_seeded(app, args):
+        if has_real_users(app):
+            print(f"❌ {path} has non-benchmark users; refusing to reseed it")
+            sys.exit(1)
+        print(
+            f"🌱 Seeding {args.users} users, {args.users * args.projects} projects, "
+            f"{args.users * args.projects * args.lists} lists, {args.tasks:,} tasks "
+            f"into {path}..."
+        )
+        start = time.perf_counter()
+        seed(app, args)
+        print(f"✅ Seeded in {time.perf_counter() - start:.1f}s")
+    else:
+        print(f"♻️  Reusing the seeded database at {path}")
+
+    reset_timers(app)
+    workload = build_workload(app, args)
+    short = [user for user in workload if len(user["tasks"]) < args.concurrency]
+    if short:
+        print(
+            f"❌ {len(short)} user(s) have fewer than {args.concurrency} paused tasks "
+            "for the timer requests; seed more tasks or lower --concurrency"
+        )
+        sys.exit(1)
+    mode = "http" if args.http else "test_client"
+    print(
+        f"🏁 {mode}: {args.concurrency} virtual users x {args.iterations} iterations "
+        f"of {len(SCENARIOS)} requests"
+    )
+
+    start = time.perf_counter()
+    if args.http:
+        samples = run_http(app, workload, args)
+    else:
+        samples = run_test_client(app, workload, args)
+    results, totals = summarize(samples, time.perf_counter() - start)
+
+    print(
+        f"\n  {'scenario':<22}{'reqs':>6}{'errs':>6}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'queries':>9}{'max':>5}"
+    )
+    for name, result in results.items():
+        queries = result["queries_per_request"]
+        print(
+            f"  {name:<22}{result['requests']:>6}{result['errors']:>6}"
+            f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{'-' if queries is None else queries:>9}"
+            f"{'-' if queries is None else result['max_queries']:>5}"
+        )
+    print(f"\n  {totals['requests']} requests, {totals['throughput_rps']} req/s")
+
+    report = {
+        "meta": {
+            **run_meta(args),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "totals": totals,
+        "results": results,
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"💾 Saved results to {args.save}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
+
+    errors = sum(result["errors"] for result in results.values())
+    if errors:
+        print(f"⚠️  {errors} request(s) failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load test the API on a seeded SQLite database"
+    )
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasks to seed (1k to 1M)")
+    parser.add_argument("--users", type=int, default=10, help="Users to seed")
+    parser.add_argument("--projects", type=int, default=5, help="Projects per user")
+    parser.add_argument("--lists", type=int, default=5, help="Lists per project")
+    parser.add_argument("--categories", type=int, default=8, help="Categories per user")
+    parser.add_argument(
+        "--done-ratio", type=float, default=0.6, help="Share of tasks seeded as done"
+    )
+    parser.add_argument(
+        "--db",
+        default=os.path.join(tempfile.gettempdir(), "flow_bench_api.db"),
+        help="SQLite file, reused while the scale matches",
+    )
+    parser.add_argument("--reseed", action="store_true", help="Seed even if already seeded")
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Send real HTTP requests concurrently instead of using the test client",
+    )
+    parser.add_argument(
+        "--url",
+        help="With --http, target this server (started on --db with the same "
+        "JWT_SECRET_KEY) instead of one started here",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Virtual users")
+    parser.add_argument(
+        "--iterations", type=int, default=25, help="Request rounds per virtual user"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--save", help=f"Write the results as JSON (e.g. {BASELINE_DIR}/...)")
+    parser.add_argument("--baseline", help="Fail on regressions against this JSON file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed p95 slowdown (0.25 = 25%%)"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=2.0,
+        help="Ignore p95 slowdowns smaller than this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.exc import OperationalError
+
+from app.config import Config
+from app.models import db, Tasks, TaskStatus, TaskPriority
+from app.utils.database import sqlite_pragmas, sqlite_engine_options, apply_sqlite_pragmas
+
+# Pragmas of a stock SQLite connection, for comparison
+DEFAULT_PROFILE = {
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_BUSY_TIMEOUT_MS": None,
+    "SQLITE_MMAP_SIZE": None,
+    "SQLITE_CACHE_SIZE": None,
+}
+
+
+def profile_config(path, tuned):
+    """Build a config dict for the default or the tuned profile"""
+    config = {
+        name: getattr(Config, name) for name in dir(Config) if name.startswith("SQLITE_")
+    }
+    if not tuned:
+        config.update(DEFAULT_PROFILE)
+    config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    return config
+
+
+def make_engine(config, tuned):
+    options = sqlite_engine_options(config) if tuned else {}
+    engine = create_engine(config["SQLALCHEMY_DATABASE_URI"], **options)
+    apply_sqlite_pragmas(engine, sqlite_pragmas(config))
+    return engine
+
+
+def seed(path, tasks):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Tasks.__table__.insert(),
+            [
+                {
+                    "name": f"Task {i}",
+                    "status": TaskStatus.NOT_STARTED,
+                    "priority": TaskPriority.MEDIUM,
+                    "planned_duration": 30,
+                    "total_time_worked": 0,
+                    "list_id": 1 + i % 20,
+                }
+                for i in range(tasks)
+            ],
+        )
+    engine.dispose()
+
+
+def worker(path, tuned, tasks, duration, write_ratio, results):
+    """Mix timer-style single-row writes with dashboard-style aggregate reads"""
+    engine = make_engine(profile_config(path, tuned), tuned)
+    ops = {"reads": 0, "writes": 0, "errors": 0, "write_latencies": []}
+    deadline = time.monotonic() + duration
+
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            if random.random() < write_ratio:
+                with engine.begin() as conn:
+                    conn.execute(
+                        update(Tasks)
+                        .where(Tasks.id == random.randint(1, tasks))
+                        .values(
+                            status=TaskStatus.ACTIVE,
+                            total_time_worked=Tasks.total_time_worked + 1,
+                        )
+                    )
+                ops["writes"] += 1
+                ops["write_latencies"].append(time.perf_counter() - start)
+            else:
+                with engine.connect() as conn:
+                    conn.execute(
+                        select(Tasks.status, func.count(Tasks.id)).group_by(Tasks.status)
+                    ).all()
+                ops["reads"] += 1
+        except OperationalError:
+            # "database is locked"
+            ops["errors"] += 1
+
+    engine.dispose()
+    results.put(ops)
+
+
+def run_profile(tuned, args):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    seed(path, args.tasks)
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=worker,
+            args=(path, tuned, args.tasks, args.duration, args.write_ratio, results),
+        )
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = sorted(l for ops in totals for l in ops["write_latencies"])
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+    reads = sum(ops["reads"] for ops in totals)
+    writes = sum(ops["writes"] for ops in totals)
+    errors = sum(ops["errors"] for ops in totals)
+
+    name = "tuned" if tuned else "default"
+    print(
+        f"  {name:<8} reads/s={reads / args.duration:>9.0f}  "
+        f"writes/s={writes / args.duration:>8.0f}  "
+        f"p95 write={p95:>7.2f}ms  locked errors={errors}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare SQLite throughput with default and tuned settings"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent processes")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--tasks", type=int, default=10000, help="Rows to seed")
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.3, help="Share of operations that write"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"🏁 {args.workers} workers, {args.duration}s, {args.tasks} tasks, "
+        f"{args.write_ratio:.0%} writes"
+    )
+    run_profile(False, args)
+    run_profile(True, args)
@@ -0,0 +1,147 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.models import db, Users, Projects, Lists, Categories, Tasks, TaskPriority
+from app.services.project_service import ProjectService
+from app.services.category_service import CategoryService
+from app.utils.loading import LOADER_STRATEGIES
+from app.utils.query_budget import count_queries, assert_query_budget
+
+# Most statements each read path may issue per loader strategy, whatever the
+# number of tasks it returns (None: not pinned, lazy loading walks each
+# task's list and project)
+BUDGETS = {
+    "project_detail": {"selectin": 2, "joined": 1, "lazy": 2},
+    "list_detail": {"selectin": 2, "joined": 1, "lazy": 2},
+    "category_tasks": {"selectin": 4, "joined": 1, "lazy": None},
+}
+
+
+def seed_owner(index, n_tasks):
+    """One user whose n_tasks tasks share a category and are spread over
+    lists of five tasks in one project"""
+    user = Users(
+        first_name="Budget",
+        last_name=f"User {index}",
+        username=f"budget{index}",
+        email=f"budget{index}@example.com",
+    )
+    db.session.add(user)
+    db.session.flush()
+
+    project = Projects(name=f"Project {index}", status="in_progress", user_id=user.id)
+    category = Categories(name=f"Category {index}", color="#3366ff", user_id=user.id)
+    db.session.add_all([project, category])
+    db.session.flush()
+
+    lists = [
+        Lists(name=f"List {i}", project_id=project.id)
+        for i in range(max(1, n_tasks // 5))
+    ]
+    db.session.add_all(lists)
+    db.session.flush()
+
+    db.session.add_all(
+        Tasks(
+            name=f"Task {i}",
+            priority=TaskPriority.MEDIUM,
+            planned_duration=30,
+            list_id=lists[i % len(lists)].id,
+            category_id=category.id,
+        )
+        for i in range(n_tasks)
+    )
+    db.session.commit()
+    return user.id, project.id, lists[0].id, category.id
+
+
+def read_paths(user_id, project_id, list_id, category_id):
+    project_service = ProjectService(db)
+    category_service = CategoryService(db)
+    return {
+        "project_detail": lambda strategy: project_service.read_one_project(
+            project_id, strategy
+        ),
+        "list_detail": lambda strategy: project_service.read_one_list(
+            list_id, strategy
+        ),
+        "category_tasks": lambda strategy: category_service.get_category_tasks(
+            category_id, user_id, strategy
+        ),
+    }
+
+
+def measure(read, strategy, budget=None):
+    """Statements issued by a read path, starting from an empty session
+
+    Raises AssertionError if a budget is given and exceeded.
+    """
+    db.session.expire_all()
+    if budget is None:
+        with count_queries() as counter:
+            read(strategy)
+    else:
+        with assert_query_budget(budget) as counter:
+            read(strategy)
+    return counter.count
+
+
+def check_query_budgets(small, large):
+    """Compare statement counts at two task counts against BUDGETS
+
+    Returns:
+        bool: True if every read path stays within its budget
+    """
+    app = create_app("testing")
+    app.config["SQLALCHEMY_ECHO"] = False
+
+    with app.app_context():
+        db.create_all()
+        owners = {n_tasks: seed_owner(n_tasks, n_tasks) for n_tasks in (small, large)}
+
+        print(f"🔍 Statements per read path with {small} and {large} tasks\n")
+        print(f"  {'read path':<16}{'strategy':<10}{small:>8}{large:>8}  budget")
+
+        passed = True
+        for path, budgets in BUDGETS.items():
+            for strategy in LOADER_STRATEGIES:
+                budget = budgets.get(strategy)
+                small_count = measure(read_paths(*owners[small])[path], strategy)
+                try:
+                    large_count = measure(
+                        read_paths(*owners[large])[path], strategy, budget
+                    )
+                    if budget is None:
+                        status = "-"
+                    else:
+                        status = "ok" if small_count == large_count else "grows"
+                except AssertionError:
+                    large_count, status = "-", "over"
+                passed = passed and status in ("ok", "-")
+
+                print(
+                    f"  {path:<16}{strategy:<10}{small_count:>8}{large_count:>8}"
+                    f"  {budget if budget is not None else 'n/a':>6} {status}"
+                )
+
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check the SQL statement counts of the loader-profile read paths"
+    )
+    parser.add_argument("--small", type=int, default=2, help="Tasks in the small case")
+    parser.add_argument("--large", type=int, default=50, help="Tasks in the large case")
+    args = parser.parse_args()
+
+    if check_query_budgets(args.small, args.large):
+        print("\n✅ Every read path is within its query budget")
+    else:
+        print("\n❌ Query budget exceeded or statement count grows with the tasks")
+        sys.exit(1)
@@ -0,0 +1,8 @@
+"""Gunicorn hooks (the command line options live in start.py)"""
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a dead worker from the /metrics aggregation
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,235 @@
+"""initial schema
+
+Revision ID: 0f3a6c2d8e41
+Revises:
+Create Date: 2025-06-18 08:00:00.000000
+
+The tables as they stood before the first recorded migration, so that
+`flask db upgrade` can build a database from scratch. CHECK constraints on
+columns that later migrations add (tasks.total_time_worked, the timer fields,
+lists.progress) cannot exist yet, and only db.create_all() creates them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0f3a6c2d8e41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUMS = ('taskstatus', 'taskpriority', 'mentalstate', 'experimentstatus')
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    ]
+
+
+def _category_fk_name():
+    # a11be1cc484a drops this constraint under the name each dialect gave it
+    if op.get_bind().dialect.name == "sqlite":
+        return "task"
+    return "tasks_category_id_fkey"
+
+
+def _analytics_columns(parent, parent_table):
+    return [
+        sa.Column(f'{parent}_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('tasks_completed', sa.Integer(), nullable=False),
+        sa.Column('tasks_created', sa.Integer(), nullable=False),
+        sa.Column('total_duration', sa.Integer(), nullable=False),
+        sa.Column('productivity_score', sa.Float(), nullable=False),
+        sa.Column('insights', sa.Text(), nullable=True),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint([f'{parent}_id'], [f'{parent_table}.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('first_name', sa.String(length=50), nullable=False),
+        sa.Column('last_name', sa.String(length=50), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('username'),
+        sa.UniqueConstraint('email'),
+    )
+    op.create_table(
+        'experimenttypes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('intervention_category', sa.String(), nullable=False),
+        sa.Column('parameters_schema', sa.JSON(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'authentications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('auth_type', sa.String(length=20), nullable=False),
+        sa.Column('external_id', sa.String(length=100), nullable=True),
+        sa.Column('password_hash', sa.String(length=255), nullable=True),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('color', sa.String(length=7), nullable=False, comment='Hex color code for category visualization'),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        *_timestamps(),
+        sa.CheckConstraint('length(trim(name)) > 0', name='category_name_not_empty'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='_user_category_uc'),
+    )
+    # user_id was an Integer before 219fc0ad5a07, but PostgreSQL cannot
+    # reference the string users.id from an integer column
+    op.create_table(
+        'dailyanalytics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('completion_rate', sa.Float(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'projects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        *_timestamps(),
+        sa.CheckConstraint('length(trim(name)) > 0', name='project_name_not_empty'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='_user_project_uc'),
+    )
+    op.create_table('categoryanalytics', *_analytics_columns('category', 'categories'))
+    op.create_table(
+        'lists',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.CheckConstraint('length(trim(name)) > 0', name='list_name_not_empty'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'name', name='_project_list_uc'),
+    )
+    op.create_table('projectanalytics', *_analytics_columns('project', 'projects'))
+    op.create_table(
+        'userexperiments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'ACTIVE', 'COMPLETED', 'CANCELLED', name='experimentstatus'), nullable=False),
+        sa.Column('parameters', sa.JSON(), nullable=True),
+        sa.Column('success_criteria', sa.String(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=False),
+        sa.Column('intervention_probability', sa.Float(), nullable=False),
+        sa.Column('target_category_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('experiment_type_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['experiment_type_id'], ['experimenttypes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['target_category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=300), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('status', sa.Enum('NOT_STARTED', 'ACTIVE', 'PAUSED', 'DONE', name='taskstatus'), nullable=False),
+        sa.Column('priority', sa.Enum('HIGH', 'MEDIUM', 'LOW', name='taskpriority'), nullable=False),
+        sa.Column('planned_duration', sa.Integer(), nullable=False, comment='Planned duration in minutes'),
+        sa.Column('actual_duration', sa.Integer(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True, comment='When task was completed'),
+        sa.Column('mental_state', sa.Enum('ENERGIZED', 'FOCUSED', 'TIRED', 'FRUSTRATED', 'SATISFIED', 'ANXIOUS', 'MOTIVATED', name='mentalstate'), nullable=True),
+        sa.Column('reflection', sa.Text(), nullable=True, comment='User reflection on task completion'),
+        sa.Column('list_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.CheckConstraint('planned_duration > 0', name='positive_planned_duration'),
+        sa.CheckConstraint('length(trim(name)) > 0', name='task_name_not_empty'),
+        sa.CheckConstraint(
+            "(status = 'DONE' AND mental_state IS NOT NULL AND reflection IS NOT NULL) OR status != 'DONE'",
+            name='completion_fields_required_when_done',
+        ),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], name=_category_fk_name(), ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['list_id'], ['lists.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'experimentresults',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric_name', sa.String(), nullable=False),
+        sa.Column('metric_value', sa.String(), nullable=False),
+        sa.Column('improvement_percentage', sa.Float(), nullable=False),
+        sa.Column('measurement_date', sa.DateTime(), nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False),
+        sa.Column('p_value', sa.Float(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['experiment_id'], ['userexperiments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'experimenttasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('assigned_to_intervention', sa.Boolean(), nullable=False),
+        sa.Column('intervention_applied', sa.Boolean(), nullable=False),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('original_estimate', sa.Integer(), nullable=True),
+        sa.Column('suggested_estimate', sa.Integer(), nullable=True),
+        sa.Column('final_estimate', sa.Integer(), nullable=True),
+        sa.Column('scheduled_for_preferred_time', sa.Boolean(), nullable=True),
+        sa.Column('actual_start_hour', sa.Integer(), nullable=True),
+        sa.Column('completed_pre_task_ritual', sa.Boolean(), nullable=True),
+        sa.Column('mood_before', sa.String(), nullable=True),
+        sa.Column('mood_after', sa.String(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['experiment_id'], ['userexperiments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade():
+    for table in (
+        'experimenttasks', 'experimentresults', 'tasks', 'userexperiments',
+        'projectanalytics', 'lists', 'categoryanalytics', 'projects',
+        'dailyanalytics', 'categories', 'authentications', 'experimenttypes',
+        'users',
+    ):
+        op.drop_table(table)
+    for name in ENUMS:
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""add daily analytics rollup counters
+
+Revision ID: 219fc0ad5a07
+Revises: a11be1cc484a
+Create Date: 2026-10-17 09:12:41.308114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '219fc0ad5a07'
+down_revision = 'a11be1cc484a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('dailyanalytics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tasks_active', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('tasks_completed', sa.Integer(), server_default='0', nullable=False))
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), type_=sa.String(length=36))
+        batch_op.create_unique_constraint('_user_daily_analytics_uc', ['user_id', 'date'])
+
+
+def downgrade():
+    with op.batch_alter_table('dailyanalytics', schema=None) as batch_op:
+        batch_op.drop_constraint('_user_daily_analytics_uc', type_='unique')
+        batch_op.alter_column('user_id', existing_type=sa.String(length=36), type_=sa.Integer(),
+                              postgresql_using='user_id::integer')
+        batch_op.drop_column('tasks_completed')
+        batch_op.drop_column('tasks_active')
@@ -0,0 +1,41 @@
+"""unique pending ai insight job per user
+
+Revision ID: 3f9b6d1e8a42
+Revises: 7e4b9d2a6c15
+Create Date: 2026-10-17 16:40:27.915203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9b6d1e8a42'
+down_revision = '7e4b9d2a6c15'
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status IN ('QUEUED', 'RUNNING')")
+
+
+def upgrade():
+    # Fail all but the newest pending job of each user so the index can be built
+    op.execute(
+        """
+        UPDATE aiinsightjobs SET status = 'FAILED', error = 'Superseded'
+        WHERE status IN ('QUEUED', 'RUNNING')
+          AND created_at < (
+            SELECT MAX(newer.created_at) FROM aiinsightjobs AS newer
+            WHERE newer.user_id = aiinsightjobs.user_id
+              AND newer.status IN ('QUEUED', 'RUNNING')
+          )
+        """
+    )
+    with op.batch_alter_table('aiinsightjobs', schema=None) as batch_op:
+        batch_op.create_index('uq_aiinsightjobs_user_pending', ['user_id'], unique=True,
+                              sqlite_where=PENDING, postgresql_where=PENDING)
+
+
+def downgrade():
+    with op.batch_alter_table('aiinsightjobs', schema=None) as batch_op:
+        batch_op.drop_index('uq_aiinsightjobs_user_pending')
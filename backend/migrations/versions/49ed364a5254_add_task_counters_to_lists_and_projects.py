@@ -0,0 +1,51 @@
+"""add task counters to lists and projects
+
+Revision ID: 49ed364a5254
+Revises: 219fc0ad5a07
+Create Date: 2026-10-17 10:41:03.552870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '49ed364a5254'
+down_revision = '219fc0ad5a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('completed_task_count', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_tasks', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('completed_tasks', sa.Integer(), server_default='0', nullable=False))
+
+    # Populate the counters from the existing tasks
+    op.execute(
+        "UPDATE lists SET "
+        "task_count = (SELECT COUNT(*) FROM tasks WHERE tasks.list_id = lists.id), "
+        "completed_task_count = (SELECT COUNT(*) FROM tasks "
+        "WHERE tasks.list_id = lists.id AND tasks.status = 'DONE')"
+    )
+    op.execute(
+        "UPDATE projects SET "
+        "total_tasks = (SELECT COALESCE(SUM(task_count), 0) FROM lists "
+        "WHERE lists.project_id = projects.id), "
+        "completed_tasks = (SELECT COALESCE(SUM(completed_task_count), 0) FROM lists "
+        "WHERE lists.project_id = projects.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('completed_tasks')
+        batch_op.drop_column('total_tasks')
+
+    with op.batch_alter_table('lists', schema=None) as batch_op:
+        batch_op.drop_column('completed_task_count')
+        batch_op.drop_column('task_count')
@@ -1,7 +1,7 @@
 """change progress to status in project table
 
 Revision ID: 4b716225ec53
-Revises: 
+Revises: 0f3a6c2d8e41
 Create Date: 2025-06-18 08:41:09.371471
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '4b716225ec53'
-down_revision = None
+down_revision = '0f3a6c2d8e41'
 branch_labels = None
 depends_on = None
 
@@ -33,6 +33,7 @@ def downgrade():
         batch_op.alter_column('status',
                existing_type=sa.String(),
                type_=sa.FLOAT(),
-               existing_nullable=False)
+               existing_nullable=False,
+               postgresql_using='status::double precision')
 
     # ### end Alembic commands ###
@@ -0,0 +1,43 @@
+"""add ai insight jobs
+
+Revision ID: 5d2e7a4c1b93
+Revises: 8c3e5f1a9d27
+Create Date: 2026-10-17 14:05:12.481027
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e7a4c1b93'
+down_revision = '8c3e5f1a9d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'aiinsightjobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'DONE', 'FAILED', name='aijobstatus'), nullable=False),
+        sa.Column('insights', sa.Text(), nullable=True),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('aiinsightjobs', schema=None) as batch_op:
+        batch_op.create_index('idx_aiinsightjobs_user_created', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('aiinsightjobs', schema=None) as batch_op:
+        batch_op.drop_index('idx_aiinsightjobs_user_created')
+
+    op.drop_table('aiinsightjobs')
+    sa.Enum(name='aijobstatus').drop(op.get_bind(), checkfirst=True)
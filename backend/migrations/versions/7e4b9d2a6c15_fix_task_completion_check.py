@@ -0,0 +1,39 @@
+"""compare task status names in the completion check
+
+Revision ID: 7e4b9d2a6c15
+Revises: 5d2e7a4c1b93
+Create Date: 2026-10-17 16:20:41.305118
+
+Enum(TaskStatus) stores member names, so the check must compare against
+'DONE'. With 'done' it never fired on SQLite, and PostgreSQL rejected the
+literal as an invalid taskstatus value.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4b9d2a6c15'
+down_revision = '5d2e7a4c1b93'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = 'completion_fields_required_when_done'
+
+
+def _recreate(status):
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_constraint(CONSTRAINT, type_='check')
+        batch_op.create_check_constraint(
+            CONSTRAINT,
+            f"(status = '{status}' AND mental_state IS NOT NULL AND reflection IS NOT NULL) "
+            f"OR status != '{status}'",
+        )
+
+
+def upgrade():
+    _recreate('DONE')
+
+
+def downgrade():
+    _recreate('done')
@@ -0,0 +1,41 @@
+"""composite indexes for keyset pagination
+
+Revision ID: 8c3e5f1a9d27
+Revises: 49ed364a5254
+Create Date: 2026-10-17 14:05:22.417305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3e5f1a9d27'
+down_revision = '49ed364a5254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (parent, id) indexes serve both the parent filter and the id > cursor range
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('idx_tasks_list_id')
+        batch_op.drop_index('idx_tasks_category_id')
+        batch_op.create_index('idx_tasks_list_id_id', ['list_id', 'id'], unique=False)
+        batch_op.create_index('idx_tasks_category_id_id', ['category_id', 'id'], unique=False)
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('idx_projects_user_id')
+        batch_op.create_index('idx_projects_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('idx_projects_user_id_id')
+        batch_op.create_index('idx_projects_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('idx_tasks_category_id_id')
+        batch_op.drop_index('idx_tasks_list_id_id')
+        batch_op.create_index('idx_tasks_category_id', ['category_id'], unique=False)
+        batch_op.create_index('idx_tasks_list_id', ['list_id'], unique=False)
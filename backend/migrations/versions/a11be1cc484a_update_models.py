@@ -17,6 +17,14 @@ branch_labels = None
 depends_on = None
 
 
+def _category_fk_name():
+    # SQLite batch mode reflected the unnamed constraint as "task"; PostgreSQL
+    # uses its default <table>_<column>_fkey naming
+    if op.get_bind().dialect.name == "sqlite":
+        return "task"
+    return "tasks_category_id_fkey"
+
+
 def upgrade():
     # ### commands auto generated by Alembic - please adjust! ###
     with op.batch_alter_table("categories", schema=None) as batch_op:
@@ -80,9 +88,13 @@ def upgrade():
         batch_op.create_index(
             "idx_tasks_status_list", ["status", "list_id"], unique=False
         )
-        batch_op.drop_constraint("task", type_="foreignkey")
+        batch_op.drop_constraint(_category_fk_name(), type_="foreignkey")
         batch_op.create_foreign_key(
-            None, "categories", ["category_id"], ["id"], ondelete="SET NULL"
+            "tasks_category_id_fkey",
+            "categories",
+            ["category_id"],
+            ["id"],
+            ondelete="SET NULL",
         )
         batch_op.drop_column("started_at")
         batch_op.drop_column("actual_duration")
@@ -94,10 +106,14 @@ def downgrade():
     # ### commands auto generated by Alembic - please adjust! ###
     with op.batch_alter_table("tasks", schema=None) as batch_op:
         batch_op.add_column(sa.Column("actual_duration", sa.INTEGER(), nullable=True))
-        batch_op.add_column(sa.Column("started_at", sa.DATETIME(), nullable=True))
-        batch_op.drop_constraint("task", type_="foreignkey")
+        batch_op.add_column(sa.Column("started_at", sa.DateTime(), nullable=True))
+        batch_op.drop_constraint("tasks_category_id_fkey", type_="foreignkey")
         batch_op.create_foreign_key(
-            None, "categories", ["category_id"], ["id"], ondelete="CASCADE"
+            "tasks_category_id_fkey",
+            "categories",
+            ["category_id"],
+            ["id"],
+            ondelete="CASCADE",
         )
         batch_op.drop_index("idx_tasks_status_list")
         batch_op.drop_index("idx_tasks_status")
@@ -0,0 +1,63 @@
+import os
+import sys
+import argparse
+from datetime import timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.models import AIJobStatus, Lists, Projects, Tasks
+from app.models.base import db
+from app.services.ai_job_service import AIJobService
+from app.utils import get_utc_now
+
+
+def pregenerate_insights(days=1, user_id=None):
+    """Generate AI insights for users active in the last few days
+
+    Meant to run nightly, so the insights endpoint serves stored results.
+    """
+    config_name = os.getenv("FLASK_CONFIG", "development")
+    app = create_app(config_name)
+
+    with app.app_context():
+        if user_id:
+            user_ids = [user_id]
+        else:
+            since = get_utc_now() - timedelta(days=days)
+            user_ids = db.session.scalars(
+                db.select(Projects.user_id)
+                .join(Lists, Lists.project_id == Projects.id)
+                .join(Tasks, Tasks.list_id == Lists.id)
+                .where(Tasks.updated_at >= since)
+                .distinct()
+            ).all()
+
+        print(f"🔄 Generating insights for {len(user_ids)} user(s)...")
+
+        job_service = AIJobService(db)
+        done = failed = 0
+        for uid in user_ids:
+            job = job_service.create_job(uid)
+            job = job_service.run_job(job.id) or job
+            if job.status == AIJobStatus.DONE:
+                done += 1
+            else:
+                failed += 1
+                print(f"⚠️  User {uid}: {job.error or job.status}")
+
+        print(f"✅ Generated insights for {done} user(s), {failed} failed or pending")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-generate AI insights for recently active users"
+    )
+    parser.add_argument(
+        "--days", type=int, default=1, help="Active within this many days (default 1)"
+    )
+    parser.add_argument("--user", help="Only generate insights for this user ID")
+    args = parser.parse_args()
+
+    pregenerate_insights(args.days, args.user)
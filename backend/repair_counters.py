@@ -0,0 +1,44 @@
+import os
+import sys
+import argparse
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.models.base import db
+from app.services.project_service import ProjectService
+
+
+def check_task_counters(repair=False):
+    """Verify (and optionally repair) the list and project task counters"""
+    config_name = os.getenv("FLASK_CONFIG", "development")
+    app = create_app(config_name)
+
+    with app.app_context():
+        print("🔍 Checking list and project task counters...")
+        mismatches = ProjectService(db).verify_task_counters(repair=repair)
+
+        if not mismatches:
+            print("✅ All task counters are consistent")
+            return
+
+        for mismatch in mismatches:
+            print(
+                f"⚠️  {mismatch['type']} {mismatch['id']}: "
+                f"stored={mismatch['stored']} actual={mismatch['actual']}"
+            )
+
+        if repair:
+            print(f"🔧 Repaired {len(mismatches)} counter(s)")
+        else:
+            print(f"❌ {len(mismatches)} counter(s) drifted. Run with --repair to fix them.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify list and project task counters")
+    parser.add_argument("--repair", action="store_true", help="Fix drifted counters")
+    args = parser.parse_args()
+
+    check_task_counters(args.repair)
@@ -1,5 +1,6 @@
 import os
 import sys
+import shutil
 import subprocess
 import logging
 
@@ -7,6 +8,16 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def prepare_metrics_dir():
+    """Give gunicorn workers a fresh shared directory for Prometheus samples"""
+    metrics_dir = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", "/tmp/flow_prometheus_metrics"
+    )
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+    logger.info(f"📈 Prometheus multiprocess dir: {metrics_dir}")
+
+
 def initialize_database():
     """Initialize database tables"""
     logger.info("🔄 Initializing database...")
@@ -44,13 +55,20 @@ def start_server():
 
     port = os.getenv("PORT", "5001")
     workers = os.getenv("WEB_CONCURRENCY", "1")
+    # Threaded workers so open timer event streams don't block other requests.
+    # Each stream holds a thread; TIMER_STREAM_MAX_CONNECTIONS (default 4) caps
+    # them per worker so the remaining threads keep serving the API.
+    threads = os.getenv("GUNICORN_THREADS", "8")
 
     cmd = [
         "gunicorn",
         "--bind", f"0.0.0.0:{port}",
         "--workers", workers,
+        "--worker-class", "gthread",
+        "--threads", threads,
         "--timeout", "120",
         "--log-level", "info",
+        "--config", "gunicorn.conf.py",
         "run:app"
     ]
 
@@ -63,5 +81,6 @@ def start_server():
 
 if __name__ == "__main__":
     logger.info("🚀 Starting Flask application...")
+    prepare_metrics_dir()
     initialize_database()
     start_server()
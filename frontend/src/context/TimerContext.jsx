@@ -373,16 +373,42 @@ export const TimerProvider = ({ children }) => {
     }
   };
 
-  // Sync with backend periodically
+  // Receive timer changes pushed by the backend (other tabs, expiry events).
+  // Without a stream (refused, failed or unsupported) fall back to checking
+  // expiry every 30s, and retry the stream with backoff.
   useEffect(() => {
     if (!state.activeTask || state.timerState !== TimerStates.ACTIVE) return;
 
+    let source = null;
+    let retry = null;
+    let poll = null;
+    let failures = 0;
+    let cancelled = false;
+
+    const handleTimerEvent = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.task_id !== state.activeTask.id) return;
+
+      dispatch({
+        type: ActionTypes.SYNC_WITH_BACKEND,
+        payload: { ...data, task: state.activeTask },
+      });
+    };
+
+    const eventTypes = [
+      "timer_started",
+      "timer_extended",
+      "timer_paused",
+      "timer_completed",
+      "timer_expired",
+    ];
+
     const checkExpiration = async () => {
       try {
         const response = await taskService.checkTimerExpired(
           state.activeTask.id,
         );
-        if (response.data.is_expired && !state.isExpired) {
+        if (response.data.is_expired) {
           dispatch({ type: ActionTypes.UPDATE_TIMER });
         }
       } catch (error) {
@@ -390,9 +416,71 @@ export const TimerProvider = ({ children }) => {
       }
     };
 
-    const interval = setInterval(checkExpiration, 30000);
-    return () => clearInterval(interval);
-  }, [state.activeTask, state.timerState, state.isExpired]);
+    const startPolling = () => {
+      if (poll) return;
+      checkExpiration();
+      poll = setInterval(checkExpiration, 30000);
+    };
+
+    const stopPolling = () => {
+      clearInterval(poll);
+      poll = null;
+    };
+
+    // Server's Retry-After when given, else 5s doubling up to 5 minutes
+    const scheduleReconnect = (retryAfterSeconds) => {
+      startPolling();
+      failures += 1;
+      const delay = retryAfterSeconds
+        ? retryAfterSeconds * 1000
+        : Math.min(5000 * 2 ** (failures - 1), 300000);
+      retry = setTimeout(connect, delay);
+    };
+
+    const connect = async () => {
+      if (cancelled) return;
+      try {
+        source = await taskService.openTimerEventStream();
+      } catch (error) {
+        console.error("Failed to open timer event stream:", error);
+        if (!cancelled) scheduleReconnect(error.retryAfter);
+        return;
+      }
+      if (!source) {
+        startPolling();
+        return;
+      }
+      if (cancelled) {
+        source.close();
+        return;
+      }
+
+      eventTypes.forEach((type) => source.addEventListener(type, handleTimerEvent));
+
+      source.onopen = () => {
+        failures = 0;
+        stopPolling();
+      };
+
+      // Refused streams and expired stream tokens leave the source closed;
+      // transient drops are retried by the browser itself
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !cancelled) {
+          source.close();
+          scheduleReconnect();
+        }
+      };
+    };
+
+    connect();
+
+    return () => {
+      cancelled = true;
+      clearTimeout(retry);
+      stopPolling();
+      if (source) source.close();
+    };
+  }, [state.activeTask, state.timerState]);
 
   // Calculate current values based on timestamps
   const getTimeRemaining = () => {
@@ -93,8 +93,32 @@ class TaskService {
   async pollTimerStatus(taskId) {
     return apiCall(() => api.get(`/task/${taskId}/timer/poll`))
   }
+
+  // Open the server-sent events stream of timer changes for the current user.
+  // EventSource cannot send headers, so the stream gets its own short-lived
+  // token and the login token never ends up in a URL. Errors carry
+  // retryAfter (seconds) when the server asked the client to back off.
+  async openTimerEventStream() {
+    if (!localStorage.getItem('access_token') || typeof EventSource === 'undefined') {
+      return null
+    }
+
+    let response
+    try {
+      response = await api.post('/task/timer/stream-token')
+    } catch (error) {
+      const failure = new Error(
+        error.response?.data?.message || error.message || 'Unable to open the timer stream'
+      )
+      failure.retryAfter = Number(error.response?.headers?.['retry-after']) || null
+      throw failure
+    }
+
+    return new EventSource(
+      `${api.defaults.baseURL}/task/timer/stream?jwt=${encodeURIComponent(response.data.data.token)}`
+    )
+  }
 }
 
-// Export singleton instance
 export const taskService = new TaskService()
 export default taskService
\ No newline at end of file